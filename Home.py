@@ -7,15 +7,17 @@ import glob
 from io import StringIO
 from streamlit_push_notifications import send_push
 # https://github.com/yunisguliyev/streamlit-notifications?tab=readme-ov-file
-import boto3
 import base64
 import os
 import csv
 import io
-from pydub import AudioSegment
 import requests
 import tempfile
 from dotenv import load_dotenv
+from fx_news.utils.lazy_imports import lazy_import
+
+# AWS and audio libraries are only needed when a narration is generated
+boto3 = lazy_import("boto3")
 # import wave
 # import numpy as np
 
@@ -256,6 +258,7 @@ def add_background_music(narration_path, volume_reduction=20):
         
         # Randomly select a music file
         import random
+        from pydub import AudioSegment
         background_path = random.choice(music_files)
         
         if not os.path.exists(background_path):
@@ -0,0 +1,6 @@
+import os
+
+# Serve scraper traffic from recorded fixtures when requested (see fx_news.utils.http_replay)
+if os.environ.get("FX_HTTP_REPLAY"):
+    from fx_news.utils.http_replay import install_from_env
+    install_from_env()
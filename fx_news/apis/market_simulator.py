@@ -0,0 +1,451 @@
+"""
+Synthetic market for load and latency testing of the rates pipeline.
+Simulates correlated geometric Brownian motion with jumps for every currency, crypto asset and
+index, derives any number of pairs from them, and serves the result as Yahoo spark payloads,
+either written to the 5D/YTD folders or through a local stand-in for the spark endpoint.
+
+Usage:
+    python -m fx_news.apis.market_simulator write [--pairs 300] [--out fx_news/scrapers/rates]
+    python -m fx_news.apis.market_simulator serve [--pairs 300] [--port 8765] [--speed 10]
+
+Point the scraper at the stand-in with FX_SPARK_URL=http://127.0.0.1:8765/v7/finance/spark.
+"""
+import argparse
+import itertools
+import json
+import os
+import threading
+import time
+import zlib
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+import numpy as np
+
+from fx_news.config.settings import (
+    fx_currencies, crypto_currencies, indices, default_fx_pairs, default_crypto_pairs, default_indices,
+)
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+# Simulated history kept at tick resolution, enough for the 5d range
+HISTORY_SECONDS = 5 * 24 * 3600
+
+DEFAULT_TICK_SECONDS = 60
+
+# Asset classes: annual volatility, correlation with the class factor, jumps per year, jump size
+ASSET_CLASSES = {
+    "fx": {"volatility": 0.08, "correlation": 0.5, "jump_intensity": 5.0, "jump_size": 0.005},
+    "crypto": {"volatility": 0.6, "correlation": 0.7, "jump_intensity": 20.0, "jump_size": 0.04},
+    "index": {"volatility": 0.18, "correlation": 0.8, "jump_intensity": 4.0, "jump_size": 0.02},
+}
+
+# Starting dollar value of one unit of each asset; others get a seeded random value
+USD_VALUES = {
+    "USD": 1.0, "EUR": 1.08, "GBP": 1.27, "JPY": 1 / 148.5, "AUD": 0.66, "CAD": 1 / 1.36,
+    "CHF": 1 / 0.88, "CNY": 1 / 7.2, "NZD": 0.61, "INR": 1 / 83.0, "BTC": 60000.0, "ETH": 3000.0,
+    "USDT": 1.0, "USDC": 1.0, "BUSD": 1.0, "^DJI": 39000.0, "^GSPC": 5200.0, "^IXIC": 16000.0,
+}
+
+# Yahoo ranges and intervals in seconds
+RANGE_SECONDS = {"1d": 86400, "5d": 5 * 86400, "1mo": 30 * 86400, "3mo": 90 * 86400,
+                 "6mo": 180 * 86400, "1y": 365 * 86400}
+INTERVAL_SECONDS = {"1m": 60, "2m": 120, "5m": 300, "15m": 900, "30m": 1800, "60m": 3600,
+                    "1h": 3600, "1d": 86400, "1wk": 7 * 86400}
+
+# Crypto assets the scraper quotes as 'BTC-USD' against USD (format_currency_pair_for_yahoo);
+# every other non-index pair is requested as 'BASEQUOTE=X'
+YAHOO_DASHED_CRYPTO = ['BTC', 'ETH', 'XRP', 'LTC', 'BCH', 'ADA', 'DOT', 'LINK', 'XLM', 'DOGE', 'SOL']
+
+Pair = Tuple[str, str]
+
+
+def asset_class(asset: str) -> str:
+    """'fx', 'crypto' or 'index'."""
+    if asset.startswith("^"):
+        return "index"
+    if asset in crypto_currencies and asset not in fx_currencies:
+        return "crypto"
+    return "fx"
+
+
+def default_pairs(count: int) -> List[Pair]:
+    """
+    A universe of pairs for load tests.
+
+    The app's default subscriptions come first, so any count serves them, then USD pairs both
+    ways, indices, crypto and FX crosses.
+
+    Args:
+        count: Number of pairs
+
+    Returns:
+        list: (base, quote) tuples
+    """
+    fx = [c for c in dict.fromkeys(fx_currencies) if c != "USD"]
+    crypto = [c for c in crypto_currencies if c not in ("USDT", "USDC", "BUSD")]
+    pairs = [(sub["base"], sub["quote"]) for sub in default_fx_pairs + default_crypto_pairs + default_indices]
+    pairs += [(c, "USD") for c in fx] + [("USD", c) for c in fx]
+    pairs += [(i, "USD") for i in indices]
+    pairs += [(c, "USD") for c in crypto]
+    pairs += [(b, q) for b, q in itertools.permutations(fx, 2)]
+    pairs += [(c, "BTC") for c in crypto if c != "BTC"]
+    return list(dict.fromkeys(pairs))[:count]
+
+
+def yahoo_symbol(base: str, quote: str) -> str:
+    """Yahoo symbol of a pair, matching format_currency_pair_for_yahoo (unescaped)."""
+    base, quote = base.upper(), quote.upper()
+    if base.startswith("^"):
+        return base
+    if base in YAHOO_DASHED_CRYPTO and quote == "USD":
+        return f"{base}-{quote}"
+    if base == "USD":
+        return f"{quote}=X"
+    return f"{base}{quote}=X"
+
+
+def _stable_seed(*parts) -> int:
+    """Seed that is the same in every process (unlike hash() of strings)."""
+    return zlib.crc32("|".join(str(p) for p in parts).encode("utf-8"))
+
+
+class MarketSimulator:
+    """
+    Correlated jump-diffusion market.
+
+    Every asset's log dollar value follows GBM with Merton jumps; assets of a class share a
+    common factor, and a pair's price is the ratio of its two assets, so crosses stay consistent.
+    """
+
+    def __init__(self, pairs: List[Pair], seed: int = 42, tick_seconds: int = DEFAULT_TICK_SECONDS,
+                 start: Optional[float] = None, history_seconds: int = HISTORY_SECONDS):
+        self.pairs = [(b.upper(), q.upper()) for b, q in pairs]
+        self.seed = seed
+        self.tick_seconds = tick_seconds
+        self.rng = np.random.default_rng(seed)
+
+        self.assets = list(dict.fromkeys(a for pair in self.pairs for a in pair if a != "USD"))
+        self._asset_index = {a: i for i, a in enumerate(self.assets)}
+        # An index is requested by its symbol alone, so its first pair answers for it
+        self._symbols: Dict[str, Pair] = {}
+        for pair in self.pairs:
+            self._symbols.setdefault(yahoo_symbol(*pair), pair)
+        classes = [asset_class(a) for a in self.assets]
+        self._class_names = list(ASSET_CLASSES)
+        self._class_of = np.array([self._class_names.index(c) for c in classes], dtype=np.int64)
+        params = [ASSET_CLASSES[c] for c in classes]
+        self._vol = np.array([p["volatility"] for p in params])
+        self._rho = np.array([p["correlation"] for p in params])
+        self._jump_intensity = np.array([p["jump_intensity"] for p in params])
+        self._jump_size = np.array([p["jump_size"] for p in params])
+
+        initial = np.array([USD_VALUES.get(a, self._random_value(a)) for a in self.assets])
+
+        # Pair i = asset _base[i] / asset _quote[i]; USD is the virtual column n_assets with log value 0
+        usd = len(self.assets)
+        self._base = np.array([self._asset_index.get(b, usd) for b, _ in self.pairs], dtype=np.int64)
+        self._quote = np.array([self._asset_index.get(q, usd) for _, q in self.pairs], dtype=np.int64)
+
+        self.capacity = max(2, history_seconds // tick_seconds + 1)
+        self._log_values = np.empty((2 * self.capacity, len(self.assets)))
+        self._timestamps = np.empty(2 * self.capacity, dtype=np.int64)
+        self._size = 0
+        self._lock = threading.Lock()
+
+        start = int(time.time() if start is None else start)
+        self._backfill(np.log(initial), start)
+
+    def _random_value(self, asset: str) -> float:
+        rng = np.random.default_rng(_stable_seed(self.seed, asset))
+        low, high = {"fx": (0.01, 2.0), "crypto": (0.1, 500.0), "index": (1000.0, 40000.0)}[asset_class(asset)]
+        return float(np.exp(rng.uniform(np.log(low), np.log(high))))
+
+    def _increments(self, steps: int) -> np.ndarray:
+        """Log-value increments of every asset for the given number of ticks, shape (steps, assets)."""
+        dt = self.tick_seconds / SECONDS_PER_YEAR
+        common = self.rng.standard_normal((steps, len(self._class_names)))[:, self._class_of]
+        own = self.rng.standard_normal((steps, len(self.assets)))
+        shocks = np.sqrt(self._rho) * common + np.sqrt(1 - self._rho) * own
+        diffusion = -0.5 * self._vol ** 2 * dt + self._vol * np.sqrt(dt) * shocks
+
+        jump_counts = self.rng.poisson(self._jump_intensity * dt, (steps, len(self.assets)))
+        jumps = self.rng.standard_normal((steps, len(self.assets))) * self._jump_size * np.sqrt(jump_counts)
+        return diffusion + jumps
+
+    def _append(self, log_values: np.ndarray, timestamps: np.ndarray) -> None:
+        count = len(timestamps)
+        if self._size + count > len(self._timestamps):
+            keep = min(self._size, self.capacity - min(count, self.capacity))
+            self._log_values[:keep] = self._log_values[self._size - keep:self._size]
+            self._timestamps[:keep] = self._timestamps[self._size - keep:self._size]
+            self._size = keep
+            log_values, timestamps = log_values[-self.capacity:], timestamps[-self.capacity:]
+            count = len(timestamps)
+        self._log_values[self._size:self._size + count] = log_values
+        self._timestamps[self._size:self._size + count] = timestamps
+        self._size += count
+
+    def _backfill(self, log_initial: np.ndarray, end: int) -> None:
+        steps = self.capacity
+        path = log_initial + np.cumsum(self._increments(steps), axis=0)
+        # Anchor the history so it ends at the starting values
+        path += log_initial - path[-1]
+        timestamps = end - self.tick_seconds * np.arange(steps - 1, -1, -1, dtype=np.int64)
+        self._append(path, timestamps)
+
+    @property
+    def now(self) -> int:
+        """Time of the latest tick."""
+        return int(self._timestamps[self._size - 1])
+
+    def advance(self, steps: int = 1) -> np.ndarray:
+        """
+        Simulate new ticks.
+
+        Args:
+            steps: Number of ticks
+
+        Returns:
+            np.ndarray: Pair prices of the new ticks, shape (steps, pairs)
+        """
+        with self._lock:
+            return self._advance(steps)
+
+    def _advance(self, steps: int) -> np.ndarray:
+        # Caller holds the lock
+        path = self._log_values[self._size - 1] + np.cumsum(self._increments(steps), axis=0)
+        timestamps = self.now + self.tick_seconds * np.arange(1, steps + 1, dtype=np.int64)
+        self._append(path, timestamps)
+        return self._pair_prices(path)
+
+    def advance_to(self, timestamp: float) -> int:
+        """Simulate ticks up to a time; returns the number of ticks added."""
+        # Steps are counted under the lock, so concurrent callers never add the same ticks twice
+        with self._lock:
+            steps = int((timestamp - self.now) // self.tick_seconds)
+            if steps > 0:
+                self._advance(steps)
+        return max(steps, 0)
+
+    def _pair_prices(self, log_values: np.ndarray) -> np.ndarray:
+        padded = np.concatenate((log_values, np.zeros(log_values.shape[:-1] + (1,))), axis=-1)
+        return np.exp(padded[..., self._base] - padded[..., self._quote])
+
+    def prices(self) -> Dict[Pair, float]:
+        """Latest price of every pair."""
+        with self._lock:
+            latest = self._pair_prices(self._log_values[self._size - 1])
+        return {pair: float(p) for pair, p in zip(self.pairs, latest)}
+
+    def series(self, pair: Pair, range_val: str = "5d", interval: str = "5m") -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bars of a pair for a Yahoo range and interval.
+
+        Ranges within the kept history are resampled from it (last tick of each bar); longer
+        ranges extend it backwards with a seeded path per pair, so repeated requests agree.
+
+        Args:
+            pair: (base, quote)
+            range_val: Yahoo range ('1d', '5d', 'ytd', ...)
+            interval: Yahoo interval ('5m', '1d', ...)
+
+        Returns:
+            tuple: (int64 epoch-second timestamps, float64 closes)
+        """
+        column = self.pairs.index((pair[0].upper(), pair[1].upper()))
+        step = INTERVAL_SECONDS.get(interval, 300)
+        with self._lock:
+            end = self.now
+            if range_val == "ytd":
+                span = end - int(datetime(datetime.fromtimestamp(end).year, 1, 1).timestamp())
+            else:
+                span = RANGE_SECONDS.get(range_val, 5 * 86400)
+            bar_times = np.arange(end - span + step, end + 1, step, dtype=np.int64)
+            if not len(bar_times):
+                bar_times = np.array([end], dtype=np.int64)
+
+            history_times = self._timestamps[:self._size]
+            history = self._pair_prices(self._log_values[:self._size])[:, column]
+
+        closes = np.empty(len(bar_times))
+        inside = bar_times >= history_times[0]
+        position = np.searchsorted(history_times, bar_times[inside], side="right") - 1
+        closes[inside] = history[position]
+
+        older = np.count_nonzero(~inside)
+        if older:
+            # Seeded walk backwards from the oldest kept price at the bar interval
+            rng = np.random.default_rng(_stable_seed(self.seed, *pair, range_val, interval))
+            base_class = asset_class(pair[0]) if pair[0] != "USD" else asset_class(pair[1])
+            vol = ASSET_CLASSES[base_class]["volatility"] * np.sqrt(step / SECONDS_PER_YEAR)
+            steps = rng.standard_normal(older) * vol
+            closes[:older] = history[0] * np.exp(-np.cumsum(steps[::-1]))[::-1]
+        return bar_times, closes
+
+    def spark_payload(self, pair: Pair, range_val: str = "5d", interval: str = "5m") -> Dict:
+        """
+        Spark response of one pair, in the format the scraper stores and the chart loaders read.
+
+        Args:
+            pair: (base, quote)
+            range_val: Yahoo range
+            interval: Yahoo interval
+
+        Returns:
+            dict: Payload with a single 'spark.result' entry
+        """
+        timestamps, closes = self.series(pair, range_val, interval)
+        _, day_closes = self.series(pair, "5d", "1d")
+        base, quote = pair
+        previous_close = float(day_closes[-2]) if len(day_closes) > 1 else float(closes[0])
+        symbol = yahoo_symbol(base, quote)
+        meta = {
+            "currency": quote,
+            "symbol": symbol,
+            "exchangeName": "SIM",
+            "instrumentType": "CURRENCY" if asset_class(base) == "fx" else asset_class(base).upper(),
+            "regularMarketTime": int(timestamps[-1]),
+            "gmtoffset": 0,
+            "timezone": "GMT",
+            "regularMarketPrice": round(float(closes[-1]), 6),
+            "regularMarketDayHigh": round(float(closes[-min(len(closes), 288):].max()), 6),
+            "regularMarketDayLow": round(float(closes[-min(len(closes), 288):].min()), 6),
+            "longName": f"{base}/{quote}",
+            "shortName": f"{base}/{quote}",
+            "chartPreviousClose": round(float(closes[0]), 6),
+            "previousClose": round(previous_close, 6),
+            "dataGranularity": interval,
+            "range": range_val,
+        }
+        return {
+            "spark": {
+                "result": [{
+                    "symbol": symbol,
+                    "response": [{
+                        "meta": meta,
+                        "timestamp": timestamps.tolist(),
+                        "indicators": {"quote": [{"close": np.round(closes, 6).tolist()}]},
+                    }],
+                }],
+                "error": None,
+            }
+        }
+
+    def write_spark_files(self, directory: str, range_val: str = "5d", interval: str = "5m") -> int:
+        """
+        Write one spark file per pair, named like the scraper's (e.g., 'eur_usd.json').
+
+        Args:
+            directory: Target folder (e.g., fx_news/scrapers/rates/5d)
+            range_val: Yahoo range
+            interval: Yahoo interval
+
+        Returns:
+            int: Number of files written
+        """
+        os.makedirs(directory, exist_ok=True)
+        for base, quote in self.pairs:
+            with open(os.path.join(directory, f"{base.lower()}_{quote.lower()}.json"), "w") as f:
+                json.dump(self.spark_payload((base, quote), range_val, interval), f)
+        return len(self.pairs)
+
+    def pair_for_symbol(self, symbol: str) -> Optional[Pair]:
+        """Resolve a Yahoo symbol ('EURUSD=X', 'JPY=X', 'BTC-USD', '^GSPC', escaped or not) to a simulated pair."""
+        return self._symbols.get(unquote(symbol).strip().upper())
+
+
+#################################
+# Local spark endpoint
+#################################
+
+def make_handler(simulator: MarketSimulator, speed: float, started: float, latency: float = 0.0):
+    """Request handler answering /v7/finance/spark from the simulator."""
+    simulator_start = simulator.now
+
+    class SparkHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != "/v7/finance/spark":
+                self.send_error(404)
+                return
+
+            # Simulated time runs `speed` times faster than the wall clock
+            elapsed = (time.time() - started) * speed
+            simulator.advance_to(simulator_start + elapsed)
+
+            query = parse_qs(url.query)
+            range_val = query.get("range", ["5d"])[0]
+            interval = query.get("interval", ["5m"])[0]
+            results = []
+            for symbol in ",".join(query.get("symbols", [""])).split(","):
+                pair = simulator.pair_for_symbol(symbol)
+                if pair is not None:
+                    results.extend(simulator.spark_payload(pair, range_val, interval)["spark"]["result"])
+
+            if latency:
+                time.sleep(latency)
+            body = json.dumps({"spark": {"result": results, "error": None}}).encode("utf-8")
+            self.send_response(200 if results else 404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return SparkHandler
+
+
+def serve(simulator: MarketSimulator, host: str = "127.0.0.1", port: int = 8765,
+          speed: float = 1.0, latency: float = 0.0) -> ThreadingHTTPServer:
+    """
+    Start the local spark endpoint in a background thread.
+
+    Args:
+        simulator: Market to serve
+        host: Bind address
+        port: Port (0 picks a free one)
+        speed: Simulated seconds per wall-clock second
+        latency: Extra seconds added to every response
+
+    Returns:
+        ThreadingHTTPServer: Running server; call shutdown() to stop it
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(simulator, speed, time.time(), latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate a market for offline load testing")
+    parser.add_argument("command", choices=["write", "serve"])
+    parser.add_argument("--pairs", type=int, default=300, help="Number of simulated pairs")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--tick", type=int, default=DEFAULT_TICK_SECONDS, help="Seconds between ticks")
+    parser.add_argument("--out", default="fx_news/scrapers/rates", help="Rates folder for 'write'")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--speed", type=float, default=1.0, help="Simulated seconds per real second")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to each response")
+    args = parser.parse_args()
+
+    sim = MarketSimulator(default_pairs(args.pairs), seed=args.seed, tick_seconds=args.tick)
+
+    if args.command == "write":
+        start = time.perf_counter()
+        written = sim.write_spark_files(os.path.join(args.out, "5d"), "5d", "5m")
+        sim.write_spark_files(os.path.join(args.out, "ytd"), "ytd", "1d")
+        print(f"Wrote {written} pairs to {args.out}/5d and {args.out}/ytd in {time.perf_counter() - start:.2f}s")
+    else:
+        httpd = serve(sim, args.host, args.port, args.speed, args.latency)
+        print(f"Serving {len(sim.pairs)} simulated pairs on http://{args.host}:{httpd.server_port}/v7/finance/spark")
+        print(f"Run the app with FX_SPARK_URL=http://{args.host}:{httpd.server_port}/v7/finance/spark")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            httpd.shutdown()
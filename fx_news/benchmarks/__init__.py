@@ -0,0 +1,5 @@
+"""
+Benchmarks for the hot paths of the news and rates pipelines.
+Run with `python -m fx_news.benchmarks.hot_paths` or under pytest-benchmark (see test_hot_paths.py);
+fixtures are generated on first use.
+"""
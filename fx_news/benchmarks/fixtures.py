@@ -0,0 +1,266 @@
+"""
+Synthetic fixture data for the hot-path benchmarks.
+Article archives are written in the exact on-disk format of save_article_to_file, news items
+match what load_news_from_files returns, and rates come from the market simulator, so every
+benchmark exercises the real code paths. Everything is seeded and generated once per day.
+"""
+import json
+import os
+import random
+import shutil
+import time
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from fx_news.apis.market_simulator import MarketSimulator, default_pairs
+from fx_news.data.models import NewsItem
+from fx_news.data.rate_history import RateHistory
+
+FIXTURES_DIR = "fx_news/benchmarks/fixtures"
+DEFAULT_SEED = 7
+
+# Archive timestamps are spread over this many days before generation time ...
+ARCHIVE_SPAN_DAYS = 30
+
+# ... so archives are regenerated once they are this old, keeping the share of recent files stable
+FIXTURE_MAX_AGE_SECONDS = 24 * 3600
+
+# File symbols of the generated archives, as written by the scrapers (pairs, single currencies, indices)
+ARCHIVE_SYMBOLS = [
+    "eur_usd", "gbp_usd", "usd_jpy", "aud_usd", "usd_cad", "usd_chf", "eur_gbp", "eur_jpy",
+    "btc_usd", "eth_usd", "sol_usd", "xrp_usd", "dji", "gspc", "ixic", "usd", "eur", "market",
+]
+
+SOURCES = [
+    "https://finance.yahoo.com/news/{slug}-{id}.html",
+    "https://www.reuters.com/markets/currencies/{slug}-{id}/",
+    "https://www.cnbc.com/2025/03/18/{slug}-{id}.html",
+    "https://www.bloomberg.com/news/articles/{slug}-{id}",
+]
+
+SUBJECTS = ["Dollar", "Euro", "Sterling", "Yen", "Bitcoin", "Ether", "Treasury yields", "Gold", "Stocks",
+            "The Fed", "The ECB", "The Bank of Japan", "Oil", "The Dow", "The S&P 500", "Emerging currencies"]
+VERBS = ["edges higher", "slips", "rallies", "tumbles", "holds steady", "extends gains", "pares losses",
+         "hits a two-week high", "falls to a one-month low", "climbs", "retreats", "steadies"]
+CONTEXTS = ["ahead of payrolls", "as inflation cools", "after rate decision", "on trade worries",
+            "as traders price in cuts", "amid risk-off mood", "before central bank meeting",
+            "on strong retail sales", "as yields rise", "after PMI surprise"]
+SENTIMENTS = [("positive", 0.62), ("negative", -0.55), ("neutral", 0.04)]
+
+
+def _headline(rng: random.Random) -> str:
+    return f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(CONTEXTS)}"
+
+
+def _paragraphs(rng: random.Random, count: int) -> List[str]:
+    return [" ".join(f"{_headline(rng)}." for _ in range(rng.randint(3, 5))) for _ in range(count)]
+
+
+def _article(rng: random.Random, index: int) -> Dict:
+    title = _headline(rng)
+    slug = title.lower().replace(" ", "-").replace("&", "and")
+    url = rng.choice(SOURCES).format(slug=slug, id=f"{100000000 + index}")
+    sentiment, score = rng.choice(SENTIMENTS)
+    return {
+        "title": title,
+        "url": url,
+        "article_id": str(100000000 + index),
+        "paragraphs": _paragraphs(rng, rng.randint(3, 6)),
+        "sentiment": sentiment,
+        "score": score,
+    }
+
+
+def _write_article(folder: str, unix_timestamp: int, symbol: str, article: Dict) -> str:
+    """Write one article exactly like save_article_to_file does."""
+    content = "\n\n".join(article["paragraphs"])
+    summary = " ".join(article["paragraphs"][:3]).strip()
+    summary = summary[:500] + ("..." if len(summary) > 500 else "")
+    path = os.path.join(folder, f"article_{unix_timestamp}_{symbol}.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"# {article['title']}\n\n")
+        f.write(f"Article ID: {article['article_id']}\n")
+        f.write(f"Source: {article['url']}\n")
+        f.write(f"Timestamp: {unix_timestamp} ({datetime.fromtimestamp(unix_timestamp).isoformat()})\n\n")
+        f.write(f"SUMMARY: {summary}\n\n")
+        f.write(content)
+        f.write(f"\n\n---\nSENTIMENT: {article['sentiment']}\n")
+        f.write(f"SCORE: {article['score']}\n")
+    return path
+
+
+class BenchmarkFixtures:
+    """Seeded fixture data, written to disk once and kept in memory for the run."""
+
+    def __init__(self, root: str = FIXTURES_DIR, seed: int = DEFAULT_SEED):
+        self.root = root
+        self.seed = seed
+        self._memory: Dict[Tuple, object] = {}
+
+    def _fresh(self, folder: str, spec: Dict) -> bool:
+        manifest = os.path.join(folder, "manifest.json")
+        if not os.path.exists(manifest):
+            return False
+        try:
+            with open(manifest) as f:
+                stored = json.load(f)
+        except (ValueError, OSError):
+            return False
+        return (stored.get("spec") == spec
+                and time.time() - stored.get("generated", 0) < FIXTURE_MAX_AGE_SECONDS)
+
+    def _mark(self, folder: str, spec: Dict) -> None:
+        with open(os.path.join(folder, "manifest.json"), "w") as f:
+            json.dump({"spec": spec, "generated": time.time()}, f)
+
+    def news_archive(self, count: int) -> str:
+        """
+        Folder holding an archive of `count` article files over ARCHIVE_SYMBOLS.
+
+        Args:
+            count: Number of article files
+
+        Returns:
+            str: Archive folder
+        """
+        folder = os.path.join(self.root, f"news_{count}")
+        spec = {"kind": "news_archive", "count": count, "seed": self.seed}
+        if self._fresh(folder, spec):
+            return folder
+
+        shutil.rmtree(folder, ignore_errors=True)
+        os.makedirs(folder)
+        rng = random.Random(self.seed * 1_000_003 + count)
+        now = int(time.time())
+        # Distinct offsets, so no two files of a symbol share a timestamp
+        offsets = rng.sample(range(ARCHIVE_SPAN_DAYS * 86400), count)
+        for index, offset in enumerate(offsets):
+            _write_article(folder, now - offset, rng.choice(ARCHIVE_SYMBOLS), _article(rng, index))
+        self._mark(folder, spec)
+        return folder
+
+    def news_items(self, count: int, offset: int = 0) -> List[NewsItem]:
+        """
+        In-memory NewsItem records like those of load_news_from_files.
+
+        Args:
+            count: Number of items
+            offset: First article index, so two calls can overlap partially
+
+        Returns:
+            list: NewsItem records (treat as read-only; copy before mutating)
+        """
+        key = ("news_items", count, offset)
+        if key not in self._memory:
+            rng = random.Random(self.seed * 7919 + count + offset)
+            now = int(time.time())
+            items = []
+            for index in range(offset, offset + count):
+                article = _article(rng, index)
+                symbol = rng.choice(ARCHIVE_SYMBOLS)
+                unix_timestamp = now - rng.randrange(ARCHIVE_SPAN_DAYS * 86400)
+                currency = symbol.upper().replace("_", "/")
+                items.append(NewsItem(
+                    title=article["title"],
+                    summary=" ".join(article["paragraphs"][:2]),
+                    source="Yahoo Finance",
+                    timestamp=unix_timestamp,
+                    unix_timestamp=unix_timestamp,
+                    url=article["url"],
+                    currency=currency,
+                    currency_pairs={currency},
+                    sentiment=article["sentiment"],
+                    score=article["score"],
+                    article_id=article["article_id"] if index % 3 else "",
+                    file_path=os.path.join(self.root, f"article_{unix_timestamp}_{symbol}.txt"),
+                ))
+            self._memory[key] = items
+        return self._memory[key]
+
+    def news_dicts(self, count: int, offset: int = 0) -> List[Dict]:
+        """
+        The news_items records as plain dicts, the way fetch_news receives scraped items.
+
+        Args:
+            count: Number of items
+            offset: First article index, as in news_items
+
+        Returns:
+            list: New dicts on every call (safe to mutate)
+        """
+        return [{
+            "title": item.title,
+            "summary": item.summary,
+            "source": item.source,
+            "timestamp": item.timestamp,
+            "unix_timestamp": item.unix_timestamp,
+            "url": item.url,
+            "currency": item.currency,
+            "currency_pairs": set(item.currency_pairs),
+            "sentiment": item.sentiment,
+            "score": item.score,
+            "article_id": item.article_id,
+            "file_path": item.file_path,
+        } for item in self.news_items(count, offset)]
+
+    def chart_dirs(self, pair_count: int) -> Tuple[str, str]:
+        """
+        5D and YTD spark files for `pair_count` simulated pairs.
+
+        Returns:
+            tuple: (5d folder, ytd folder), laid out like fx_news/scrapers/rates
+        """
+        folder = os.path.join(self.root, f"rates_{pair_count}")
+        five_d_dir, ytd_dir = os.path.join(folder, "5d"), os.path.join(folder, "ytd")
+        spec = {"kind": "charts", "pairs": pair_count, "seed": self.seed}
+        if not self._fresh(folder, spec):
+            shutil.rmtree(folder, ignore_errors=True)
+            os.makedirs(folder)
+            simulator = MarketSimulator(default_pairs(pair_count), seed=self.seed)
+            simulator.write_spark_files(five_d_dir, "5d", "5m")
+            simulator.write_spark_files(ytd_dir, "ytd", "1d")
+            self._mark(folder, spec)
+        return five_d_dir, ytd_dir
+
+    def chart_pairs(self, pair_count: int) -> List[Tuple[str, str]]:
+        """Pairs written by chart_dirs."""
+        return default_pairs(pair_count)
+
+    def subscriptions(self, pair_count: int, ticks: int = 500) -> Tuple[List[Dict], Dict[str, RateHistory]]:
+        """
+        Subscriptions with current rates and a filled rate history per pair.
+
+        Args:
+            pair_count: Number of subscribed pairs
+            ticks: Rate history points per pair
+
+        Returns:
+            tuple: (subscriptions, pair key -> RateHistory)
+        """
+        key = ("subscriptions", pair_count, ticks)
+        if key not in self._memory:
+            pairs = default_pairs(pair_count)
+            simulator = MarketSimulator(pairs, seed=self.seed)
+            histories = {}
+            for base, quote in pairs:
+                timestamps, rates = simulator.series((base, quote), "1d", "1m")
+                history = RateHistory()
+                for ts, rate in zip(timestamps[-ticks:], rates[-ticks:]):
+                    history.append(float(rate), datetime.fromtimestamp(int(ts)))
+                histories[f"{base.lower()}_{quote.lower()}"] = history
+            prices = simulator.prices()
+            subscriptions = [{
+                "base": base,
+                "quote": quote,
+                "current_rate": prices[(base, quote)],
+                "last_rate": histories[f"{base.lower()}_{quote.lower()}"].last(),
+                "previous_close": None,
+                "threshold": 0.5,
+            } for base, quote in pairs]
+            self._memory[key] = (subscriptions, histories)
+        return self._memory[key]
+
+    def headlines(self, count: int) -> List[str]:
+        """Headline plus first paragraph of `count` articles, as fed to sentiment analysis."""
+        rng = random.Random(self.seed + count)
+        return [f"{a['title']}. {a['paragraphs'][0]}" for a in (_article(rng, i) for i in range(count))]
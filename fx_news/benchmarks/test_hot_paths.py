@@ -0,0 +1,43 @@
+"""
+The hot-path benchmarks as pytest-benchmark tests, compared with the committed baseline run.
+A benchmark fails when its median regresses past the tolerance set by --benchmark-compare-fail:
+
+    pytest fx_news/benchmarks --benchmark-storage=fx_news/benchmarks/baselines \
+        --benchmark-compare --benchmark-compare-fail=median:150%
+
+The committed baseline takes, for each benchmark, the run with the median median of seven
+sessions; 150% matches DEFAULT_TOLERANCE in hot_paths, above the noise measured there. Record a
+new baseline on the machine that runs the comparison with --benchmark-save=reference.
+"""
+import logging
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from fx_news.benchmarks.fixtures import BenchmarkFixtures, FIXTURES_DIR
+from fx_news.benchmarks.hot_paths import BENCHMARKS, missing_requirements, select_benchmarks
+
+# Set FX_BENCH_LARGE=1 to include the 100k-article archive
+INCLUDE_LARGE = os.environ.get("FX_BENCH_LARGE", "0") == "1"
+
+
+@pytest.fixture(scope="session")
+def fixtures():
+    # The scrapers log every file at INFO; keep the timings about the work, not the console
+    logging.disable(logging.INFO)
+    yield BenchmarkFixtures(FIXTURES_DIR)
+    logging.disable(logging.NOTSET)
+
+
+@pytest.mark.parametrize("name", select_benchmarks(skip_large=not INCLUDE_LARGE))
+def test_hot_path(name, fixtures, benchmark):
+    spec = BENCHMARKS[name]
+    missing = missing_requirements(name)
+    if missing:
+        pytest.skip(f"requires {', '.join(missing)}")
+
+    # Setup runs before every round, untimed, and hands the call under test to the target
+    benchmark.pedantic(lambda call: call(), setup=lambda: ((spec["func"](fixtures),), {}),
+                       rounds=spec["rounds"], warmup_rounds=spec["warmup"], iterations=1)
@@ -2,8 +2,11 @@
 Data models and structures for the FX Pulsar application.
 Contains class definitions and data structures used throughout the application.
 """
+import sys
+import time
+from collections.abc import MutableMapping
 from dataclasses import dataclass, field
-from typing import Dict, List, Set, Optional, Union, Any
+from typing import Dict, List, Set, Optional, Tuple, Union, Any
 from datetime import datetime
 import pandas as pd
 
@@ -37,29 +40,212 @@ class CurrencyPair:
             return ((self.current_rate - reference_price) / reference_price) * 100
         return None
 
-@dataclass
-class NewsItem:
-    """Model for a news item."""
-    title: str
-    summary: str = ""
-    source: str = "Unknown"
-    timestamp: datetime = field(default_factory=datetime.now)
-    currency: str = ""
-    currency_pairs: Set[str] = field(default_factory=set)
-    sentiment: str = "neutral"
-    score: float = 0.0
-    url: str = ""
-    unix_timestamp: Optional[int] = None
-    file_path: str = ""
-    is_fx: bool = False
-    is_crypto: bool = False
-    is_indices: bool = False
-    is_market: bool = False
-
-    def __post_init__(self):
-        """Initialize after object creation."""
-        if self.unix_timestamp is None and self.timestamp:
-            self.unix_timestamp = int(self.timestamp.timestamp())
+# Market type bitflags of NewsItem.flags
+MARKET_FX = 1
+MARKET_CRYPTO = 2
+MARKET_INDICES = 4
+MARKET_GENERAL = 8
+
+_FLAG_KEYS = {
+    'is_fx': MARKET_FX,
+    'is_crypto': MARKET_CRYPTO,
+    'is_indices': MARKET_INDICES,
+    'is_market': MARKET_GENERAL,
+}
+
+# Keys stored directly in a NewsItem slot, with the same name
+_SLOT_KEYS = ('title', 'summary', 'source', 'url', 'currency', 'currency_pairs', 'sentiment',
+              'score', 'unix_timestamp', 'article_id', 'file_path')
+_INTERNED_KEYS = {'source', 'currency', 'sentiment'}
+
+# Currency pair tuples shared by all items with the same pairs
+_shared_pairs: Dict[frozenset, Tuple[str, ...]] = {}
+
+
+def _pairs(value) -> Tuple[str, ...]:
+    if isinstance(value, str):
+        value = (value,)
+    key = frozenset(value)
+    pairs = _shared_pairs.get(key)
+    if pairs is None:
+        pairs = tuple(sys.intern(p) if isinstance(p, str) else p for p in sorted(key, key=str))
+        pairs = _shared_pairs.setdefault(key, pairs)
+    return pairs
+
+
+def _epoch(value) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return int(value)
+
+
+def _coerce(key: str, value):
+    if value is None:
+        return None
+    if key in _INTERNED_KEYS and isinstance(value, str):
+        return sys.intern(value)
+    if key == 'currency_pairs':
+        return _pairs(value)
+    if key == 'unix_timestamp':
+        return _epoch(value)
+    return value
+
+
+class NewsItem(MutableMapping):
+    """
+    Compact record for a news article, as kept in the session news caches.
+
+    Uses __slots__, interned source/currency/sentiment strings, shared currency pair tuples,
+    int epoch timestamps and a bitfield of MARKET_* flags. It still reads and writes like the
+    news item dicts it replaces (item['title'], item.get('is_fx'), 'url' in item), with
+    'timestamp' turned into a datetime on access. Unset fields count as missing keys.
+    """
+    __slots__ = ('title', 'summary', 'source', 'url', 'currency', 'currency_pairs', 'sentiment',
+                 'score', 'epoch', 'unix_timestamp', 'article_id', 'file_path', 'flags', 'extra')
+
+    def __init__(self, title: str = "", summary: str = None, source: str = None, timestamp=None,
+                 currency: str = None, currency_pairs=None, sentiment: str = None, score: float = None,
+                 url: str = None, unix_timestamp=None, article_id: str = None, file_path: str = None,
+                 flags: int = 0, **extra):
+        self.title = title
+        self.summary = summary
+        self.source = _coerce('source', source)
+        self.url = url
+        self.currency = _coerce('currency', currency)
+        self.currency_pairs = _coerce('currency_pairs', currency_pairs)
+        self.sentiment = _coerce('sentiment', sentiment)
+        self.score = score
+        self.unix_timestamp = _epoch(unix_timestamp)
+        self.epoch = _epoch(timestamp)
+        if self.epoch is None or self.epoch == self.unix_timestamp:
+            self.epoch = self.unix_timestamp
+        self.article_id = article_id
+        self.file_path = file_path
+        self.flags = flags
+        self.extra = None
+        for key, value in extra.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, item) -> "NewsItem":
+        """Return item as a NewsItem (unchanged if it already is one)."""
+        if isinstance(item, cls):
+            return item
+        return cls(**item)
+
+    @property
+    def timestamp(self) -> Optional[datetime]:
+        return None if self.epoch is None else datetime.fromtimestamp(self.epoch)
+
+    @property
+    def is_fx(self) -> bool:
+        return bool(self.flags & MARKET_FX)
+
+    @property
+    def is_crypto(self) -> bool:
+        return bool(self.flags & MARKET_CRYPTO)
+
+    @property
+    def is_indices(self) -> bool:
+        return bool(self.flags & MARKET_INDICES)
+
+    @property
+    def is_market(self) -> bool:
+        return bool(self.flags & MARKET_GENERAL)
+
+    def __getitem__(self, key):
+        if key in _SLOT_KEYS:
+            value = getattr(self, key)
+        elif key == 'timestamp':
+            value = self.timestamp
+        elif key in _FLAG_KEYS:
+            return bool(self.flags & _FLAG_KEYS[key])
+        else:
+            value = self.extra.get(key) if self.extra is not None else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key in _SLOT_KEYS:
+            setattr(self, key, _coerce(key, value))
+        elif key == 'timestamp':
+            self.epoch = _epoch(value)
+        elif key in _FLAG_KEYS:
+            if value:
+                self.flags |= _FLAG_KEYS[key]
+            else:
+                self.flags &= ~_FLAG_KEYS[key]
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if key in _FLAG_KEYS:
+            self.flags &= ~_FLAG_KEYS[key]
+        elif key in _SLOT_KEYS or key == 'timestamp':
+            setattr(self, 'epoch' if key == 'timestamp' else key, None)
+        else:
+            del self.extra[key]
+
+    def __iter__(self):
+        for key in _SLOT_KEYS:
+            if getattr(self, key) is not None:
+                yield key
+        if self.epoch is not None:
+            yield 'timestamp'
+        yield from _FLAG_KEYS
+        if self.extra is not None:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    # Records are compared by identity, like the objects they are (not by value, like dicts)
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    def __repr__(self) -> str:
+        return f"NewsItem({self.title!r}, currency={self.currency!r}, epoch={self.epoch})"
+
+    def copy(self) -> "NewsItem":
+        clone = NewsItem.__new__(NewsItem)
+        for name in self.__slots__:
+            setattr(clone, name, getattr(self, name))
+        if self.extra is not None:
+            clone.extra = dict(self.extra)
+        return clone
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict of the set fields, in the shape of the legacy news item dicts."""
+        item = dict(self.items())
+        if 'currency_pairs' in item:
+            item['currency_pairs'] = set(item['currency_pairs'])
+        return item
+
+
+def compact_news(news_items) -> List[NewsItem]:
+    """
+    Convert news items (dicts or NewsItem records) to NewsItem records.
+
+    Args:
+        news_items: Iterable of news items
+
+    Returns:
+        list: NewsItem records, existing records passed through unchanged
+    """
+    return [NewsItem.from_dict(item) for item in news_items]
+
+
+def newest_first(news_items: List[NewsItem]) -> List[NewsItem]:
+    """Sort NewsItem records by timestamp, newest first; records without one come first."""
+    now = int(time.time())
+    return sorted(news_items, key=lambda item: now if item.epoch is None else item.epoch, reverse=True)
 
 @dataclass
 class EconomicEvent:
@@ -0,0 +1,104 @@
+"""
+Fixed-capacity rate history for the live rate ticks of each pair.
+Backed by preallocated NumPy arrays so appends never allocate, and every window of
+recent points is a contiguous zero-copy view shared by the volatility, chart and forecast code.
+"""
+from datetime import datetime
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Points kept per pair; at the 35-second refresh cadence this is roughly 19 hours of ticks
+RATE_HISTORY_CAPACITY = 2000
+
+
+class RateHistory:
+    """
+    Ring buffer of (timestamp, rate) points.
+
+    Every point is written twice, at its slot and one capacity further on, so the most
+    recent n points are always a contiguous slice of the backing arrays (no wrap-around copy).
+    Timestamps are stored as int64 nanoseconds since the epoch, rates as float64.
+    """
+
+    __slots__ = ("capacity", "_timestamps", "_rates", "_head", "_size")
+
+    def __init__(self, capacity: int = RATE_HISTORY_CAPACITY):
+        self.capacity = capacity
+        self._timestamps = np.zeros(2 * capacity, dtype=np.int64)
+        self._rates = np.zeros(2 * capacity, dtype=np.float64)
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, rate: float, timestamp: Optional[datetime] = None) -> None:
+        """
+        Add a point, overwriting the oldest one once the buffer is full.
+
+        Args:
+            rate: Rate value
+            timestamp: Time of the rate (default: now)
+        """
+        ts = pd.Timestamp(timestamp or datetime.now()).value
+        head = self._head
+        self._timestamps[head] = self._timestamps[head + self.capacity] = ts
+        self._rates[head] = self._rates[head + self.capacity] = rate
+        self._head = (head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def _window(self, values: np.ndarray, n: Optional[int]) -> np.ndarray:
+        n = self._size if n is None else max(0, min(n, self._size))
+        end = self._head + self.capacity
+        view = values[end - n:end]
+        view.flags.writeable = False
+        return view
+
+    def rates(self, n: Optional[int] = None) -> np.ndarray:
+        """
+        Return the most recent rates, oldest first, as a read-only view.
+
+        Args:
+            n: Number of points (default: all)
+
+        Returns:
+            np.ndarray: Float64 view of up to n rates
+        """
+        return self._window(self._rates, n)
+
+    def timestamps(self, n: Optional[int] = None) -> np.ndarray:
+        """Return the most recent timestamps (int64 ns since the epoch), oldest first, as a read-only view."""
+        return self._window(self._timestamps, n)
+
+    def window(self, n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (timestamps, rates) views of the most recent n points."""
+        return self.timestamps(n), self.rates(n)
+
+    def last(self) -> Optional[float]:
+        """Return the latest rate, or None if the history is empty."""
+        if not self._size:
+            return None
+        return float(self._rates[self._head + self.capacity - 1])
+
+    def to_frame(self, n: Optional[int] = None) -> pd.DataFrame:
+        """
+        Return the most recent points as a DataFrame with 'timestamp' and 'rate' columns.
+
+        Args:
+            n: Number of points (default: all)
+
+        Returns:
+            pd.DataFrame: Copy of the window, for plotting and forecasting
+        """
+        timestamps, rates = self.window(n)
+        return pd.DataFrame({
+            "timestamp": pd.to_datetime(timestamps),
+            "rate": rates.copy(),
+        })
+
+    def clear(self) -> None:
+        """Drop every point without releasing the buffers."""
+        self._head = 0
+        self._size = 0
@@ -5,6 +5,7 @@ import logging
 from fx_news.config.settings import default_fx_pairs, default_crypto_pairs, default_indices
 from fx_news.services.news_service import fetch_news, fetch_indices_news
 from fx_news.utils.notifications import add_notification
+from fx_news.utils.render_profiler import profile_component
 
 logger = logging.getLogger("session_state")
 
@@ -58,6 +59,7 @@ def initialize_session_state():
         'fx_subscriptions': default_fx_pairs,  # Store FX subscriptions separately
         'crypto_subscriptions': default_crypto_pairs,  # Store crypto subscriptions separately
         'collapse_all_cards': True,  # Default to collapsed cards
+        'precompute_forecasts': True,  # Fit forecasts in the background after each rates update
     }
     
     # Only set the value if the key doesn't exist in session state
@@ -104,6 +106,7 @@ def initialize_session_state():
     if 'crypto_events_last_fetch' not in st.session_state:
         st.session_state.crypto_events_last_fetch = None
 
+@profile_component()
 def ensure_initial_news_loaded():
     """Ensure news are loaded from disk on first page load"""
     if not st.session_state.initial_news_loaded:
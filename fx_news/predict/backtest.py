@@ -0,0 +1,452 @@
+"""
+Model-selection backtest engine.
+Scores candidate models (ExponentialSmoothing, ARIMA, AutoARIMA, Prophet and the baseline)
+over rolling-origin folds in worker processes, ranks them by a configurable metric and keeps
+a per-pair leaderboard on disk. The DARTS 'auto' mode reuses the selection until the data drifts.
+"""
+import copy
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: updates are only serialized within a process
+    fcntl = None
+
+from fx_news.predict.forecast_cache import FORECAST_CACHE_DIR
+from fx_news.predict.forecast_executor import pool_context
+from fx_news.predict.baseline import build_rate_matrix, ewma_drift_forecast
+
+logger = logging.getLogger("backtest")
+logger.setLevel(logging.WARNING)
+
+CANDIDATE_MODELS = ['exponential', 'arima', 'autoarima', 'prophet', 'baseline']
+DARTS_MODELS = ('exponential', 'arima', 'autoarima')
+METRICS = ('mape', 'rmse', 'mae')
+DEFAULT_METRIC = 'mape'
+
+# Rolling-origin settings
+BACKTEST_FOLDS = 3
+MIN_TRAIN_POINTS = 30
+
+# Wall-time bound for one backtest; folds still running after this are dropped
+BACKTEST_TIME_BUDGET = 120
+
+# Reuse a selection until it is this old or the data drifts away from it
+MAX_SELECTION_AGE_HOURS = 24
+DRIFT_LEVEL_PCT = 1.0
+DRIFT_VOLATILITY_RATIO = 2.0
+
+LEADERBOARD_PATH = os.path.join(FORECAST_CACHE_DIR, "leaderboard.json")
+_leaderboard_lock = threading.Lock()
+# Parsed leaderboard and the (path, mtime) of the file it was read from
+_leaderboard_cache: Dict[str, Any] = {'data': None, 'version': None}
+
+
+#################################
+# Candidate models
+#################################
+
+def make_darts_model(name: str):
+    """
+    Build a DARTS model with the configuration used by the forecast tab.
+
+    Args:
+        name: 'exponential', 'arima' or 'autoarima'
+
+    Returns:
+        An unfitted DARTS model
+    """
+    from darts.models import ExponentialSmoothing, ARIMA, AutoARIMA
+
+    if name == 'autoarima':
+        return AutoARIMA(
+            start_p=1, start_q=1, max_p=3, max_q=3,
+            seasonal=True, m=7,  # Weekly seasonality
+            d=1, D=0  # Differencing parameters
+        )
+    if name == 'arima':
+        return ARIMA(p=2, d=1, q=1)
+    return ExponentialSmoothing(
+        seasonal_periods=7,  # Weekly seasonality
+        trend='add',
+        seasonal='add',
+        damped=True
+    )
+
+
+def forecast_candidate(name: str, train_df: pd.DataFrame, freq: str, horizon: int) -> np.ndarray:
+    """
+    Fit one candidate model and forecast a number of steps.
+
+    Args:
+        name: Candidate model name (see CANDIDATE_MODELS)
+        train_df: Evenly spaced DataFrame with 'timestamp' and 'rate' columns
+        freq: Frequency of train_df
+        horizon: Number of steps to forecast
+
+    Returns:
+        np.ndarray: Forecast values
+    """
+    if name in DARTS_MODELS:
+        from darts import TimeSeries
+
+        series = TimeSeries.from_dataframe(train_df, time_col='timestamp', value_cols='rate',
+                                           fill_missing_dates=True, freq=freq)
+        model = make_darts_model(name)
+        model.fit(series)
+        return model.predict(horizon).values().flatten()
+
+    if name == 'prophet':
+        from prophet import Prophet
+
+        prophet_df = train_df[['timestamp', 'rate']].rename(columns={'timestamp': 'ds', 'rate': 'y'})
+        model = Prophet(daily_seasonality=True, weekly_seasonality=True, yearly_seasonality=False,
+                        changepoint_prior_scale=0.05)
+        model.fit(prophet_df)
+        future = model.make_future_dataframe(periods=horizon, freq=freq, include_history=False)
+        return model.predict(future)['yhat'].to_numpy()
+
+    if name == 'baseline':
+        matrix = build_rate_matrix([train_df['rate'].to_numpy(dtype=np.float64)])
+        return ewma_drift_forecast(matrix, horizon)['mean'][0]
+
+    raise ValueError(f"Unknown candidate model: {name}")
+
+
+def _score_fold(name: str, train_df: pd.DataFrame, actual: np.ndarray, freq: str) -> Dict[str, Any]:
+    """Fit a candidate on one fold and score it on the held-out values. Runs in a worker process."""
+    import warnings as py_warnings
+    py_warnings.filterwarnings("ignore")
+
+    start = time.perf_counter()
+    try:
+        predicted = np.asarray(forecast_candidate(name, train_df, freq, len(actual)), dtype=np.float64)
+    except Exception as e:
+        return {'error': str(e)}
+
+    errors = predicted[:len(actual)] - actual
+    return {
+        'mape': float(np.mean(np.abs(errors / actual)) * 100),
+        'rmse': float(np.sqrt(np.mean(errors ** 2))),
+        'mae': float(np.mean(np.abs(errors))),
+        'seconds': time.perf_counter() - start,
+    }
+
+
+#################################
+# Backtest
+#################################
+
+def rolling_origins(n_points: int, horizon: int, folds: int = BACKTEST_FOLDS,
+                    min_train: int = MIN_TRAIN_POINTS) -> List[int]:
+    """
+    Cut-off indices for rolling-origin evaluation.
+
+    The last fold ends at the end of the series; each earlier fold moves the origin back
+    by one horizon. Folds that would leave fewer than min_train training points are skipped.
+
+    Args:
+        n_points: Length of the series
+        horizon: Steps forecast in each fold
+        folds: Maximum number of folds
+        min_train: Minimum training length
+
+    Returns:
+        list: Training lengths, oldest fold first
+    """
+    cutoffs = [n_points - horizon * k for k in range(folds, 0, -1)]
+    return [c for c in cutoffs if c >= min_train]
+
+
+def backtest_horizon(n_points: int, folds: int = BACKTEST_FOLDS) -> int:
+    """Default steps per fold: a tenth of the series, small enough to leave room for every fold."""
+    return max(2, min(n_points // 10, (n_points - MIN_TRAIN_POINTS) // max(1, folds)))
+
+
+def _in_worker_process() -> bool:
+    """True inside a pool worker (e.g., a forecast_executor fit), where folds run inline."""
+    return multiprocessing.parent_process() is not None
+
+
+def run_backtest(merged_df: pd.DataFrame, freq: str, candidates: Optional[List[str]] = None,
+                 folds: int = BACKTEST_FOLDS, horizon: Optional[int] = None,
+                 time_budget: float = BACKTEST_TIME_BUDGET,
+                 max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Score candidate models over rolling-origin folds.
+
+    From the app process each (model, fold) runs in its own worker process, and workers still
+    running when the time budget is spent are terminated. Inside a worker process (a background
+    DARTS fit) the folds run one after another, since a nested pool per fit would start about
+    one process per CPU for every busy worker; no fold is started once the budget is spent.
+
+    Args:
+        merged_df: Evenly spaced DataFrame from _prepare_darts_frame
+        freq: Frequency of merged_df
+        candidates: Models to evaluate (default: CANDIDATE_MODELS)
+        folds: Number of rolling-origin folds
+        horizon: Steps per fold (default: backtest_horizon)
+        time_budget: Seconds to spend on the folds before dropping the stragglers
+        max_workers: Worker processes (default: one per CPU; 1 runs the folds inline)
+
+    Returns:
+        list: One row per model with mean 'mape', 'rmse', 'mae', the number of
+        completed 'folds' and the total fit 'seconds'
+    """
+    candidates = candidates or CANDIDATE_MODELS
+    merged_df = merged_df.dropna(subset=['rate']).reset_index(drop=True)
+    values = merged_df['rate'].to_numpy(dtype=np.float64)
+
+    horizon = horizon or backtest_horizon(len(values), folds)
+    cutoffs = rolling_origins(len(values), horizon, folds)
+    if not cutoffs:
+        return []
+
+    jobs = [(name, (name, merged_df.iloc[:cutoff], values[cutoff:cutoff + horizon], freq))
+            for name in candidates for cutoff in cutoffs]
+    deadline = time.monotonic() + time_budget
+    results: List[Tuple[str, Dict[str, Any]]] = []
+
+    max_workers = max_workers or min(os.cpu_count() or 1, len(jobs))
+    if max_workers == 1 or _in_worker_process():
+        for name, args in jobs:
+            if time.monotonic() >= deadline:
+                break
+            results.append((name, _score_fold(*args)))
+    else:
+        pool = pool_context().Pool(processes=max_workers)
+        try:
+            pending = [(name, pool.apply_async(_score_fold, args)) for name, args in jobs]
+            for name, async_result in pending:
+                try:
+                    results.append((name, async_result.get(timeout=max(0.0, deadline - time.monotonic()))))
+                except multiprocessing.TimeoutError:
+                    pass
+                except Exception as e:
+                    results.append((name, {'error': str(e)}))
+        finally:
+            # Terminate rather than close, so folds still running stop using the CPU
+            pool.terminate()
+            pool.join()
+
+    if len(results) < len(jobs):
+        logger.warning(f"Backtest time budget exceeded, dropping {len(jobs) - len(results)} folds")
+
+    fold_scores: Dict[str, List[Dict[str, Any]]] = {name: [] for name in candidates}
+    for name, result in results:
+        if 'error' in result:
+            logger.info(f"Backtest fold for {name} failed: {result['error']}")
+            continue
+        fold_scores[name].append(result)
+
+    rows = []
+    for name, scores in fold_scores.items():
+        if not scores:
+            continue
+        row = {'model': name, 'folds': len(scores),
+               'seconds': round(sum(s['seconds'] for s in scores), 3)}
+        for metric in METRICS:
+            row[metric] = float(np.mean([s[metric] for s in scores]))
+        rows.append(row)
+    return rows
+
+
+def rank_models(scores: List[Dict[str, Any]], metric: str = DEFAULT_METRIC) -> List[Dict[str, Any]]:
+    """Sort leaderboard rows best first by a metric; models that missed folds rank after complete ones."""
+    most_folds = max((row['folds'] for row in scores), default=0)
+    return sorted(scores, key=lambda row: (row['folds'] < most_folds, row[metric]))
+
+
+#################################
+# Leaderboard
+#################################
+
+def _read_leaderboard() -> Dict[str, Dict[str, Any]]:
+    if not os.path.exists(LEADERBOARD_PATH):
+        return {}
+    try:
+        with open(LEADERBOARD_PATH, "r") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"Could not read leaderboard: {str(e)}")
+        return {}
+
+
+def _leaderboard_version() -> Tuple[str, Optional[int]]:
+    try:
+        return LEADERBOARD_PATH, os.stat(LEADERBOARD_PATH).st_mtime_ns
+    except OSError:
+        return LEADERBOARD_PATH, None
+
+
+def _load_leaderboard() -> Dict[str, Dict[str, Any]]:
+    """Leaderboard kept in memory, re-read only when another process has rewritten the file."""
+    version = _leaderboard_version()
+    with _leaderboard_lock:
+        if _leaderboard_cache['data'] is None or _leaderboard_cache['version'] != version:
+            _leaderboard_cache['data'] = _read_leaderboard()
+            _leaderboard_cache['version'] = version
+        return _leaderboard_cache['data']
+
+
+@contextmanager
+def _leaderboard_file_lock():
+    """Serialize leaderboard updates across worker processes (a no-op without fcntl)."""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(LEADERBOARD_PATH), exist_ok=True)
+    with open(LEADERBOARD_PATH + ".lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _update_leaderboard(pair_key: str, entry: Dict[str, Any]) -> None:
+    with _leaderboard_lock, _leaderboard_file_lock():
+        # Re-read under the file lock so entries written by other processes are kept
+        leaderboard = _read_leaderboard()
+        leaderboard[pair_key] = entry
+        try:
+            os.makedirs(os.path.dirname(LEADERBOARD_PATH), exist_ok=True)
+            tmp_path = f"{LEADERBOARD_PATH}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(leaderboard, f, indent=2)
+            os.replace(tmp_path, LEADERBOARD_PATH)
+        except Exception as e:
+            logger.warning(f"Could not persist leaderboard: {str(e)}")
+        _leaderboard_cache['data'] = leaderboard
+        _leaderboard_cache['version'] = _leaderboard_version()
+
+
+def get_leaderboard(pair_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the stored backtest for a pair.
+
+    Returns:
+        dict: 'selected' model, 'metric', ranked 'scores' and the data profile the
+        selection was made on (a copy, safe to modify), or None if the pair hasn't been backtested
+    """
+    entry = _load_leaderboard().get(pair_key)
+    return copy.deepcopy(entry) if entry is not None else None
+
+
+def get_selection_metric(pair_key: str) -> str:
+    """Return the metric used to pick the model for a pair."""
+    entry = get_leaderboard(pair_key)
+    return entry.get('metric', DEFAULT_METRIC) if entry else DEFAULT_METRIC
+
+
+def set_selection_metric(pair_key: str, metric: str) -> None:
+    """
+    Change the selection metric for a pair, re-ranking the stored scores without a new backtest.
+
+    Args:
+        pair_key: Pair key (e.g., 'eur_usd')
+        metric: One of METRICS
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric: {metric}")
+    entry = get_leaderboard(pair_key) or {'scores': []}
+    if entry.get('metric') == metric:
+        return
+    entry['metric'] = metric
+    entry['scores'] = rank_models(entry['scores'], metric)
+    if entry['scores']:
+        entry['selected'] = entry['scores'][0]['model']
+    _update_leaderboard(pair_key, entry)
+
+
+def _data_profile(values: np.ndarray) -> Dict[str, float]:
+    """Level and step volatility of a series, used to detect drift since the last selection."""
+    returns = np.diff(np.log(values))
+    return {
+        'n_points': int(len(values)),
+        'last_rate': float(values[-1]),
+        'volatility': float(np.std(returns)) if len(returns) else 0.0,
+    }
+
+
+def has_drifted(entry: Dict[str, Any], values: np.ndarray) -> bool:
+    """
+    Check whether a series has moved far enough from the one a selection was made on.
+
+    Args:
+        entry: Leaderboard entry
+        values: Current series values
+
+    Returns:
+        bool: True if the selection is stale and should be backtested again
+    """
+    if time.time() - entry.get('evaluated_at', 0) > MAX_SELECTION_AGE_HOURS * 3600:
+        return True
+
+    current = _data_profile(values)
+    level_change = abs(current['last_rate'] / entry['last_rate'] - 1) * 100
+    if level_change > DRIFT_LEVEL_PCT:
+        return True
+
+    old_vol, new_vol = entry['volatility'], current['volatility']
+    if old_vol > 0 and new_vol > 0:
+        ratio = max(new_vol / old_vol, old_vol / new_vol)
+        if ratio > DRIFT_VOLATILITY_RATIO:
+            return True
+
+    # A series that more than doubled since the backtest has mostly unseen data
+    return current['n_points'] > 2 * entry['n_points']
+
+
+def select_model(pair_key: str, merged_df: pd.DataFrame, freq: str, metric: Optional[str] = None,
+                 force: bool = False) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Pick the best model for a pair, reusing the stored selection until the data drifts.
+
+    Args:
+        pair_key: Pair key (e.g., 'eur_usd')
+        merged_df: Evenly spaced DataFrame from _prepare_darts_frame
+        freq: Frequency of merged_df
+        metric: Selection metric (default: the pair's stored metric)
+        force: Backtest again even if the stored selection is still valid
+
+    Returns:
+        tuple: (selected model name, leaderboard entry or None if no model could be scored)
+    """
+    metric = metric or get_selection_metric(pair_key)
+    values = merged_df['rate'].dropna().to_numpy(dtype=np.float64)
+
+    entry = get_leaderboard(pair_key)
+    if entry and entry.get('scores') and not force and not has_drifted(entry, values):
+        if entry.get('metric') != metric:
+            set_selection_metric(pair_key, metric)
+            entry = get_leaderboard(pair_key)
+        return entry['selected'], entry
+
+    start = time.perf_counter()
+    scores = run_backtest(merged_df, freq)
+    if not scores:
+        return 'exponential', None
+
+    scores = rank_models(scores, metric)
+    entry = {
+        'selected': scores[0]['model'],
+        'metric': metric,
+        'scores': scores,
+        'evaluated_at': time.time(),
+        'backtest_seconds': round(time.perf_counter() - start, 3),
+        **_data_profile(values),
+    }
+    _update_leaderboard(pair_key, entry)
+    logger.info(f"Selected {entry['selected']} for {pair_key} by {metric} in {entry['backtest_seconds']}s")
+    return entry['selected'], entry
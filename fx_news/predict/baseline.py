@@ -0,0 +1,186 @@
+"""
+Vectorized baseline forecaster.
+A fast directional outlook for every subscription at once: an EWMA drift on log returns
+with a volatility-scaled cone, computed with NumPy over a (pairs x time) matrix.
+Used as the 'fast' model next to Prophet and DARTS, and by the forecast comparison card.
+"""
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Half-life of the EWMA weights, in bars
+DEFAULT_HALFLIFE = 48
+
+# Shrink the fitted drift towards zero; raw intraday drift extrapolates far too aggressively
+DRIFT_DAMPING = 0.5
+
+
+def _ffill_rows(matrix: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs along each row, then back-fill any leading NaNs."""
+    mask = np.isnan(matrix)
+    idx = np.where(~mask, np.arange(matrix.shape[1]), 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    filled = matrix[np.arange(matrix.shape[0])[:, None], idx]
+
+    # Leading NaNs: use the first valid value of the row
+    first_valid = np.argmax(~np.isnan(filled), axis=1)
+    leading = np.isnan(filled)
+    if leading.any():
+        first_values = filled[np.arange(filled.shape[0]), first_valid]
+        filled = np.where(leading, first_values[:, None], filled)
+    return filled
+
+
+def build_rate_matrix(series: Sequence[Sequence[float]], length: Optional[int] = None) -> np.ndarray:
+    """
+    Align several rate series into a (pairs x time) matrix on their most recent points.
+
+    Shorter series are left-padded with their first value; missing values are forward-filled.
+
+    Args:
+        series: One sequence of rates per pair, oldest first
+        length: Number of most recent points to keep (default: longest series)
+
+    Returns:
+        np.ndarray: Float64 matrix of shape (len(series), length)
+    """
+    arrays = [np.asarray(s, dtype=np.float64) for s in series]
+    if length is None:
+        length = max((len(a) for a in arrays), default=0)
+    matrix = np.full((len(arrays), length), np.nan)
+    for i, a in enumerate(arrays):
+        tail = a[-length:]
+        if len(tail):
+            matrix[i, length - len(tail):] = tail
+    return _ffill_rows(matrix)
+
+
+def ewma_drift_forecast(matrix: np.ndarray, horizon: int, interval_width: float = 0.8,
+                        halflife: float = DEFAULT_HALFLIFE, damping: float = DRIFT_DAMPING) -> Dict[str, np.ndarray]:
+    """
+    Forecast every row of a rate matrix with an EWMA drift and a volatility cone.
+
+    Log returns are weighted exponentially towards the most recent bars. The forecast
+    compounds the (damped) weighted mean return, and the band widens with the weighted
+    return volatility times sqrt(steps ahead).
+
+    Args:
+        matrix: (pairs x time) matrix of positive rates
+        horizon: Number of steps to forecast
+        interval_width: Width of the prediction band (e.g., 0.8 for 80%)
+        halflife: EWMA half-life in bars
+        damping: Multiplier applied to the fitted drift
+
+    Returns:
+        dict: 'mean', 'lower' and 'upper' arrays of shape (pairs, horizon),
+        plus per-pair 'drift' and 'volatility' of log returns per step
+    """
+    log_rates = np.log(matrix)
+    returns = np.diff(log_rates, axis=1)
+    n = returns.shape[1]
+
+    if n == 0:
+        last = matrix[:, -1:]
+        flat = np.repeat(last, horizon, axis=1)
+        zeros = np.zeros(matrix.shape[0])
+        return {'mean': flat, 'lower': flat, 'upper': flat, 'drift': zeros, 'volatility': zeros}
+
+    decay = 0.5 ** (1.0 / halflife)
+    weights = decay ** np.arange(n - 1, -1, -1, dtype=np.float64)
+    weights /= weights.sum()
+
+    drift = returns @ weights
+    variance = ((returns - drift[:, None]) ** 2) @ weights
+    volatility = np.sqrt(variance)
+
+    steps = np.arange(1, horizon + 1, dtype=np.float64)
+    z = NormalDist().inv_cdf(0.5 + interval_width / 2)
+
+    center = log_rates[:, -1:] + (damping * drift)[:, None] * steps
+    spread = z * volatility[:, None] * np.sqrt(steps)
+
+    return {
+        'mean': np.exp(center),
+        'lower': np.exp(center - spread),
+        'upper': np.exp(center + spread),
+        'drift': drift,
+        'volatility': volatility,
+    }
+
+
+def steps_per_day(timestamps: pd.Series) -> int:
+    """Estimate how many bars make up a day from the median spacing of the timestamps."""
+    if len(timestamps) < 2:
+        return 1
+    spacing = pd.Series(pd.to_datetime(timestamps)).diff().dt.total_seconds().median()
+    if not spacing or np.isnan(spacing) or spacing <= 0:
+        return 1
+    return max(1, int(round(86400 / spacing)))
+
+
+def backtest_baseline(rates: Sequence[float], holdout: float = 0.2, interval_width: float = 0.8) -> Dict[str, float]:
+    """
+    Score the baseline on the last part of a series.
+
+    Args:
+        rates: Rate series, oldest first
+        holdout: Fraction of the series held out for scoring
+        interval_width: Width of the prediction band
+
+    Returns:
+        dict: MAPE (%), MAE and RMSE on the held-out points
+    """
+    values = np.asarray(rates, dtype=np.float64)
+    test_size = max(1, int(len(values) * holdout))
+    train, test = values[:-test_size], values[-test_size:]
+    if len(train) < 2:
+        return {}
+    forecast = ewma_drift_forecast(build_rate_matrix([train]), test_size, interval_width)['mean'][0]
+    errors = forecast - test
+    return {
+        'mape': float(np.mean(np.abs(errors / test)) * 100),
+        'mae': float(np.mean(np.abs(errors))),
+        'rmse': float(np.sqrt(np.mean(errors ** 2))),
+    }
+
+
+def forecast_frames(pair_keys: List[str], frames: List[pd.DataFrame], forecast_days: int = 7,
+                    interval_width: float = 0.8) -> Dict[str, pd.DataFrame]:
+    """
+    Forecast several pairs in one vectorized pass.
+
+    Args:
+        pair_keys: Pair keys (e.g., 'eur_usd'), one per frame
+        frames: DataFrames with 'timestamp' and 'rate' columns
+        forecast_days: Forecast horizon in days
+        interval_width: Width of the prediction band
+
+    Returns:
+        dict: Pair key to forecast frame with 'ds', 'yhat', 'yhat_lower' and 'yhat_upper'
+        columns, the same shape Prophet returns
+    """
+    valid = [(k, f.sort_values('timestamp')) for k, f in zip(pair_keys, frames)
+             if f is not None and len(f) >= 2]
+    if not valid:
+        return {}
+
+    # All pairs come from the same spark interval, so share the step size
+    bars_per_day = steps_per_day(valid[0][1]['timestamp'])
+    horizon = forecast_days * bars_per_day
+    step = pd.Timedelta(seconds=86400 / bars_per_day)
+
+    matrix = build_rate_matrix([f['rate'].to_numpy(dtype=np.float64) for _, f in valid])
+    result = ewma_drift_forecast(matrix, horizon, interval_width)
+
+    forecasts = {}
+    for i, (pair_key, frame) in enumerate(valid):
+        last_time = pd.to_datetime(frame['timestamp'].iloc[-1])
+        forecasts[pair_key] = pd.DataFrame({
+            'ds': pd.date_range(start=last_time + step, periods=horizon, freq=step),
+            'yhat': result['mean'][i],
+            'yhat_lower': result['lower'][i],
+            'yhat_upper': result['upper'][i],
+        })
+    return forecasts
@@ -0,0 +1,297 @@
+"""
+Forecast benchmark.
+Replays the stored 5D and YTD series through each forecast model path, timing fit, predict
+and cross-validation, and scores every model on a held-out tail of the series.
+
+Usage:
+    python -m fx_news.predict.bench [--series 5d ytd] [--models prophet darts-auto fast]
+                                    [--pairs eur_usd gbp_usd] [--holdout 0.1] [--json results.json]
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import platform
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from fx_news.predict.predictions import (
+    BASE_DIR,
+    load_rate_file,
+    _prepare_darts_frame,
+    _fit_prophet_forecast,
+    _fit_darts_forecast,
+)
+from fx_news.predict.baseline import forecast_frames, backtest_baseline
+from fx_news.predict import backtest, model_store
+
+SERIES = ["5d", "ytd"]
+
+# Model paths of forecast_currency_rates ('prophet', 'fast') and forecast_with_darts ('darts-*')
+MODELS = ["prophet", "darts-auto", "darts-arima", "darts-exponential", "fast"]
+OPTIONAL_MODELS = ["darts-nbeats"]
+
+DEFAULT_HOLDOUT = 0.1
+DEFAULT_CONFIDENCE = 0.8
+
+
+def discover_series(series: List[str], pairs: Optional[List[str]] = None) -> List[Dict[str, str]]:
+    """
+    List the stored rate files to replay.
+
+    Args:
+        series: Series folders under fx_news/scrapers/rates (e.g., '5d', 'ytd')
+        pairs: Pair keys to keep (default: all)
+
+    Returns:
+        list: One dict per file with 'series', 'pair' and 'path'
+    """
+    found = []
+    for name in series:
+        for path in sorted(glob.glob(os.path.join(BASE_DIR, name, "*.json"))):
+            pair_key = os.path.splitext(os.path.basename(path))[0]
+            if pairs and pair_key not in pairs:
+                continue
+            found.append({"series": name, "pair": pair_key, "path": path})
+    return found
+
+
+def split_holdout(df: pd.DataFrame, holdout: float):
+    """Split a series into training data and a held-out tail of at least two points."""
+    df = df.dropna(subset=["rate"]).sort_values("timestamp").reset_index(drop=True)
+    test_size = max(2, int(len(df) * holdout))
+    return df.iloc[:-test_size], df.iloc[-test_size:]
+
+
+def horizon_days(train: pd.DataFrame, test: pd.DataFrame) -> int:
+    """Whole days of forecast needed to cover the held-out tail."""
+    span = (test["timestamp"].max() - train["timestamp"].max()).total_seconds()
+    return max(1, math.ceil(span / 86400))
+
+
+def score_forecast(test: pd.DataFrame, forecast_times, forecast_values) -> Dict[str, float]:
+    """
+    Score a forecast against the held-out points, matching each point to the nearest forecast step.
+
+    Args:
+        test: Held-out DataFrame with 'timestamp' and 'rate' columns
+        forecast_times: Forecast timestamps
+        forecast_values: Forecast values
+
+    Returns:
+        dict: 'mape' (%), 'mae' and 'rmse'
+    """
+    forecast = pd.DataFrame({
+        "timestamp": pd.to_datetime(pd.Series(forecast_times)),
+        "forecast": np.asarray(forecast_values, dtype=np.float64),
+    }).sort_values("timestamp")
+    actual = test[["timestamp", "rate"]].copy()
+    actual["timestamp"] = pd.to_datetime(actual["timestamp"])
+    matched = pd.merge_asof(actual, forecast, on="timestamp", direction="nearest").dropna()
+    if matched.empty:
+        return {}
+    errors = matched["forecast"].to_numpy() - matched["rate"].to_numpy()
+    return {
+        "mape": float(np.mean(np.abs(errors / matched["rate"].to_numpy())) * 100),
+        "mae": float(np.mean(np.abs(errors))),
+        "rmse": float(np.sqrt(np.mean(errors ** 2))),
+    }
+
+
+@contextmanager
+def isolated_model_stores():
+    """
+    Point the backtest leaderboard and the DARTS warm-start store at a scratch folder.
+
+    DARTS fits then take the production path for their pair (backtest selection in 'auto'
+    mode) from a cold start, without reading or overwriting the app's stored state.
+    """
+    saved = backtest.LEADERBOARD_PATH, model_store.MODEL_STATE_DIR
+    with tempfile.TemporaryDirectory(prefix="fx_bench_") as folder:
+        backtest.LEADERBOARD_PATH = os.path.join(folder, "leaderboard.json")
+        model_store.MODEL_STATE_DIR = os.path.join(folder, "models")
+        try:
+            yield folder
+        finally:
+            backtest.LEADERBOARD_PATH, model_store.MODEL_STATE_DIR = saved
+
+
+def run_model(model: str, train: pd.DataFrame, test: pd.DataFrame,
+              confidence_interval: float = DEFAULT_CONFIDENCE, pair_key: Optional[str] = None) -> Dict:
+    """
+    Fit one model path on the training data and score it on the held-out tail.
+
+    DARTS fits run with the pair key against scratch model stores (see isolated_model_stores),
+    so 'darts-auto' includes the backtest selection, cold, on every run.
+
+    Args:
+        model: One of MODELS or OPTIONAL_MODELS
+        train: Training DataFrame
+        test: Held-out DataFrame
+        confidence_interval: Prophet prediction interval width
+        pair_key: Pair key of the series (e.g., 'eur_usd')
+
+    Returns:
+        dict: 'timings' (seconds per stage plus 'total'), 'accuracy' on the holdout,
+        the model's own 'reported' metrics, or an 'error'
+    """
+    days = horizon_days(train, test)
+    start = time.perf_counter()
+
+    if model == "prophet":
+        result = _fit_prophet_forecast(train, days, confidence_interval, cv_parallel=None)
+        if "error" in result:
+            return {"error": result["error"]}
+        forecast = result["forecast"]
+        times, values = forecast["ds"], forecast["yhat"]
+        timings, reported = dict(result["timings"]), result["metrics"]
+
+    elif model.startswith("darts-"):
+        merged_df, freq = _prepare_darts_frame(train)
+        with isolated_model_stores():
+            result = _fit_darts_forecast(merged_df, freq, days, model.split("-", 1)[1], pair_key)
+        if "error" in result:
+            return {"error": result["error"]}
+        forecast = result["forecast"]
+        times, values = forecast["timestamp"], forecast["forecast"]
+        timings, reported = dict(result["timings"]), result["metrics"]
+
+    elif model == "fast":
+        fit_start = time.perf_counter()
+        forecast = forecast_frames(["bench"], [train], days, confidence_interval).get("bench")
+        if forecast is None:
+            return {"error": "Insufficient data"}
+        timings = {"fit": time.perf_counter() - fit_start}
+        cv_start = time.perf_counter()
+        reported = backtest_baseline(train["rate"].to_numpy(), interval_width=confidence_interval)
+        timings["cross_validation"] = time.perf_counter() - cv_start
+        times, values = forecast["ds"], forecast["yhat"]
+
+    else:
+        return {"error": f"Unknown model: {model}"}
+
+    timings["total"] = time.perf_counter() - start
+    return {
+        "timings": {k: round(v, 4) for k, v in timings.items()},
+        "accuracy": score_forecast(test, times, values),
+        "reported": reported,
+    }
+
+
+def _run_model_safely(model: str, train: pd.DataFrame, test: pd.DataFrame, pair_key: str) -> Dict:
+    # One failing model path is recorded as that row's error; the other results still get written
+    try:
+        return run_model(model, train, test, pair_key=pair_key)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def run_benchmark(series: List[str], models: List[str], pairs: Optional[List[str]] = None,
+                  holdout: float = DEFAULT_HOLDOUT, runs: int = 1) -> Dict:
+    """
+    Benchmark every model on every stored series.
+
+    Args:
+        series: Series folders to replay
+        models: Model paths to run
+        pairs: Pair keys to keep (default: all)
+        holdout: Fraction of each series held out for scoring
+        runs: Repeats per model; timings report the median
+
+    Returns:
+        dict: Run metadata, per-series results and a per-model summary
+    """
+    results = []
+    for item in discover_series(series, pairs):
+        df = load_rate_file(item["path"])
+        if df is None or len(df) < 20:
+            continue
+        train, test = split_holdout(df, holdout)
+
+        for model in models:
+            samples = [_run_model_safely(model, train, test, item["pair"]) for _ in range(runs)]
+            ok = [s for s in samples if "error" not in s]
+            row = {**{k: item[k] for k in ("series", "pair")}, "model": model, "points": len(df)}
+            if not ok:
+                row["error"] = samples[-1]["error"]
+            else:
+                stages = ok[-1]["timings"].keys()
+                row["timings"] = {stage: round(statistics.median(s["timings"].get(stage, 0) for s in ok), 4)
+                                  for stage in stages}
+                row["accuracy"] = ok[-1]["accuracy"]
+                row["reported"] = ok[-1]["reported"]
+            results.append(row)
+            print(_format_row(row), flush=True)
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "holdout": holdout,
+            "runs": runs,
+        },
+        "results": results,
+        "summary": summarize(results),
+    }
+
+
+def summarize(results: List[Dict]) -> Dict[str, Dict]:
+    """Median total time and holdout MAPE per model across all series."""
+    summary = {}
+    for model in dict.fromkeys(r["model"] for r in results):
+        rows = [r for r in results if r["model"] == model and "error" not in r]
+        mapes = [r["accuracy"]["mape"] for r in rows if r["accuracy"]]
+        summary[model] = {
+            "series": len(rows),
+            "errors": sum(1 for r in results if r["model"] == model and "error" in r),
+            "median_total_s": round(statistics.median(r["timings"]["total"] for r in rows), 4) if rows else None,
+            "median_mape": round(statistics.median(mapes), 4) if mapes else None,
+        }
+    return summary
+
+
+def _format_row(row: Dict) -> str:
+    name = f"{row['series']}/{row['pair']}"
+    if "error" in row:
+        return f"{name:<24} {row['model']:<18} ERROR: {row['error']}"
+    stages = "  ".join(f"{k} {v:.3f}s" for k, v in row["timings"].items() if k != "total")
+    mape = row["accuracy"].get("mape")
+    mape_text = f"{mape:.3f}%" if mape is not None else "n/a"
+    return f"{name:<24} {row['model']:<18} {row['timings']['total']:>8.3f}s  MAPE {mape_text:>9}  ({stages})"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark forecast latency and accuracy")
+    parser.add_argument("--series", nargs="+", default=SERIES, choices=SERIES, help="Stored series to replay")
+    parser.add_argument("--models", nargs="+", default=MODELS, choices=MODELS + OPTIONAL_MODELS,
+                        help="Model paths to benchmark")
+    parser.add_argument("--pairs", nargs="+", help="Pair keys to include (e.g., eur_usd)")
+    parser.add_argument("--holdout", type=float, default=DEFAULT_HOLDOUT, help="Fraction held out for scoring")
+    parser.add_argument("--runs", type=int, default=1, help="Repeats per model")
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.series, args.models, args.pairs, args.holdout, args.runs)
+
+    print("\nSummary")
+    print("-------")
+    for model, stats in report["summary"].items():
+        total = f"{stats['median_total_s']:.3f}s" if stats["median_total_s"] is not None else "n/a"
+        mape = f"{stats['median_mape']:.3f}%" if stats["median_mape"] is not None else "n/a"
+        print(f"{model:<18} median {total:>9}  median MAPE {mape:>9}  "
+              f"({stats['series']} series, {stats['errors']} errors)")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\nResults written to {args.json_path}")
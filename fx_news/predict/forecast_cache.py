@@ -0,0 +1,221 @@
+"""
+Forecast result cache.
+Fitted forecasts are keyed by the pair, a fingerprint of the input series and the model
+parameters, so Prophet and DARTS models are only refit when the underlying data changes.
+The cache is process-wide, evicts least recently used entries and can persist to disk.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from fx_news.utils.render_profiler import record_cache
+
+logger = logging.getLogger("forecast_cache")
+logger.setLevel(logging.WARNING)
+
+FORECAST_CACHE_DIR = "fx_news/predict/cache"
+MAX_FORECAST_ENTRIES = 200
+
+# Persist forecasts across restarts unless disabled (e.g., on read-only deployments)
+PERSIST_FORECASTS = os.environ.get("FX_FORECAST_CACHE_PERSIST", "1") != "0"
+
+
+def series_fingerprint(df: pd.DataFrame, time_col: str = "timestamp", value_col: str = "rate") -> str:
+    """
+    Hash the timestamps and values of a series.
+
+    Args:
+        df: DataFrame with the input series
+        time_col: Name of the timestamp column
+        value_col: Name of the value column
+
+    Returns:
+        str: Hex digest that changes whenever the series changes
+    """
+    if df is None or df.empty:
+        return "empty"
+    timestamps = pd.to_datetime(df[time_col]).to_numpy(dtype="datetime64[ns]").view(np.int64)
+    values = df[value_col].to_numpy(dtype=np.float64)
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(timestamps).tobytes())
+    digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+def make_forecast_key(pair_key: str, fingerprint: str, model_type: str, horizon: int,
+                      interval_width: Optional[float] = None) -> str:
+    """
+    Build the cache key for a forecast.
+
+    Args:
+        pair_key: Pair key (e.g., 'eur_usd')
+        fingerprint: Result of series_fingerprint
+        model_type: Model identifier (e.g., 'prophet', 'autoarima')
+        horizon: Forecast horizon in days
+        interval_width: Width of the prediction interval, if the model uses one
+
+    Returns:
+        str: Cache key
+    """
+    width = "na" if interval_width is None else f"{interval_width:.3f}"
+    return f"{pair_key}|{model_type}|{horizon}|{width}|{fingerprint}"
+
+
+def _identity(key: str) -> str:
+    """Forecast identity of a cache key: pair, model, horizon and interval width."""
+    return key.rsplit("|", 1)[0]
+
+
+class ForecastCache:
+    """Thread-safe LRU cache of forecast results with optional pickle persistence."""
+
+    def __init__(self, max_entries: int = MAX_FORECAST_ENTRIES, cache_dir: str = FORECAST_CACHE_DIR,
+                 persist: bool = PERSIST_FORECASTS):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.persist = persist
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Latest key per forecast identity (the key without its series fingerprint)
+        self._latest: Dict[str, str] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.pkl")
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the cached result for a key, or None on a miss.
+
+        Args:
+            key: Key returned by make_forecast_key
+
+        Returns:
+            The cached forecast result
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self.persist:
+                entry = self._load(key)
+            if entry is None:
+                self.misses += 1
+                record_cache(False)
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            record_cache(True)
+            return entry["value"]
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store a forecast result.
+
+        Args:
+            key: Key returned by make_forecast_key
+            value: Forecast result (must be picklable when persistence is on)
+        """
+        with self._lock:
+            entry = {"value": value, "stored_at": time.time()}
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._latest[_identity(key)] = key
+            self._evict()
+
+        if self.persist:
+            self._save(key, entry)
+
+    def contains(self, key: str) -> bool:
+        """Return True if a result is cached for the key, without counting a hit or miss."""
+        with self._lock:
+            if key in self._entries:
+                return True
+        return self.persist and os.path.exists(self._path(key))
+
+    def latest(self, key: str) -> Optional[Any]:
+        """
+        Return the most recent result for the pair, model, horizon and interval width of a key,
+        whatever data it was fit on.
+
+        Used to keep showing the previous forecast while a refresh is computed.
+
+        Args:
+            key: Key returned by make_forecast_key for the forecast being refreshed
+
+        Returns:
+            The latest matching forecast result, or None
+        """
+        with self._lock:
+            key = self._latest.get(_identity(key))
+            entry = self._entries.get(key) if key else None
+            return entry["value"] if entry else None
+
+    def clear(self) -> None:
+        """Drop every cached forecast from memory and disk."""
+        with self._lock:
+            for key in list(self._entries):
+                self._remove_file(key)
+            self._entries.clear()
+            self._latest.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry count and hit/miss counters."""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                stored_key, entry = pickle.load(f)
+            if stored_key != key:
+                return None
+            self._entries[key] = entry
+            self._latest.setdefault(_identity(key), key)
+            self._evict()
+            return entry
+        except Exception as e:
+            logger.warning(f"Could not load cached forecast {path}: {str(e)}")
+            return None
+
+    def _evict(self) -> None:
+        """Drop least recently used entries beyond max_entries (call with the lock held)."""
+        while len(self._entries) > self.max_entries:
+            old_key, _ = self._entries.popitem(last=False)
+            self._remove_file(old_key)
+
+    def _save(self, key: str, entry: Dict[str, Any]) -> None:
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(key)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump((key, entry), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not persist forecast: {str(e)}")
+
+    def _remove_file(self, key: str) -> None:
+        if not self.persist:
+            return
+        try:
+            path = self._path(key)
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            pass
+
+
+# Process-wide cache shared by every session
+forecast_cache = ForecastCache()
@@ -0,0 +1,193 @@
+"""
+Forecast executor.
+Runs Prophet and DARTS fits in a process pool sized to the machine so several pairs
+fit in parallel off the Streamlit script thread. Jobs are deduplicated by forecast
+cache key, and finished results are written straight into the forecast cache.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from fx_news.predict.forecast_cache import forecast_cache
+
+logger = logging.getLogger("forecast_executor")
+logger.setLevel(logging.WARNING)
+
+# Failed job keys remembered so they are not resubmitted (oldest are forgotten first)
+MAX_FAILED_JOBS = 100
+
+# Forking would copy the multi-threaded Streamlit server (tornado, script threads, held
+# locks) into the workers, where it can deadlock; start them from a clean process instead
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def pool_context():
+    """Multiprocessing context of the forecast pools; submitted callables must be module-level."""
+    return multiprocessing.get_context(START_METHOD)
+
+
+class ForecastExecutor:
+    """Process pool for forecast fits with per-key deduplication and cancellation."""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[str, Future] = {}
+        self._cancelled: set = set()
+        self._errors: "OrderedDict[str, str]" = OrderedDict()
+        # Reentrant: cancelling a queued future runs its done callback synchronously
+        self._lock = threading.RLock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=pool_context())
+            logger.info(f"Started forecast process pool with {self.max_workers} workers")
+        return self._pool
+
+    def submit(self, key: str, fn: Callable[..., Dict[str, Any]], *args, **kwargs) -> Optional[Future]:
+        """
+        Submit a forecast fit, reusing the in-flight job if one exists for the same key.
+
+        Args:
+            key: Forecast cache key for the job
+            fn: Picklable module-level fit function returning a result dictionary
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Future: The job's future, or None if this key already failed
+        """
+        with self._lock:
+            if key in self._errors:
+                # Don't resubmit fits that are known to fail on this data
+                return None
+
+            future = self._jobs.get(key)
+            if future is not None and not future.done():
+                return future
+
+            self._cancelled.discard(key)
+            try:
+                future = self._get_pool().submit(fn, *args, **kwargs)
+            except RuntimeError:
+                # The pool broke (e.g., a worker was killed); start a fresh one
+                self._pool = None
+                future = self._get_pool().submit(fn, *args, **kwargs)
+            self._jobs[key] = future
+
+        future.add_done_callback(lambda f, k=key: self._on_done(k, f))
+        return future
+
+    def _on_done(self, key: str, future: Future) -> None:
+        with self._lock:
+            if self._jobs.get(key) is future:
+                del self._jobs[key]
+            cancelled = key in self._cancelled
+            self._cancelled.discard(key)
+
+        if cancelled or future.cancelled():
+            logger.info(f"Discarded cancelled forecast job {key}")
+            return
+
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.error(f"Forecast job {key} failed: {str(e)}")
+            result = {'error': f"Forecast failed: {str(e)}"}
+
+        if isinstance(result, dict) and 'error' in result:
+            with self._lock:
+                self._errors[key] = result['error']
+                while len(self._errors) > MAX_FAILED_JOBS:
+                    self._errors.popitem(last=False)
+        else:
+            forecast_cache.put(key, result)
+            # A successful fit supersedes earlier failures of the same forecast on older data
+            identity = key.rsplit("|", 1)[0]
+            with self._lock:
+                for failed_key in [k for k in self._errors if k.rsplit("|", 1)[0] == identity]:
+                    del self._errors[failed_key]
+
+    def get_error(self, key: str) -> Optional[str]:
+        """Return the error message of a failed job, if any."""
+        with self._lock:
+            return self._errors.get(key)
+
+    def clear_errors(self, pair_key: Optional[str] = None, model_prefix: Optional[str] = None) -> None:
+        """Forget failed jobs, optionally for one pair and model, so they can be submitted again."""
+        with self._lock:
+            for key in list(self._errors):
+                parts = key.split("|")
+                if pair_key is not None and parts[0] != pair_key:
+                    continue
+                if model_prefix is not None and not parts[1].startswith(model_prefix):
+                    continue
+                del self._errors[key]
+
+    def is_pending(self, key: str) -> bool:
+        """Return True if a job for this key is queued or running."""
+        with self._lock:
+            future = self._jobs.get(key)
+            return future is not None and not future.done()
+
+    def pending_keys(self, pair_key: Optional[str] = None, model_prefix: Optional[str] = None) -> List[str]:
+        """
+        List in-flight job keys, optionally filtered by pair and model type prefix.
+
+        Args:
+            pair_key: Pair key (e.g., 'eur_usd')
+            model_prefix: Start of the model type (e.g., 'prophet', 'darts')
+
+        Returns:
+            list: Keys of queued or running jobs
+        """
+        with self._lock:
+            keys = [k for k, f in self._jobs.items() if not f.done() and k not in self._cancelled]
+        if pair_key is not None:
+            keys = [k for k in keys if k.split("|")[0] == pair_key]
+        if model_prefix is not None:
+            keys = [k for k in keys if k.split("|")[1].startswith(model_prefix)]
+        return keys
+
+    def cancel(self, key: str) -> bool:
+        """
+        Cancel a job.
+
+        Queued jobs are removed from the pool. A job that is already running in a
+        worker cannot be interrupted, so its result is discarded when it finishes.
+
+        Args:
+            key: Forecast cache key of the job
+
+        Returns:
+            bool: True if a job was found
+        """
+        with self._lock:
+            future = self._jobs.get(key)
+            if future is None or future.done():
+                return False
+            if not future.cancel():
+                self._cancelled.add(key)
+            return True
+
+    def cancel_pair(self, pair_key: str, model_prefix: Optional[str] = None) -> int:
+        """Cancel every in-flight job for a pair. Returns the number of jobs cancelled."""
+        return sum(self.cancel(key) for key in self.pending_keys(pair_key, model_prefix))
+
+    def shutdown(self) -> None:
+        """Cancel queued jobs and stop the worker processes."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            self._jobs.clear()
+            self._cancelled.clear()
+            self._errors.clear()
+
+
+# Process-wide executor shared by every session
+forecast_executor = ForecastExecutor()
@@ -0,0 +1,131 @@
+"""
+Forecast pre-computation scheduler.
+After a new batch of 5-day bars lands (or every few minutes), submits Prophet and DARTS
+fits for every subscribed pair to the forecast executor. The forecast tabs then only read
+finished results from the forecast cache instead of making the first viewer wait for a fit.
+"""
+import logging
+import os
+import time
+from typing import Dict, List
+
+import streamlit as st
+
+from fx_news.predict.forecast_cache import forecast_cache
+from fx_news.predict.forecast_executor import forecast_executor
+from fx_news.predict.predictions import (
+    FIVE_D_DIR,
+    get_historical_data_for_forecasting,
+    _get_darts_input,
+    _prepare_darts_frame,
+    _prophet_forecast_key,
+    _darts_forecast_key,
+    _fit_prophet_forecast,
+    _fit_darts_forecast,
+)
+
+logger = logging.getLogger("forecast_scheduler")
+logger.setLevel(logging.WARNING)
+
+# Parameters the forecast tabs open with; these are the forecasts worth precomputing
+DEFAULT_FORECAST_DAYS = 7
+DEFAULT_CONFIDENCE = 0.8
+DEFAULT_DARTS_MODEL = 'auto'
+
+# Precompute at least this often even if no new bars were written
+PRECOMPUTE_INTERVAL_MINUTES = 15
+
+_last_run = 0.0
+_bar_mtimes: Dict[str, float] = {}
+
+
+def _new_bars_landed(subscriptions: List[Dict]) -> bool:
+    """Return True if any subscribed pair's 5-day file was rewritten since the last check."""
+    changed = False
+    for sub in subscriptions:
+        path = f"{FIVE_D_DIR}/{sub['base'].lower()}_{sub['quote'].lower()}.json"
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            continue
+        if _bar_mtimes.get(path) != mtime:
+            _bar_mtimes[path] = mtime
+            changed = True
+    return changed
+
+
+def precompute_forecasts(subscriptions: List[Dict], forecast_days: int = DEFAULT_FORECAST_DAYS,
+                         confidence_interval: float = DEFAULT_CONFIDENCE,
+                         darts_model: str = DEFAULT_DARTS_MODEL) -> int:
+    """
+    Submit Prophet and DARTS fits for every subscription whose forecast isn't cached yet.
+
+    Args:
+        subscriptions: List of subscription dictionaries
+        forecast_days: Forecast horizon in days
+        confidence_interval: Prophet prediction interval width
+        darts_model: DARTS model type
+
+    Returns:
+        int: Number of jobs submitted
+    """
+    add_holidays = st.session_state.get('market_type') == 'Currency'
+    submitted = 0
+
+    for sub in subscriptions:
+        pair_key = f"{sub['base'].lower()}_{sub['quote'].lower()}"
+
+        # Prophet reads the stored 5D data directly
+        historical_df = get_historical_data_for_forecasting(sub['base'], sub['quote'])
+        if historical_df is not None and not historical_df.empty:
+            key, _ = _prophet_forecast_key(pair_key, historical_df, forecast_days, confidence_interval, add_holidays)
+            if not forecast_cache.contains(key) and not forecast_executor.get_error(key):
+                if forecast_executor.submit(key, _fit_prophet_forecast, historical_df, forecast_days,
+                                            confidence_interval, add_holidays, "threads", pair_key):
+                    submitted += 1
+
+        # DARTS uses the stored data plus live rates, resampled to an even grid
+        darts_df = _get_darts_input(sub)
+        if darts_df is not None and len(darts_df) >= 10:
+            merged_df, freq = _prepare_darts_frame(darts_df)
+            key, _ = _darts_forecast_key(pair_key, merged_df, forecast_days, darts_model)
+            if not forecast_cache.contains(key) and not forecast_executor.get_error(key):
+                if forecast_executor.submit(key, _fit_darts_forecast, merged_df, freq, forecast_days,
+                                            darts_model, pair_key):
+                    submitted += 1
+
+    if submitted:
+        logger.info(f"Submitted {submitted} forecast pre-computation jobs")
+    return submitted
+
+
+def maybe_precompute_forecasts(subscriptions: List[Dict],
+                               interval_minutes: float = PRECOMPUTE_INTERVAL_MINUTES) -> int:
+    """
+    Precompute forecasts when new bars have landed or the interval has elapsed.
+
+    Called after every rates update; cheap when there is nothing to do.
+
+    Args:
+        subscriptions: List of subscription dictionaries
+        interval_minutes: Maximum time between pre-computation passes
+
+    Returns:
+        int: Number of jobs submitted
+    """
+    global _last_run
+
+    if not st.session_state.get('precompute_forecasts', True):
+        return 0
+
+    new_bars = _new_bars_landed(subscriptions)
+    due = time.time() - _last_run >= interval_minutes * 60
+    if not (new_bars or due):
+        return 0
+
+    _last_run = time.time()
+    try:
+        return precompute_forecasts(subscriptions)
+    except Exception as e:
+        logger.error(f"Error precomputing forecasts: {str(e)}")
+        return 0
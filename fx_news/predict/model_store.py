@@ -0,0 +1,181 @@
+"""
+Model-state store for warm-start refits.
+Keeps what a refit can reuse from the last fit of each pair: Prophet's fitted parameters
+(passed back as `init`), the order AutoARIMA settled on, and NBEATS checkpoints. Refits warm-start
+from this state and only fit from scratch on schedule or when the data has changed a lot.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from fx_news.predict.forecast_cache import FORECAST_CACHE_DIR, PERSIST_FORECASTS
+
+logger = logging.getLogger("model_store")
+logger.setLevel(logging.WARNING)
+
+MODEL_STATE_DIR = os.path.join(FORECAST_CACHE_DIR, "models")
+
+# Fit from scratch at least this often
+FULL_REFIT_HOURS = 6
+
+# ... or when more than this share of the series is new since the last full fit
+MAX_NEW_FRACTION = 0.1
+
+# ... or when the rate moved more than this since the last full fit
+LEVEL_SHIFT_PCT = 0.5
+
+# Extra epochs when fine-tuning an NBEATS checkpoint on new data
+NBEATS_WARM_EPOCHS = 5
+
+# Fallback when persistence is disabled; only shared within one process
+_memory_states: Dict[str, Dict[str, Any]] = {}
+_store_lock = threading.Lock()
+
+
+def _state_path(pair_key: str, model_name: str) -> str:
+    name = hashlib.sha1(f"{pair_key}|{model_name}".encode("utf-8")).hexdigest()
+    return os.path.join(MODEL_STATE_DIR, f"{name}.pkl")
+
+
+def model_checkpoint_path(pair_key: str, model_name: str) -> str:
+    """Path for a model checkpoint (e.g., a saved NBEATS model) of a pair."""
+    return _state_path(pair_key, model_name).replace(".pkl", ".ckpt")
+
+
+def get_model_state(pair_key: str, model_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the stored state of the last fit of a model for a pair.
+
+    State is read from disk on every call so fits in worker processes see each other's updates.
+
+    Args:
+        pair_key: Pair key (e.g., 'eur_usd')
+        model_name: Model identifier (e.g., 'prophet', 'darts-autoarima')
+
+    Returns:
+        dict: Stored state, or None
+    """
+    if not PERSIST_FORECASTS:
+        with _store_lock:
+            return _memory_states.get(f"{pair_key}|{model_name}")
+
+    path = _state_path(pair_key, model_name)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        logger.warning(f"Could not load model state {path}: {str(e)}")
+        return None
+
+
+def save_model_state(pair_key: str, model_name: str, state: Dict[str, Any]) -> None:
+    """
+    Store the state of a fit.
+
+    Args:
+        pair_key: Pair key (e.g., 'eur_usd')
+        model_name: Model identifier
+        state: Picklable state, including the fit_profile fields used by needs_full_refit
+    """
+    if not PERSIST_FORECASTS:
+        with _store_lock:
+            _memory_states[f"{pair_key}|{model_name}"] = state
+        return
+
+    try:
+        os.makedirs(MODEL_STATE_DIR, exist_ok=True)
+        path = _state_path(pair_key, model_name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"Could not persist model state: {str(e)}")
+
+
+def clear_model_states() -> None:
+    """Drop every stored model state so the next fits start cold."""
+    with _store_lock:
+        _memory_states.clear()
+    if os.path.isdir(MODEL_STATE_DIR):
+        for name in os.listdir(MODEL_STATE_DIR):
+            try:
+                os.remove(os.path.join(MODEL_STATE_DIR, name))
+            except OSError:
+                pass
+
+
+def fit_profile(df: pd.DataFrame, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Describe the series of the last full fit.
+
+    Drift is always measured against the last full fit, so a warm start carries the
+    previous profile forward instead of describing its own series.
+
+    Args:
+        df: DataFrame with 'timestamp' and 'rate' columns the model was fit on
+        previous: State of the fit this one warm-started from, if any
+
+    Returns:
+        dict: 'n_points', 'last_timestamp', 'last_rate' and 'full_fit_at'
+    """
+    if previous is not None:
+        return {k: previous[k] for k in ('n_points', 'last_timestamp', 'last_rate', 'full_fit_at')}
+    return {
+        'n_points': int(len(df)),
+        'last_timestamp': pd.Timestamp(df['timestamp'].max()),
+        'last_rate': float(df['rate'].iloc[-1]),
+        'full_fit_at': time.time(),
+    }
+
+
+def needs_full_refit(state: Optional[Dict[str, Any]], df: pd.DataFrame) -> bool:
+    """
+    Decide whether a refit can warm-start from the stored state.
+
+    Args:
+        state: Stored state, or None
+        df: DataFrame with 'timestamp' and 'rate' columns the model is about to be fit on
+
+    Returns:
+        bool: True if the model should be fit from scratch
+    """
+    if not state:
+        return True
+
+    if time.time() - state['full_fit_at'] > FULL_REFIT_HOURS * 3600:
+        return True
+
+    new_points = int((pd.to_datetime(df['timestamp']) > state['last_timestamp']).sum())
+    if new_points > MAX_NEW_FRACTION * max(1, state['n_points']):
+        return True
+
+    level_shift = abs(float(df['rate'].iloc[-1]) / state['last_rate'] - 1) * 100
+    return level_shift > LEVEL_SHIFT_PCT
+
+
+def prophet_init_params(model) -> Dict[str, Any]:
+    """
+    Extract a fitted Prophet model's parameters in the form `Prophet.fit(init=...)` expects.
+
+    Args:
+        model: Fitted Prophet model
+
+    Returns:
+        dict: Initial values for k, m, sigma_obs, delta and beta
+    """
+    params = {}
+    for name in ['k', 'm', 'sigma_obs']:
+        params[name] = float(model.params[name][0][0])
+    for name in ['delta', 'beta']:
+        params[name] = np.asarray(model.params[name][0], dtype=np.float64)
+    return params
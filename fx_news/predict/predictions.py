@@ -2,12 +2,23 @@ import plotly.graph_objects as go
 import pandas as pd
 from datetime import datetime, timedelta
 import streamlit as st
-from prophet import Prophet
-from prophet.diagnostics import cross_validation, performance_metrics
 import logging 
 import os
 import json
 
+from fx_news.predict.forecast_cache import forecast_cache, make_forecast_key, series_fingerprint
+from fx_news.predict.forecast_executor import forecast_executor
+from fx_news.predict.baseline import forecast_frames, backtest_baseline
+from fx_news.utils.render_profiler import profile_component, subscription_label
+from fx_news.predict.model_store import (
+    get_model_state, save_model_state, needs_full_refit, fit_profile,
+    prophet_init_params, model_checkpoint_path, NBEATS_WARM_EPOCHS
+)
+from fx_news.predict.backtest import (
+    make_darts_model, forecast_candidate, select_model, get_leaderboard,
+    get_selection_metric, set_selection_metric, METRICS
+)
+
 # Set up logging
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', 
@@ -44,6 +55,22 @@ def get_historical_data_for_forecasting(base, quote):
         logger.warning(f"Source rate data file not found for {base}/{quote}")
         return None
     
+    df = load_rate_file(filename)
+    if df is not None:
+        logger.info(f"Successfully loaded historical data for forecasting {base}/{quote} with {len(df)} points")
+    return df
+
+
+def load_rate_file(filename):
+    """
+    Load a stored spark response (5D or YTD) into a rate DataFrame
+    
+    Args:
+        filename: Path to the spark JSON file
+        
+    Returns:
+        DataFrame with 'timestamp', 'rate', 'ds' and 'y' columns, or None if the file has no usable data
+    """
     try:
         with open(filename, 'r') as f:
             data = json.load(f)
@@ -68,8 +95,6 @@ def get_historical_data_for_forecasting(base, quote):
                     # Set timestamp as index if required by your forecasting functions
                     df['ds'] = df['timestamp']
                     df['y'] = df['rate']
-                    
-                    logger.info(f"Successfully loaded historical data for forecasting {base}/{quote} with {len(df)} points")
                     return df
     except Exception as e:
         logger.error(f"Error loading source rate data for forecasting: {str(e)}")
@@ -80,66 +105,16 @@ def get_historical_data_for_forecasting(base, quote):
     return None
 
 
-def forecast_with_darts(sub, forecast_days=7, model_type='auto'):
+def _prepare_darts_frame(historical_df):
     """
-    Forecast currency exchange rates using DARTS models
+    Resample a rate history onto an evenly spaced grid for DARTS
     
     Args:
-        sub: Subscription dictionary containing currency pair information
-        forecast_days: Number of days to forecast (default: 7)
-        model_type: Type of model to use ('auto', 'arima', 'exponential', 'nbeats', etc.)
+        historical_df: DataFrame with 'timestamp' and 'rate' columns
     
     Returns:
-        Plotly figure with historical data and forecast
+        Tuple of (resampled DataFrame, pandas frequency string)
     """
-    import plotly.graph_objects as go
-    import pandas as pd
-    import numpy as np
-    from datetime import datetime, timedelta
-    import streamlit as st
-    import warnings
-    warnings.filterwarnings("ignore")  # Suppress warnings
-    
-    try:
-        from darts import TimeSeries
-        from darts.models import ExponentialSmoothing, ARIMA, AutoARIMA, NBEATSModel
-        from darts.metrics import mape, rmse
-    except ImportError:
-        st.warning("DARTS library is not installed. Please install it with: pip install darts")
-        return None
-    
-    # First get the historical data
-    pair_key = f"{sub['base'].lower()}_{sub['quote'].lower()}"
-    
-    # Initialize placeholder for the data
-    historical_df = None
-    
-    # Check if we have cached historical data for this pair
-    if 'historical_rate_cache' in st.session_state and pair_key in st.session_state.historical_rate_cache:
-        # Get cached historical data
-        historical_df = st.session_state.historical_rate_cache[pair_key]['data'].copy()
-        
-        # Add real-time data if available
-        if pair_key in st.session_state.rate_history and len(st.session_state.rate_history[pair_key]) > 1:
-            realtime_df = pd.DataFrame(st.session_state.rate_history[pair_key])
-            
-            # Find the last timestamp in historical data
-            last_historical_time = historical_df['timestamp'].max()
-            
-            # Filter real-time data to only include points after the historical data
-            new_realtime_df = realtime_df[realtime_df['timestamp'] > last_historical_time]
-            
-            # If we have new real-time data points, append them
-            if not new_realtime_df.empty:
-                historical_df = pd.concat([historical_df, new_realtime_df], ignore_index=True)
-    else:
-        st.warning("No historical data available for forecasting. Please wait for data to load.")
-        return None
-    
-    if historical_df is None or historical_df.empty or len(historical_df) < 10:
-        st.warning("Insufficient data for DARTS forecasting (need at least 10 data points).")
-        return None
-    
     # DARTS requires a clean time series with evenly spaced timestamps
     # We'll resample the data to ensure even spacing
     historical_df = historical_df.sort_values('timestamp')
@@ -168,259 +143,561 @@ def forecast_with_darts(sub, forecast_days=7, model_type='auto'):
     resampled_df = pd.DataFrame({'timestamp': date_range})
     
     # Merge with original data and forward-fill missing values
-    merged_df = pd.merge_asof(resampled_df, historical_df, on='timestamp')
+    merged_df = pd.merge_asof(resampled_df, historical_df[['timestamp', 'rate']], on='timestamp')
     merged_df = merged_df.ffill()  # Forward-fill missing values
     
-    # Show a spinner while we process the forecast
-    with st.spinner("Generating DARTS forecast..."):
-        # Convert to DARTS TimeSeries
+    return merged_df, freq
+
+
+def _darts_horizon(freq, forecast_days):
+    """Convert a forecast period in days to a number of steps at the given frequency"""
+    if freq == '5min':
+        return forecast_days * 24 * 12  # 12 5-minute intervals per hour
+    elif freq == '1H':
+        return forecast_days * 24  # 24 hours per day
+    elif freq == '6H':
+        return forecast_days * 4  # 4 6-hour intervals per day
+    return forecast_days  # '1D'
+
+
+def _fit_darts_forecast(merged_df, freq, forecast_days=7, model_type='auto', pair_key=None):
+    """
+    Fit a DARTS model and forecast. Has no Streamlit dependency so it can run in a worker process.
+    
+    In 'auto' mode with a pair key, the model is picked by a rolling-origin backtest
+    (see fx_news.predict.backtest) and the selection is reused until the data drifts.
+    
+    Args:
+        merged_df: Evenly spaced DataFrame from _prepare_darts_frame
+        freq: Frequency of merged_df
+        forecast_days: Number of days to forecast
+        model_type: Type of model to use ('auto', 'arima', 'exponential', 'nbeats')
+        pair_key: Pair key (e.g., 'eur_usd') for the backtest leaderboard in 'auto' mode
+    
+    Returns:
+        Dictionary with the series, forecast, bounds, metrics, timings and any warnings,
+        or a dictionary with an 'error' key if the forecast failed
+    """
+    import time
+    import numpy as np
+    import warnings as py_warnings
+    py_warnings.filterwarnings("ignore")  # Suppress warnings
+    
+    try:
+        from darts import TimeSeries
+        from darts.models import ExponentialSmoothing, ARIMA, NBEATSModel
+        from darts.metrics import mape, rmse
+    except ImportError:
+        return {'error': "DARTS library is not installed. Please install it with: pip install darts"}
+    
+    warnings = []
+    timings = {}
+    
+    # Convert to DARTS TimeSeries
+    try:
+        series = TimeSeries.from_dataframe(
+            merged_df,
+            time_col='timestamp',
+            value_cols='rate',
+            fill_missing_dates=True,
+            freq=freq
+        )
+    except Exception as e:
+        return {'error': f"Error creating TimeSeries: {e}"}
+    
+    # Split data for training and testing
+    train_size = max(int(len(series) * 0.8), len(series) - 30)  # Use 80% for training or all but 30 points
+    train, test = series[:train_size], series[train_size:]
+    
+    # Make sure we have enough test data for validation
+    if len(test) < 2:
+        test = series[-5:]  # Use last 5 points if not enough test data
+    
+    # In auto mode, pick the model that backtests best for this pair
+    selected = None
+    selection = None
+    if model_type == 'auto' and pair_key:
         try:
-            series = TimeSeries.from_dataframe(
-                merged_df,
-                time_col='timestamp',
-                value_cols='rate',
-                fill_missing_dates=True,
-                freq=freq
-            )
+            selected, selection = select_model(pair_key, merged_df, freq)
         except Exception as e:
-            st.error(f"Error creating TimeSeries: {e}")
-            return None
-        
-        # Split data for training and testing
-        train_size = max(int(len(series) * 0.8), len(series) - 30)  # Use 80% for training or all but 30 points
-        train, test = series[:train_size], series[train_size:]
-        
-        # Make sure we have enough test data for validation
-        if len(test) < 2:
-            test = series[-5:]  # Use last 5 points if not enough test data
-        
-        # Initialize selected model based on model_type
-        selected_model = None
-        
-        if model_type == 'auto' or model_type == 'autoarima':
-            try:
-                selected_model = AutoARIMA(
-                    start_p=1, start_q=1, max_p=3, max_q=3, 
-                    seasonal=True, m=7,  # Weekly seasonality
-                    d=1, D=0  # Differencing parameters
-                )
-            except Exception as e:
-                st.warning(f"Error initializing AutoARIMA: {e}. Falling back to ExponentialSmoothing.")
-                model_type = 'exponential'  # Fall back to simpler model
-                
-        if model_type == 'arima':
-            try:
-                selected_model = ARIMA(p=2, d=1, q=1)
-            except Exception as e:
-                st.warning(f"Error initializing ARIMA: {e}. Falling back to ExponentialSmoothing.")
-                model_type = 'exponential'  # Fall back to simpler model
-                
-        if model_type == 'exponential' or selected_model is None:
-            try:
-                selected_model = ExponentialSmoothing(
-                    seasonal_periods=7,  # Weekly seasonality
-                    trend='add',
-                    seasonal='add',
-                    damped=True
+            warnings.append(f"Model selection failed: {e}. Using AutoARIMA.")
+    
+    # Calculate forecast horizon (number of steps to forecast)
+    horizon = _darts_horizon(freq, forecast_days)
+    
+    if selected in ('prophet', 'baseline'):
+        # Non-DARTS winners forecast from the full series and are scored by the backtest
+        start = time.perf_counter()
+        try:
+            values = forecast_candidate(selected, merged_df, freq, horizon)
+            forecast_index = pd.date_range(start=series.end_time() + series.freq, periods=horizon, freq=freq)
+            forecast = TimeSeries.from_times_and_values(forecast_index, values)
+        except Exception as e:
+            return {'error': f"Error generating {selected} forecast: {e}"}
+        timings['fit'] = time.perf_counter() - start
+        return _darts_fit_result(series, forecast, model_type, selected, selection, None, None, timings, warnings)
+    
+    # Initialize selected model based on model_type
+    selected_model = None
+    darts_model = selected or model_type
+    
+    if darts_model == 'auto' or darts_model == 'autoarima':
+        try:
+            selected_model = make_darts_model('autoarima')
+        except Exception as e:
+            warnings.append(f"Error initializing AutoARIMA: {e}. Falling back to ExponentialSmoothing.")
+            darts_model = 'exponential'  # Fall back to simpler model
+            
+    if darts_model == 'arima':
+        try:
+            selected_model = make_darts_model('arima')
+        except Exception as e:
+            warnings.append(f"Error initializing ARIMA: {e}. Falling back to ExponentialSmoothing.")
+            darts_model = 'exponential'  # Fall back to simpler model
+            
+    if darts_model == 'exponential' or selected_model is None:
+        try:
+            selected_model = make_darts_model('exponential')
+        except Exception as e:
+            return {'error': f"Error initializing ExponentialSmoothing: {e}"}
+    
+    if model_type == 'nbeats':
+        try:
+            # Only use this for larger datasets
+            if len(series) > 100:
+                selected_model = NBEATSModel(
+                    input_chunk_length=24,
+                    output_chunk_length=forecast_days,
+                    n_epochs=50,
+                    random_state=42
                 )
-            except Exception as e:
-                st.error(f"Error initializing ExponentialSmoothing: {e}")
-                return None
-        
-        if model_type == 'nbeats':
-            try:
-                # Only use this for larger datasets
-                if len(series) > 100:
-                    selected_model = NBEATSModel(
-                        input_chunk_length=24,
-                        output_chunk_length=forecast_days,
-                        n_epochs=50,
-                        random_state=42
-                    )
-                else:
-                    st.warning("Not enough data for NBEATS model. Using ExponentialSmoothing instead.")
-                    selected_model = ExponentialSmoothing(seasonal_periods=7)
-            except Exception as e:
-                st.warning(f"Error initializing NBEATS: {e}. Falling back to ExponentialSmoothing.")
+            else:
+                warnings.append("Not enough data for NBEATS model. Using ExponentialSmoothing instead.")
                 selected_model = ExponentialSmoothing(seasonal_periods=7)
-        
-        # Train the model
+        except Exception as e:
+            warnings.append(f"Error initializing NBEATS: {e}. Falling back to ExponentialSmoothing.")
+            selected_model = ExponentialSmoothing(seasonal_periods=7)
+    
+    if selected is None:
+        model_type = darts_model  # Report the fallback model, if any
+    
+    # Warm-start from the previous fit of this pair: reuse the order AutoARIMA settled on,
+    # or fine-tune the saved NBEATS weights for a few epochs
+    state_name = f"darts-{'autoarima' if darts_model == 'auto' else darts_model}"
+    state = get_model_state(pair_key, state_name) if pair_key else None
+    warm_start = state is not None and not needs_full_refit(state, merged_df)
+    fit_kwargs = {}
+    if warm_start:
         try:
-            selected_model.fit(train)
+            if state.get('order'):
+                selected_model = ARIMA(*state['order'], seasonal_order=state['seasonal_order'])
+            elif state.get('checkpoint') and os.path.exists(state['checkpoint']):
+                selected_model = NBEATSModel.load(state['checkpoint'])
+                fit_kwargs['epochs'] = NBEATS_WARM_EPOCHS
+            else:
+                warm_start = False
         except Exception as e:
-            st.error(f"Error training model: {e}")
-            return None
-        
-        # Calculate forecast horizon (number of steps to forecast)
-        # Convert forecast_days to the appropriate number of time steps based on frequency
-        if freq == '5min':
-            horizon = forecast_days * 24 * 12  # 12 5-minute intervals per hour
-        elif freq == '1H':
-            horizon = forecast_days * 24  # 24 hours per day
-        elif freq == '6H':
-            horizon = forecast_days * 4  # 4 6-hour intervals per day
-        else:  # '1D'
-            horizon = forecast_days
-        
-        # Generate forecast
+            warnings.append(f"Could not warm-start from the previous fit: {e}")
+            warm_start = False
+    
+    # Train the model; a backtested winner is already validated, so it learns from the full series
+    start = time.perf_counter()
+    try:
+        selected_model.fit(series if selection is not None else train, **fit_kwargs)
+    except Exception as e:
+        return {'error': f"Error training model: {e}"}
+    timings['fit'] = time.perf_counter() - start
+    
+    if pair_key:
+        _store_darts_state(pair_key, state_name, selected_model, merged_df, state if warm_start else None)
+    
+    # Generate forecast
+    start = time.perf_counter()
+    try:
+        forecast = selected_model.predict(horizon)
+    except Exception as e:
+        return {'error': f"Error generating forecast: {e}"}
+    timings['predict'] = time.perf_counter() - start
+    
+    # Calculate error metrics on test data
+    mape_value = None
+    rmse_value = None
+    error_pct = None
+    if len(test) > 0 and selection is None:
         try:
-            forecast = selected_model.predict(horizon)
+            # Make a historical forecast for the test period for evaluation
+            historical_forecast = selected_model.predict(len(test))
+            
+            # Calculate error metrics
+            mape_value = mape(test, historical_forecast)
+            rmse_value = rmse(test, historical_forecast)
+            
+            # Calculate mean error percentage for display
+            error_pct = mape_value * 100  # Convert to percentage
         except Exception as e:
-            st.error(f"Error generating forecast: {e}")
-            return None
-        
-        # Calculate error metrics on test data
-        if len(test) > 0:
-            try:
-                # Make a historical forecast for the test period for evaluation
-                historical_forecast = selected_model.predict(len(test))
-                
-                # Calculate error metrics
-                mape_value = mape(test, historical_forecast)
-                rmse_value = rmse(test, historical_forecast)
-                
-                # Calculate mean error percentage for display
-                error_pct = mape_value * 100  # Convert to percentage
-            except Exception as e:
-                st.warning(f"Error calculating metrics: {e}")
-                mape_value = None
-                rmse_value = None
-                error_pct = None
+            warnings.append(f"Error calculating metrics: {e}")
+    
+    result = _darts_fit_result(series, forecast, model_type, selected, selection,
+                               mape_value, rmse_value, timings, warnings, error_pct)
+    result['warm_start'] = warm_start
+    return result
+
+
+def _store_darts_state(pair_key, state_name, fitted_model, merged_df, previous=None):
+    """
+    Keep what the next refit of a DARTS model can reuse
+    
+    Args:
+        pair_key: Pair key (e.g., 'eur_usd')
+        state_name: Model-state name ('darts-autoarima' or 'darts-nbeats')
+        fitted_model: Fitted DARTS model
+        merged_df: Series the model was fit on
+        previous: State this fit warm-started from, if any
+    """
+    state = fit_profile(merged_df, previous)
+    try:
+        if state_name == 'darts-autoarima':
+            if previous is not None:
+                return  # The reused order is already stored
+            # A cold AutoARIMA fit wraps a pmdarima model; keep the order it found
+            arima = getattr(getattr(fitted_model, 'model', None), 'model_', None)
+            if arima is None:
+                return
+            state['order'] = tuple(arima.order)
+            state['seasonal_order'] = tuple(arima.seasonal_order)
+        elif state_name == 'darts-nbeats' and type(fitted_model).__name__ == 'NBEATSModel':
+            state['checkpoint'] = model_checkpoint_path(pair_key, state_name)
+            os.makedirs(os.path.dirname(state['checkpoint']), exist_ok=True)
+            fitted_model.save(state['checkpoint'])
         else:
-            mape_value = None
-            rmse_value = None
-            error_pct = None
-        
-        # Prepare data for plotting
-        # Convert series and forecast to pandas DataFrames for easier plotting
-        series_df = series.pd_dataframe().reset_index()
-        series_df.columns = ['timestamp', 'actual']
-        
-        forecast_df = forecast.pd_dataframe().reset_index()
-        forecast_df.columns = ['timestamp', 'forecast']
-        
-        # Create dark-themed figure for visualization
-        fig = go.Figure()
+            return
+        save_model_state(pair_key, state_name, state)
+    except Exception as e:
+        logger.info(f"Could not store DARTS state for {pair_key}: {str(e)}")
+
+
+def _darts_fit_result(series, forecast, model_type, selected, selection, mape_value, rmse_value,
+                      timings, warnings, error_pct=None):
+    """
+    Package a DARTS forecast with its volatility band and metrics
+    
+    When the model was picked by backtest, the metrics are the winner's rolling-origin scores.
+    """
+    # Convert series and forecast to pandas DataFrames for easier plotting
+    series_df = series.pd_dataframe().reset_index()
+    series_df.columns = ['timestamp', 'actual']
+    
+    forecast_df = forecast.pd_dataframe().reset_index()
+    forecast_df.columns = ['timestamp', 'forecast']
+    
+    # Calculate confidence intervals (simulated, as DARTS doesn't always provide them)
+    # Use historical volatility to estimate
+    upper_bound = None
+    lower_bound = None
+    if len(series_df) > 10:
+        volatility = series_df['actual'].pct_change().std() * 100  # Percentage volatility
         
-        # Add historical data trace
-        fig.add_trace(go.Scatter(
-            x=series_df['timestamp'],
-            y=series_df['actual'],
-            mode='lines',
-            name='Historical',
-            line=dict(color='#4D9BF5', width=2),
-            hovertemplate='%{x}<br>Rate: %{y:.4f}<extra></extra>'
-        ))
+        # Scale confidence interval based on volatility
+        ci_factor = max(1.5, min(5, volatility * 2))  # Scale based on volatility, between 1.5% and 5%
         
-        # Add forecast line
+        # Create upper and lower bounds
+        upper_bound = forecast_df['forecast'] * (1 + ci_factor/100)
+        lower_bound = forecast_df['forecast'] * (1 - ci_factor/100)
+    
+    model_label = model_type
+    if selection is not None:
+        best = selection['scores'][0]
+        mape_value, rmse_value, error_pct = best['mape'], best['rmse'], best['mape']
+        model_label = f"{model_type} ({selected})"
+    
+    return {
+        'series': series_df,
+        'forecast': forecast_df,
+        'upper': upper_bound,
+        'lower': lower_bound,
+        'metrics': {
+            'mape': mape_value,
+            'rmse': rmse_value,
+            'error_pct': error_pct,
+            'model': model_label
+        },
+        'model_type': model_type,
+        'selected_model': selected,
+        'timings': timings,
+        'warnings': warnings
+    }
+
+
+def _darts_forecast_key(pair_key, merged_df, forecast_days, model_type):
+    """Return the (cache key, model name) of a DARTS forecast"""
+    model_name = f"darts-{model_type}"
+    if model_type == 'auto':
+        # The auto pick depends on the pair's selection metric
+        model_name += f"-{get_selection_metric(pair_key)}"
+    return make_forecast_key(pair_key, series_fingerprint(merged_df), model_name, forecast_days), model_name
+
+
+def _build_darts_figure(sub, fit_result, forecast_days, model_type):
+    """
+    Build the dark-themed DARTS forecast chart
+    
+    Args:
+        sub: Subscription dictionary containing currency pair information
+        fit_result: Result of _fit_darts_forecast
+        forecast_days: Number of days forecast
+        model_type: Model type requested by the user
+    
+    Returns:
+        Plotly figure
+    """
+    series_df = fit_result['series']
+    forecast_df = fit_result['forecast']
+    upper_bound = fit_result['upper']
+    lower_bound = fit_result['lower']
+    
+    # Create dark-themed figure for visualization
+    fig = go.Figure()
+    
+    # Add historical data trace
+    fig.add_trace(go.Scatter(
+        x=series_df['timestamp'],
+        y=series_df['actual'],
+        mode='lines',
+        name='Historical',
+        line=dict(color='#4D9BF5', width=2),
+        hovertemplate='%{x}<br>Rate: %{y:.4f}<extra></extra>'
+    ))
+    
+    # Add forecast line
+    fig.add_trace(go.Scatter(
+        x=forecast_df['timestamp'],
+        y=forecast_df['forecast'],
+        mode='lines',
+        name='DARTS Forecast',
+        line=dict(color='#9C27B0', width=2, dash='dash'),  # Purple for DARTS vs orange for Prophet
+        hovertemplate='%{x}<br>Forecast: %{y:.4f}<extra></extra>'
+    ))
+    
+    # Add confidence interval
+    if upper_bound is not None and lower_bound is not None:
         fig.add_trace(go.Scatter(
-            x=forecast_df['timestamp'],
-            y=forecast_df['forecast'],
-            mode='lines',
-            name='DARTS Forecast',
-            line=dict(color='#9C27B0', width=2, dash='dash'),  # Purple for DARTS vs orange for Prophet
-            hovertemplate='%{x}<br>Forecast: %{y:.4f}<extra></extra>'
+            x=forecast_df['timestamp'].tolist() + forecast_df['timestamp'].tolist()[::-1],
+            y=upper_bound.tolist() + lower_bound.tolist()[::-1],
+            fill='toself',
+            fillcolor='rgba(156, 39, 176, 0.2)',  # Light purple
+            line=dict(color='rgba(156, 39, 176, 0)'),
+            name='Confidence Interval',
+            hoverinfo='skip'
         ))
-        
-        # Calculate confidence intervals (simulated, as DARTS doesn't always provide them)
-        # Use historical volatility to estimate
-        if len(series_df) > 10:
-            volatility = series_df['actual'].pct_change().std() * 100  # Percentage volatility
-            
-            # Scale confidence interval based on volatility
-            ci_factor = max(1.5, min(5, volatility * 2))  # Scale based on volatility, between 1.5% and 5%
-            
-            # Create upper and lower bounds
-            upper_bound = forecast_df['forecast'] * (1 + ci_factor/100)
-            lower_bound = forecast_df['forecast'] * (1 - ci_factor/100)
-            
-            # Add confidence interval
-            fig.add_trace(go.Scatter(
-                x=forecast_df['timestamp'].tolist() + forecast_df['timestamp'].tolist()[::-1],
-                y=upper_bound.tolist() + lower_bound.tolist()[::-1],
-                fill='toself',
-                fillcolor='rgba(156, 39, 176, 0.2)',  # Light purple
-                line=dict(color='rgba(156, 39, 176, 0)'),
-                name='Confidence Interval',
-                hoverinfo='skip'
-            ))
-        
-        # Add chart title
-        model_name = model_type.upper() if model_type != 'auto' else 'AutoARIMA'
-        fig.update_layout(
-            title=f"{sub['base']}/{sub['quote']} DARTS {model_name} Forecast ({forecast_days} days)",
-            title_font_color="#FFFFFF"
-        )
-        
-        # Apply dark theme styling
-        fig.update_layout(
-            height=400,
-            margin=dict(l=0, r=0, t=40, b=0),
-            paper_bgcolor="#121212",  # Dark background
-            plot_bgcolor="#121212",   # Dark background
-            font=dict(color="#FFFFFF"),  # Pure white text for better visibility
-            xaxis=dict(
-                gridcolor="#333333",  # Darker grid
-                tickcolor="#FFFFFF",  # Pure white tick marks
-                linecolor="#555555",  # Medium gray axis line
-                tickfont=dict(color="#FFFFFF", size=12),  # Brighter, larger tick labels
-                title_font=dict(color="#FFFFFF", size=14)  # Brighter, larger axis title
-            ),
-            yaxis=dict(
-                gridcolor="#333333",  # Darker grid
-                tickcolor="#FFFFFF",  # Pure white tick marks
-                linecolor="#555555",  # Medium gray axis line
-                tickfont=dict(color="#FFFFFF", size=12),  # Brighter, larger tick labels
-                title_font=dict(color="#FFFFFF", size=14)  # Brighter, larger axis title
-            ),
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1,
-                font=dict(color="#FFFFFF", size=12),  # White legend text
-                bgcolor="rgba(18, 18, 18, 0.5)",  # Semi-transparent background
-                bordercolor="#555555"  # Medium gray border
-            )
+    
+    # Add chart title
+    model_name = model_type.upper() if model_type != 'auto' else 'AutoARIMA'
+    fig.update_layout(
+        title=f"{sub['base']}/{sub['quote']} DARTS {model_name} Forecast ({forecast_days} days)",
+        title_font_color="#FFFFFF"
+    )
+    
+    # Apply dark theme styling
+    fig.update_layout(
+        height=400,
+        margin=dict(l=0, r=0, t=40, b=0),
+        paper_bgcolor="#121212",  # Dark background
+        plot_bgcolor="#121212",   # Dark background
+        font=dict(color="#FFFFFF"),  # Pure white text for better visibility
+        xaxis=dict(
+            gridcolor="#333333",  # Darker grid
+            tickcolor="#FFFFFF",  # Pure white tick marks
+            linecolor="#555555",  # Medium gray axis line
+            tickfont=dict(color="#FFFFFF", size=12),  # Brighter, larger tick labels
+            title_font=dict(color="#FFFFFF", size=14)  # Brighter, larger axis title
+        ),
+        yaxis=dict(
+            gridcolor="#333333",  # Darker grid
+            tickcolor="#FFFFFF",  # Pure white tick marks
+            linecolor="#555555",  # Medium gray axis line
+            tickfont=dict(color="#FFFFFF", size=12),  # Brighter, larger tick labels
+            title_font=dict(color="#FFFFFF", size=14)  # Brighter, larger axis title
+        ),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1,
+            font=dict(color="#FFFFFF", size=12),  # White legend text
+            bgcolor="rgba(18, 18, 18, 0.5)",  # Semi-transparent background
+            bordercolor="#555555"  # Medium gray border
         )
+    )
+    
+    # Add the FX-Pulsar watermark
+    fig.add_annotation(
+        text="FX-PULSAR DARTS",
+        x=0.95,  # Position at 95% from the left
+        y=0.10,  # Position at 10% from the bottom
+        xref="paper",
+        yref="paper",
+        showarrow=False,
+        font=dict(
+            family="Arial",
+            size=28,
+            color="rgba(255, 255, 255, 0.15)"  # Semi-transparent white
+        ),
+        align="right",
+        opacity=0.7,
+        textangle=0
+    )
+    
+    return fig
+
+
+def _get_darts_input(sub):
+    """
+    Assemble the historical series used by DARTS: cached chart data plus completed bars of live rates
+    
+    Args:
+        sub: Subscription dictionary containing currency pair information
+    
+    Returns:
+        DataFrame with 'timestamp' and 'rate' columns, or None if no data is available
+    """
+    pair_key = f"{sub['base'].lower()}_{sub['quote'].lower()}"
+    
+    # Check if we have cached historical data for this pair, otherwise read the stored 5D data
+    if 'historical_rate_cache' in st.session_state and pair_key in st.session_state.historical_rate_cache:
+        historical_df = st.session_state.historical_rate_cache[pair_key]['data'].copy()
+    else:
+        historical_df = get_historical_data_for_forecasting(sub['base'], sub['quote'])
+        if historical_df is None:
+            return None
+    
+    # Add real-time data if available
+    if pair_key in st.session_state.get('rate_history', {}) and len(st.session_state.rate_history[pair_key]) > 1:
+        realtime_df = st.session_state.rate_history[pair_key].to_frame()
         
-        # Add the FX-Pulsar watermark
-        fig.add_annotation(
-            text="FX-PULSAR DARTS",
-            x=0.95,  # Position at 95% from the left
-            y=0.10,  # Position at 10% from the bottom
-            xref="paper",
-            yref="paper",
-            showarrow=False,
-            font=dict(
-                family="Arial",
-                size=28,
-                color="rgba(255, 255, 255, 0.15)"  # Semi-transparent white
-            ),
-            align="right",
-            opacity=0.7,
-            textangle=0
-        )
+        # Find the last timestamp in historical data
+        last_historical_time = historical_df['timestamp'].max()
         
-        # Prepare forecast data and metrics for return
-        forecast_result = {
-            'data': {
-                'timestamps': forecast_df['timestamp'].tolist(),
-                'values': forecast_df['forecast'].tolist(),
-                'upper': upper_bound.tolist() if 'upper_bound' in locals() else None,
-                'lower': lower_bound.tolist() if 'lower_bound' in locals() else None
-            },
-            'metrics': {
-                'mape': mape_value,
-                'rmse': rmse_value,
-                'error_pct': error_pct,
-                'model': model_type
-            }
-        }
+        # Filter real-time data to only include points after the historical data
+        new_realtime_df = realtime_df[realtime_df['timestamp'] > last_historical_time]
         
-        # Return the figure and forecast data
-        return fig, forecast_result
+        # If we have new real-time data points, append them as whole bars at the spacing of the
+        # stored history. The ticks of the still-forming bar are left out: they would change the
+        # input (and so its cache key) on every tick and queue a refit each time.
+        bar = historical_df['timestamp'].diff().median()
+        if not new_realtime_df.empty and pd.notna(bar) and bar > pd.Timedelta(0):
+            new_realtime_df = new_realtime_df.sort_values('timestamp')
+            offsets = (new_realtime_df['timestamp'] - last_historical_time) // bar
+            bars = (new_realtime_df.assign(timestamp=last_historical_time + (offsets + 1) * bar)
+                    .groupby('timestamp', as_index=False)['rate'].last())
+            bars = bars[bars['timestamp'] <= new_realtime_df['timestamp'].max()]
+            if not bars.empty:
+                historical_df = pd.concat([historical_df, bars], ignore_index=True)
+    
+    return historical_df
+
+
+def _darts_result_from_fit(fit_result):
+    """Convert a DARTS fit result into the dictionary returned by forecast_with_darts"""
+    forecast_df = fit_result['forecast']
+    return {
+        'data': {
+            'timestamps': forecast_df['timestamp'].tolist(),
+            'values': forecast_df['forecast'].tolist(),
+            'upper': fit_result['upper'].tolist() if fit_result['upper'] is not None else None,
+            'lower': fit_result['lower'].tolist() if fit_result['lower'] is not None else None
+        },
+        'metrics': fit_result['metrics']
+    }
+
+
+def forecast_with_darts(sub, forecast_days=7, model_type='auto', background=False):
+    """
+    Forecast currency exchange rates using DARTS models
+    
+    Fitted forecasts are cached by the input series and model parameters, so the
+    model is only refit when the underlying data changes.
+    
+    Args:
+        sub: Subscription dictionary containing currency pair information
+        forecast_days: Number of days to forecast (default: 7)
+        model_type: Type of model to use ('auto', 'arima', 'exponential', 'nbeats', etc.)
+        background: If True, fit in the forecast process pool instead of blocking,
+            and return the last available forecast (or None) while the fit runs
+    
+    Returns:
+        Plotly figure with historical data and forecast
+    """
+    pair_key = f"{sub['base'].lower()}_{sub['quote'].lower()}"
+    
+    # First get the historical data
+    historical_df = _get_darts_input(sub)
+    if historical_df is None:
+        st.warning("No historical data available for forecasting. Please wait for data to load.")
+        return None
+    
+    if historical_df.empty or len(historical_df) < 10:
+        st.warning("Insufficient data for DARTS forecasting (need at least 10 data points).")
+        return None
+    
+    merged_df, freq = _prepare_darts_frame(historical_df)
+    
+    # Reuse the fitted forecast if the input series hasn't changed
+    cache_key, model_name = _darts_forecast_key(pair_key, merged_df, forecast_days, model_type)
+    fit_result = forecast_cache.get(cache_key)
+    
+    if fit_result is None and background:
+        # Fit off the script thread and show the previous forecast in the meantime
+        error = forecast_executor.get_error(cache_key)
+        if error:
+            st.error(error)
+        else:
+            forecast_executor.submit(cache_key, _fit_darts_forecast, merged_df, freq, forecast_days, model_type, pair_key)
+        fit_result = forecast_cache.latest(cache_key)
+        if fit_result is None:
+            return None
+    
+    if fit_result is None:
+        # Show a spinner while we process the forecast
+        with st.spinner("Generating DARTS forecast..."):
+            fit_result = _fit_darts_forecast(merged_df, freq, forecast_days, model_type, pair_key)
+        if 'error' not in fit_result:
+            forecast_cache.put(cache_key, fit_result)
+    
+    if 'error' in fit_result:
+        st.error(fit_result['error'])
+        return None
+    
+    for message in fit_result['warnings']:
+        st.warning(message)
+    
+    fig = _build_darts_figure(sub, fit_result, forecast_days, model_type)
+    
+    # Return the figure and forecast data
+    return fig, _darts_result_from_fit(fit_result)
+
+def _render_pending_forecast_notice(pair_key, model_prefix, widget_key):
+    """
+    Show that a forecast is being refreshed in the background, with a cancel button
+    
+    Args:
+        pair_key: Pair key (e.g., 'eur_usd')
+        model_prefix: Model type prefix of the in-flight jobs ('prophet' or 'darts')
+        widget_key: Unique suffix for the widget keys
+    """
+    from streamlit_autorefresh import st_autorefresh
+    
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        st.info("Refreshing forecast in the background. Showing the last available forecast until it completes.", icon="⏳")
+    with col2:
+        if st.button("Cancel", key=f"cancel_forecast_{model_prefix}_{widget_key}", use_container_width=True):
+            forecast_executor.cancel_pair(pair_key, model_prefix)
+            st.rerun()
+    
+    # Rerun every few seconds so the finished forecast is picked up from the cache
+    st_autorefresh(interval=5000, key=f"forecast_poll_{model_prefix}_{widget_key}")
+
 
 def _render_darts_forecast_content(sub):
     """Helper function that contains the UI elements for DARTS forecast"""
@@ -462,28 +739,52 @@ def _render_darts_forecast_content(sub):
             key=f"darts_generate_{pair_key}"  # Unique key
         )
     
+    base_pair_key = f"{sub['base'].lower()}_{sub['quote'].lower()}"
+    
+    if model_type == 'auto':
+        # Metric the backtest uses to pick the model for this pair
+        current_metric = get_selection_metric(base_pair_key)
+        selection_metric = st.selectbox(
+            "Selection Metric",
+            options=list(METRICS),
+            index=list(METRICS).index(current_metric),
+            format_func=str.upper,
+            help="Auto mode backtests several models and keeps the one with the lowest error on this metric",
+            key=f"darts_metric_{pair_key}"  # Unique key
+        )
+        if selection_metric != current_metric:
+            set_selection_metric(base_pair_key, selection_metric)
+    
     # Initialize forecast state if it doesn't exist
     if 'darts_forecast_results' not in st.session_state:
         st.session_state.darts_forecast_results = {}
     
-    # Run forecast if button is clicked or if we haven't forecasted this pair yet
-    if run_forecast or pair_key not in st.session_state.darts_forecast_results:
-        # Generate the forecast
-        forecast_result = forecast_with_darts(sub, forecast_days, model_type)
+    # Forecasts are cached by their input data, so requesting one on every run is cheap.
+    # It picks up finished background fits and starts a refit when new data arrives.
+    if run_forecast:
+        # Give previously failed fits another try
+        forecast_executor.clear_errors(base_pair_key, "darts")
+    
+    # Generate the forecast in the background; the last available forecast is returned meanwhile
+    forecast_result = forecast_with_darts(sub, forecast_days, model_type, background=True)
+    
+    if forecast_result:
+        fig, forecast_data = forecast_result
         
-        if forecast_result:
-            fig, forecast_data = forecast_result
-            
-            # Store in session state
-            st.session_state.darts_forecast_results[pair_key] = {
-                'fig': fig,
-                'data': forecast_data,
-                'timestamp': datetime.now(),
-                'params': {
-                    'days': forecast_days,
-                    'model': model_type
-                }
+        # Store in session state
+        st.session_state.darts_forecast_results[pair_key] = {
+            'fig': fig,
+            'data': forecast_data,
+            'timestamp': datetime.now(),
+            'params': {
+                'days': forecast_days,
+                'model': model_type
             }
+        }
+    
+    # Let the user know a refresh is running and poll until it lands
+    if forecast_executor.pending_keys(base_pair_key, "darts"):
+        _render_pending_forecast_notice(base_pair_key, "darts", pair_key)
     
     # Display forecast if available
     if pair_key in st.session_state.darts_forecast_results:
@@ -662,6 +963,17 @@ def _render_darts_forecast_content(sub):
             else:
                 st.info("End of forecast data not available.")
         
+        # Show how the auto mode picked its model
+        leaderboard = get_leaderboard(base_pair_key) if model_type == 'auto' else None
+        if leaderboard and leaderboard.get('scores'):
+            with st.expander("Model Selection Leaderboard"):
+                leaderboard_df = pd.DataFrame(leaderboard['scores'])[['model', 'mape', 'rmse', 'mae', 'folds', 'seconds']]
+                leaderboard_df.columns = ['Model', 'MAPE (%)', 'RMSE', 'MAE', 'Folds', 'Fit Time (s)']
+                st.dataframe(leaderboard_df.round(6), hide_index=True, use_container_width=True)
+                evaluated_at = datetime.fromtimestamp(leaderboard.get('evaluated_at', 0))
+                st.caption(f"Rolling-origin backtest ranked by {leaderboard['metric'].upper()} on "
+                           f"{evaluated_at.strftime('%Y-%m-%d %H:%M')}. The selection is reused until the data drifts.")
+        
         # Add last updated time and disclaimer
         st.caption(f"Last updated: {forecast_result['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}")
         
@@ -669,7 +981,7 @@ def _render_darts_forecast_content(sub):
         <div style="font-size:0.8em; color:#999; margin-top:20px;">
         <strong>About DARTS Models:</strong> DARTS provides multiple time series forecasting models with different strengths:
         <ul style="margin-top:5px; margin-bottom:5px; padding-left:20px;">
-          <li><strong>Auto:</strong> AutoARIMA automatically finds optimal ARIMA parameters</li>
+          <li><strong>Auto:</strong> Backtests ExponentialSmoothing, ARIMA, AutoARIMA, Prophet and a drift baseline, and keeps the best</li>
           <li><strong>ARIMA:</strong> Good for data with trends and some seasonality</li>
           <li><strong>Exponential:</strong> Handles data with trends and seasonality via exponential smoothing</li>
           <li><strong>NBEATS:</strong> Neural network approach for complex patterns (requires more data)</li>
@@ -681,6 +993,7 @@ def _render_darts_forecast_content(sub):
         # Show a message if no forecast is available yet
         st.info("Waiting for sufficient historical data to generate a DARTS forecast. Please try again once the chart data is loaded or click 'Generate Forecast'.")
 
+@profile_component(detail=subscription_label)
 def add_darts_forecast_tab(sub):
     """
     Add a DARTS forecast tab to a tab UI
@@ -694,103 +1007,224 @@ def add_darts_forecast_tab(sub):
     _render_darts_forecast_content(sub)
 
 
-def add_forecast_comparison_card(sub):
+def get_fast_forecasts(subscriptions, forecast_days=7, interval_width=0.8):
     """
-    Add a comparative analysis of different forecasting models for a currency pair
+    Baseline forecasts for every subscription, computed in one vectorized pass
+    
+    The result is kept in session state until the next rates refresh.
     
     Args:
-        sub: Subscription dictionary containing currency pair information
+        subscriptions: List of subscription dictionaries
+        forecast_days: Forecast horizon in days
+        interval_width: Width of the prediction band
+    
+    Returns:
+        Dictionary of pair key to forecast frame ('ds', 'yhat', 'yhat_lower', 'yhat_upper')
     """
-    import streamlit as st
-
-    base = sub['base']
-    quote = sub['quote']
+    pair_keys = [f"{s['base'].lower()}_{s['quote'].lower()}" for s in subscriptions]
+    cache_id = (tuple(pair_keys), forecast_days, interval_width, st.session_state.get('last_refresh'))
     
-    # Get historical data from locally stored YTD data
-    df = get_historical_data_for_forecasting(base, quote)
+    cached = st.session_state.get('fast_forecasts')
+    if cached and cached['id'] == cache_id:
+        return cached['data']
     
-    if df is None or df.empty:
-        st.error(f"No historical data available for {base}/{quote} forecasting")
-        return
+    frames = [get_historical_data_for_forecasting(s['base'], s['quote']) for s in subscriptions]
+    frames = [f.dropna(subset=['rate']) if f is not None else None for f in frames]
+    forecasts = forecast_frames(pair_keys, frames, forecast_days, interval_width)
+    
+    st.session_state.fast_forecasts = {'id': cache_id, 'data': forecasts}
+    return forecasts
 
-    # Get pair key
+
+def _forecast_change_html(label, value, current_rate):
+    """Small dark card with a forecast value and its change from the current rate"""
+    if value is None:
+        return f"""
+        <div style="background-color:#1E1E1E; padding:10px; border-radius:5px;">
+            <div style="display:flex; justify-content:space-between;">
+                <span style="color:white;">{label}:</span>
+                <span style="color:#9E9E9E;">Not available</span>
+            </div>
+        </div>
+        """
+    if current_rate:
+        change = ((value - current_rate) / current_rate) * 100
+        color = "#4CAF50" if change > 0 else "#F44336"
+        change_text = f"{change:+.2f}%"
+    else:
+        color = "white"
+        change_text = "n/a"
+    return f"""
+    <div style="background-color:#1E1E1E; padding:10px; border-radius:5px;">
+        <div style="display:flex; justify-content:space-between; margin-bottom:5px;">
+            <span style="color:white;">{label}:</span>
+            <span style="color:{color};">{value:.4f}</span>
+        </div>
+        <div style="display:flex; justify-content:space-between;">
+            <span style="color:white;">Expected Change:</span>
+            <span style="color:{color};">{change_text}</span>
+        </div>
+    </div>
+    """
+
+
+@profile_component(detail=subscription_label)
+def add_forecast_comparison_card(sub):
+    """
+    Add a comparative analysis of different forecasting models for a currency pair
+    
+    Shows the end-of-forecast value from Prophet, DARTS and the fast baseline side by side,
+    followed by the baseline outlook for every subscription. All columns use the horizon of
+    the Prophet forecast (or of the DARTS forecast without one); a forecast generated for a
+    different horizon is left out rather than compared.
+    
+    Args:
+        sub: Subscription dictionary containing currency pair information
+    """
     pair_key = f"{sub['base'].lower()}_{sub['quote'].lower()}"
     darts_pair_key = f"{pair_key}_darts"
+    current_rate = sub.get('current_rate')
     
-    # Check if we have forecasts from either model
+    # The Prophet tab also stores fast-baseline results, which belong in the baseline column
     prophet_forecast = st.session_state.get('forecast_results', {}).get(pair_key)
+    if prophet_forecast is not None and prophet_forecast['params'].get('model') != 'prophet':
+        prophet_forecast = None
     darts_forecast = st.session_state.get('darts_forecast_results', {}).get(darts_pair_key)
     
-    # If no forecasts at all, just show a simple message
-    if not prophet_forecast and not darts_forecast:
-        st.info("Generate forecasts using both Prophet and DARTS tabs to see model comparison.")
+    # Compare every model at the same horizon
+    if prophet_forecast is not None:
+        forecast_days = prophet_forecast['params']['days']
+    elif darts_forecast is not None:
+        forecast_days = darts_forecast['params']['days']
+    else:
+        forecast_days = 7
+    if darts_forecast is not None and darts_forecast['params']['days'] != forecast_days:
+        darts_forecast = None
+    
+    subscriptions = st.session_state.get('subscriptions') or [sub]
+    fast_forecasts = get_fast_forecasts(subscriptions, forecast_days)
+    
+    if not fast_forecasts and not prophet_forecast and not darts_forecast:
+        st.info(f"No historical data available for {sub['base']}/{sub['quote']} forecasting")
         return
     
     # Create a comparison section
     st.markdown("### Forecast Model Comparison")
-    st.markdown("Compare predictions from different forecasting approaches:")
+    st.markdown(f"Compare {forecast_days}-day end-of-forecast predictions from different forecasting approaches:")
     
-    # Create two columns for summary cards
-    col1, col2 = st.columns(2)
+    prophet_end = None
+    if prophet_forecast is not None and not prophet_forecast['data'].empty:
+        prophet_end = float(prophet_forecast['data']['yhat'].iloc[-1])
     
-    # Prophet summary card
-    with col1:
-        if prophet_forecast:
-            st.markdown("#### Prophet Forecast")
-            st.info("Prophet forecast is available. Please check the Prophet tab for details.")
-        else:
-            st.info("Generate a Prophet forecast to see comparison.")
+    darts_end = None
+    if darts_forecast:
+        values = darts_forecast['data'].get('data', {}).get('values')
+        if values:
+            darts_end = float(values[-1])
     
-    # DARTS summary card
+    fast_end = None
+    if pair_key in fast_forecasts:
+        fast_end = float(fast_forecasts[pair_key]['yhat'].iloc[-1])
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.markdown("#### Prophet")
+        st.markdown(_forecast_change_html("Forecast", prophet_end, current_rate), unsafe_allow_html=True)
     with col2:
-        if darts_forecast:
-            st.markdown("#### DARTS Forecast")
-            st.info("DARTS forecast is available. Please check the DARTS tab for details.")
-        else:
-            st.info("Generate a DARTS forecast to see comparison.")
+        st.markdown("#### DARTS")
+        st.markdown(_forecast_change_html("Forecast", darts_end, current_rate), unsafe_allow_html=True)
+    with col3:
+        st.markdown("#### Fast Baseline")
+        st.markdown(_forecast_change_html("Forecast", fast_end, current_rate), unsafe_allow_html=True)
+    
+    # Baseline outlook across all subscriptions
+    if fast_forecasts:
+        rows = []
+        for s in subscriptions:
+            key = f"{s['base'].lower()}_{s['quote'].lower()}"
+            if key not in fast_forecasts:
+                continue
+            last_row = fast_forecasts[key].iloc[-1]
+            reference = s.get('current_rate')
+            change = ((last_row['yhat'] - reference) / reference * 100) if reference else None
+            rows.append({
+                "Pair": f"{s['base']}/{s['quote']}",
+                "Outlook": "↑" if change and change > 0 else ("↓" if change and change < 0 else "→"),
+                "Expected Change (%)": round(change, 2) if change is not None else None,
+                "Forecast": round(float(last_row['yhat']), 4),
+                "Low": round(float(last_row['yhat_lower']), 4),
+                "High": round(float(last_row['yhat_upper']), 4),
+            })
+        if rows:
+            st.markdown(f"#### {forecast_days}-Day Baseline Outlook (all pairs)")
+            st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+    
+    st.caption("The fast baseline is an EWMA drift with a volatility cone, computed for all pairs at once.")
+
 
+def _forecast_frequency(historical_df):
+    """
+    Choose the Prophet future-frame frequency from the spacing of the history
+    
+    Args:
+        historical_df: DataFrame with a 'timestamp' column
     
-def forecast_currency_rates(sub, forecast_days=7, confidence_interval=0.8):
+    Returns:
+        Frequency string, or None for daily data
     """
-    Forecast currency exchange rates using Facebook Prophet
+    if len(historical_df) == 0:
+        return None
+    time_diff = (historical_df['timestamp'].max() - historical_df['timestamp'].min()).total_seconds()
+    data_points = len(historical_df)
+    avg_time_between_points = time_diff / max(1, data_points - 1)
+    
+    # If average time between points is less than a day, we have intraday data
+    if avg_time_between_points >= 86400:  # seconds in a day
+        return None
+    if avg_time_between_points < 3600:  # less than an hour
+        return '5min'
+    elif avg_time_between_points < 21600:  # less than 6 hours
+        return '1H'
+    return '6H'
+
+
+def _fit_prophet_forecast(historical_df, forecast_days=7, confidence_interval=0.8, add_holidays=False,
+                          cv_parallel="processes", pair_key=None):
+    """
+    Fit Prophet, predict and cross-validate. Has no Streamlit dependency so it can run in a worker process.
+    
+    With a pair key, the fit warm-starts from the pair's previous parameters and reuses its
+    cross-validation metrics, unless a full refit is due (see fx_news.predict.model_store).
     
     Args:
-        sub: Subscription dictionary containing currency pair information
-        forecast_days: Number of days to forecast (default: 7)
-        confidence_interval: Confidence interval for forecast (default: 0.8)
+        historical_df: DataFrame with 'timestamp' and 'rate' columns
+        forecast_days: Number of days to forecast
+        confidence_interval: Width of the prediction interval
+        add_holidays: Whether to add US and UK holidays (for currency pairs)
+        cv_parallel: Prophet cross_validation parallel mode (None to run serially)
+        pair_key: Pair key (e.g., 'eur_usd') for the model-state store
     
     Returns:
-        Plotly figure with historical data and forecast, or None if no data is available
+        Dictionary with the forecast frame, metrics, timings and any warnings,
+        or a dictionary with an 'error' key if Prophet is unavailable
     """
-    import plotly.graph_objects as go
-    import pandas as pd
-    from datetime import datetime, timedelta
-    import streamlit as st
+    import time
     
     try:
         from prophet import Prophet
         from prophet.diagnostics import cross_validation, performance_metrics
     except ImportError:
-        st.warning("Prophet library is not installed. Please install it to use forecasting.")
-        return None
+        return {'error': "Prophet library is not installed. Please install it to use forecasting."}
     
-    # First get the historical data directly from the source rate YTD or 5D data file
-    pair_key = f"{sub['base'].lower()}_{sub['quote'].lower()}"
+    warnings = []
+    timings = {}
     
-    # Get historical data using the function that reads JSON directly
-    historical_df = get_historical_data_for_forecasting(sub['base'], sub['quote'])
+    # Prepare data for Prophet (requires 'ds' for dates and 'y' for values)
+    prophet_df = historical_df[['timestamp', 'rate']].copy()
+    prophet_df.columns = ['ds', 'y']
     
-    if historical_df is None or historical_df.empty:
-        st.warning("No historical data available for forecasting. Please wait for data to load.")
-        return None
-    
-    # Show a spinner while we process the forecast
-    with st.spinner("Generating forecast..."):
-        # Prepare data for Prophet (requires 'ds' for dates and 'y' for values)
-        prophet_df = historical_df[['timestamp', 'rate']].copy()
-        prophet_df.columns = ['ds', 'y']
-        
-        # Create and fit the Prophet model with optimized parameters
+    def make_model():
+        # Create the Prophet model with optimized parameters
         model = Prophet(
             # Core parameters
             interval_width=confidence_interval,
@@ -808,171 +1242,326 @@ def forecast_currency_rates(sub, forecast_days=7, confidence_interval=0.8):
         )
         
         # Add country-specific holidays if appropriate
-        if st.session_state.get('market_type') == 'Currency':
+        if add_holidays:
             # For currency pairs, add US, EU, UK, JP holidays as these affect forex markets
             try:
-                from prophet.holidays import add_country_holidays
                 model.add_country_holidays(country_name='US')
                 model.add_country_holidays(country_name='UK')
                 # Add more relevant countries based on the currency pair
             except Exception as e:
-                st.warning(f"Could not add holidays: {str(e)}")
-            
-        # Fit the model
+                warnings.append(f"Could not add holidays: {str(e)}")
+        return model
+    
+    # Warm-start from the previous fit of this pair if only a few bars were added since
+    model_name = f"prophet{'-holidays' if add_holidays else ''}"
+    state = get_model_state(pair_key, model_name) if pair_key else None
+    warm_start = state is not None and not needs_full_refit(state, historical_df)
+    
+    # Fit the model
+    model = make_model()
+    start = time.perf_counter()
+    if warm_start:
+        try:
+            model.fit(prophet_df, init=state['init'])
+        except Exception as e:
+            logger.info(f"Prophet warm start failed for {pair_key}, fitting from scratch: {str(e)}")
+            warm_start = False
+            model = make_model()
+    if not warm_start:
         model.fit(prophet_df)
-        
-        # Create future dataframe for predictions
+    timings['fit'] = time.perf_counter() - start
+    
+    # Create future dataframe for predictions, with intraday frequency if we have intraday data
+    freq = _forecast_frequency(historical_df)
+    if freq:
+        future = model.make_future_dataframe(
+            periods=int(forecast_days * 24),  # Convert days to hours
+            freq=freq
+        )
+    else:
         future = model.make_future_dataframe(periods=forecast_days, freq='D')
+    
+    # Make predictions
+    start = time.perf_counter()
+    forecast = model.predict(future)
+    timings['predict'] = time.perf_counter() - start
+    
+    # Perform model validation through cross-validation; warm starts keep the last full fit's metrics
+    forecast_metrics = state.get('metrics') if warm_start else None
+    if not warm_start and len(prophet_df) > 30:  # Only do CV if we have enough data
+        initial_days = int(len(prophet_df) * 0.5)  # Use 50% of data for initial training
+        period_days = int(len(prophet_df) * 0.2)  # Increment by 20% of data
+        horizon_days = min(forecast_days, int(len(prophet_df) * 0.3))  # Forecast horizon (30% of data or requested days)
         
-        # Add intraday predictions if we have intraday data
-        if len(historical_df) > 0:
-            time_diff = (historical_df['timestamp'].max() - historical_df['timestamp'].min()).total_seconds()
-            data_points = len(historical_df)
-            avg_time_between_points = time_diff / max(1, data_points - 1)
+        start = time.perf_counter()
+        try:
+            cv_results = cross_validation(
+                model=model,
+                initial=f"{initial_days} days",
+                period=f"{period_days} days",
+                horizon=f"{horizon_days} days",
+                parallel=cv_parallel
+            )
             
-            # If average time between points is less than a day, we have intraday data
-            if avg_time_between_points < 86400:  # seconds in a day
-                # Make future dataframe with intraday frequency
-                if avg_time_between_points < 3600:  # less than an hour
-                    freq = '5min'
-                elif avg_time_between_points < 21600:  # less than 6 hours
-                    freq = '1H'
-                else:
-                    freq = '6H'
-                
-                future = model.make_future_dataframe(
-                    periods=int(forecast_days * 24),  # Convert days to hours
-                    freq=freq
-                )
-        
-        # Make predictions
-        forecast = model.predict(future)
-        
-        # Perform model validation through cross-validation
-        forecast_metrics = None
-        if len(prophet_df) > 30:  # Only do CV if we have enough data
-            initial_days = int(len(prophet_df) * 0.5)  # Use 50% of data for initial training
-            period_days = int(len(prophet_df) * 0.2)  # Increment by 20% of data
-            horizon_days = min(forecast_days, int(len(prophet_df) * 0.3))  # Forecast horizon (30% of data or requested days)
+            # Get performance metrics
+            cv_metrics = performance_metrics(cv_results)
             
-            try:
-                cv_results = cross_validation(
-                    model=model,
-                    initial=f"{initial_days} days",
-                    period=f"{period_days} days",
-                    horizon=f"{horizon_days} days",
-                    parallel="processes"
-                )
-                
-                # Get performance metrics
-                cv_metrics = performance_metrics(cv_results)
-                
-                # Calculate mean absolute percentage error (MAPE)
-                mape = cv_metrics['mape'].mean() * 100  # Convert to percentage
-                
-                # Store metrics for display
-                forecast_metrics = {
-                    'MAPE': f"{mape:.2f}%",
-                    'MAE': f"{cv_metrics['mae'].mean():.6f}",
-                    'RMSE': f"{cv_metrics['rmse'].mean():.6f}"
-                }
-            except Exception as e:
-                st.warning(f"Cross-validation error: {e}. Using model without validation.")
-                forecast_metrics = None
-        
-        # Create dark-themed figure for visualization
-        fig = go.Figure()
-        
-        # Add historical data trace
-        fig.add_trace(go.Scatter(
-            x=historical_df['timestamp'],
-            y=historical_df['rate'],
-            mode='lines',
-            name='Historical',
-            line=dict(color='#4D9BF5', width=2),
-            hovertemplate='%{x}<br>Rate: %{y:.4f}<extra></extra>'
-        ))
-        
-        # Add forecast line
-        fig.add_trace(go.Scatter(
-            x=forecast['ds'],
-            y=forecast['yhat'],
-            mode='lines',
-            name='Forecast',
-            line=dict(color='#FFA500', width=2, dash='dash'),
-            hovertemplate='%{x}<br>Forecast: %{y:.4f}<extra></extra>'
-        ))
-        
-        # Add prediction intervals
-        fig.add_trace(go.Scatter(
-            x=forecast['ds'].tolist() + forecast['ds'].tolist()[::-1],
-            y=forecast['yhat_upper'].tolist() + forecast['yhat_lower'].tolist()[::-1],
-            fill='toself',
-            fillcolor='rgba(255, 165, 0, 0.2)',
-            line=dict(color='rgba(255, 165, 0, 0)'),
-            name=f'{int(confidence_interval*100)}% Prediction Interval',
-            hoverinfo='skip'
-        ))
-        
-        # Add chart title
-        fig.update_layout(
-            title=f"{sub['base']}/{sub['quote']} Rate Forecast ({forecast_days} days)",
-            title_font_color="#FFFFFF"
-        )
-        
-        # Apply dark theme styling
-        fig.update_layout(
-            height=400,
-            margin=dict(l=0, r=0, t=40, b=0),
-            paper_bgcolor="#121212",  # Dark background
-            plot_bgcolor="#121212",   # Dark background
-            font=dict(color="#FFFFFF"),  # Pure white text for better visibility
-            xaxis=dict(
-                gridcolor="#333333",  # Darker grid
-                tickcolor="#FFFFFF",  # Pure white tick marks
-                linecolor="#555555",  # Medium gray axis line
-                tickfont=dict(color="#FFFFFF", size=12),  # Brighter, larger tick labels
-                title_font=dict(color="#FFFFFF", size=14)  # Brighter, larger axis title
-            ),
-            yaxis=dict(
-                gridcolor="#333333",  # Darker grid
-                tickcolor="#FFFFFF",  # Pure white tick marks
-                linecolor="#555555",  # Medium gray axis line
-                tickfont=dict(color="#FFFFFF", size=12),  # Brighter, larger tick labels
-                title_font=dict(color="#FFFFFF", size=14)  # Brighter, larger axis title
-            ),
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1,
-                font=dict(color="#FFFFFF", size=12),  # White legend text
-                bgcolor="rgba(18, 18, 18, 0.5)",  # Semi-transparent background
-                bordercolor="#555555"  # Medium gray border
-            )
-        )
-        
-        # Add the FX-Pulsar watermark
-        fig.add_annotation(
-            text="FX-PULSAR FORECAST",
-            x=0.95,  # Position at 95% from the left
-            y=0.10,  # Position at 10% from the bottom
-            xref="paper",
-            yref="paper",
-            showarrow=False,
-            font=dict(
-                family="Arial",
-                size=28,
-                color="rgba(255, 255, 255, 0.15)"  # Semi-transparent white
-            ),
-            align="right",
-            opacity=0.7,
-            textangle=0
+            # Calculate mean absolute percentage error (MAPE)
+            mape = cv_metrics['mape'].mean() * 100  # Convert to percentage
+            
+            # Store metrics for display
+            forecast_metrics = {
+                'MAPE': f"{mape:.2f}%",
+                'MAE': f"{cv_metrics['mae'].mean():.6f}",
+                'RMSE': f"{cv_metrics['rmse'].mean():.6f}"
+            }
+        except Exception as e:
+            warnings.append(f"Cross-validation error: {e}. Using model without validation.")
+            forecast_metrics = None
+        timings['cross_validation'] = time.perf_counter() - start
+    
+    if pair_key:
+        try:
+            save_model_state(pair_key, model_name, {
+                'init': prophet_init_params(model),
+                'metrics': forecast_metrics,
+                **fit_profile(historical_df, state if warm_start else None)
+            })
+        except Exception as e:
+            logger.info(f"Could not store Prophet state for {pair_key}: {str(e)}")
+    
+    return {
+        # Only keep the columns the UI reads to keep cached results small
+        'forecast': forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].copy(),
+        'metrics': forecast_metrics,
+        'timings': timings,
+        'warm_start': warm_start,
+        'warnings': warnings
+    }
+
+
+def _prophet_forecast_key(pair_key, historical_df, forecast_days, confidence_interval, add_holidays):
+    """Return the (cache key, model name) of a Prophet forecast"""
+    model_name = f"prophet{'-holidays' if add_holidays else ''}"
+    key = make_forecast_key(pair_key, series_fingerprint(historical_df), model_name,
+                            forecast_days, confidence_interval)
+    return key, model_name
+
+
+def _build_prophet_figure(sub, historical_df, forecast, forecast_days, confidence_interval):
+    """
+    Build the dark-themed Prophet forecast chart
+    
+    Args:
+        sub: Subscription dictionary containing currency pair information
+        historical_df: DataFrame with 'timestamp' and 'rate' columns
+        forecast: Forecast frame with 'ds', 'yhat', 'yhat_lower' and 'yhat_upper'
+        forecast_days: Number of days forecast
+        confidence_interval: Width of the prediction interval
+    
+    Returns:
+        Plotly figure
+    """
+    # Create dark-themed figure for visualization
+    fig = go.Figure()
+    
+    # Add historical data trace
+    fig.add_trace(go.Scatter(
+        x=historical_df['timestamp'],
+        y=historical_df['rate'],
+        mode='lines',
+        name='Historical',
+        line=dict(color='#4D9BF5', width=2),
+        hovertemplate='%{x}<br>Rate: %{y:.4f}<extra></extra>'
+    ))
+    
+    # Add forecast line
+    fig.add_trace(go.Scatter(
+        x=forecast['ds'],
+        y=forecast['yhat'],
+        mode='lines',
+        name='Forecast',
+        line=dict(color='#FFA500', width=2, dash='dash'),
+        hovertemplate='%{x}<br>Forecast: %{y:.4f}<extra></extra>'
+    ))
+    
+    # Add prediction intervals
+    fig.add_trace(go.Scatter(
+        x=forecast['ds'].tolist() + forecast['ds'].tolist()[::-1],
+        y=forecast['yhat_upper'].tolist() + forecast['yhat_lower'].tolist()[::-1],
+        fill='toself',
+        fillcolor='rgba(255, 165, 0, 0.2)',
+        line=dict(color='rgba(255, 165, 0, 0)'),
+        name=f'{int(confidence_interval*100)}% Prediction Interval',
+        hoverinfo='skip'
+    ))
+    
+    # Add chart title
+    fig.update_layout(
+        title=f"{sub['base']}/{sub['quote']} Rate Forecast ({forecast_days} days)",
+        title_font_color="#FFFFFF"
+    )
+    
+    # Apply dark theme styling
+    fig.update_layout(
+        height=400,
+        margin=dict(l=0, r=0, t=40, b=0),
+        paper_bgcolor="#121212",  # Dark background
+        plot_bgcolor="#121212",   # Dark background
+        font=dict(color="#FFFFFF"),  # Pure white text for better visibility
+        xaxis=dict(
+            gridcolor="#333333",  # Darker grid
+            tickcolor="#FFFFFF",  # Pure white tick marks
+            linecolor="#555555",  # Medium gray axis line
+            tickfont=dict(color="#FFFFFF", size=12),  # Brighter, larger tick labels
+            title_font=dict(color="#FFFFFF", size=14)  # Brighter, larger axis title
+        ),
+        yaxis=dict(
+            gridcolor="#333333",  # Darker grid
+            tickcolor="#FFFFFF",  # Pure white tick marks
+            linecolor="#555555",  # Medium gray axis line
+            tickfont=dict(color="#FFFFFF", size=12),  # Brighter, larger tick labels
+            title_font=dict(color="#FFFFFF", size=14)  # Brighter, larger axis title
+        ),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1,
+            font=dict(color="#FFFFFF", size=12),  # White legend text
+            bgcolor="rgba(18, 18, 18, 0.5)",  # Semi-transparent background
+            bordercolor="#555555"  # Medium gray border
         )
-        
-        # Return the figure and metrics
-        return fig, forecast_metrics, forecast
+    )
+    
+    # Add the FX-Pulsar watermark
+    fig.add_annotation(
+        text="FX-PULSAR FORECAST",
+        x=0.95,  # Position at 95% from the left
+        y=0.10,  # Position at 10% from the bottom
+        xref="paper",
+        yref="paper",
+        showarrow=False,
+        font=dict(
+            family="Arial",
+            size=28,
+            color="rgba(255, 255, 255, 0.15)"  # Semi-transparent white
+        ),
+        align="right",
+        opacity=0.7,
+        textangle=0
+    )
+    
+    return fig
+
+
+def _forecast_fast(sub, historical_df, forecast_days, confidence_interval):
+    """
+    Baseline forecast for a single pair, returned in the same shape as the Prophet forecast
+    
+    Args:
+        sub: Subscription dictionary containing currency pair information
+        historical_df: DataFrame with 'timestamp' and 'rate' columns
+        forecast_days: Number of days to forecast
+        confidence_interval: Width of the prediction band
+    
+    Returns:
+        Tuple of (figure, metrics, forecast frame), or None if there is too little data
+    """
+    pair_key = f"{sub['base'].lower()}_{sub['quote'].lower()}"
+    historical_df = historical_df.dropna(subset=['rate'])
+    
+    forecast = forecast_frames([pair_key], [historical_df], forecast_days, confidence_interval).get(pair_key)
+    if forecast is None:
+        st.warning("Insufficient data for the baseline forecast.")
+        return None
+    
+    scores = backtest_baseline(historical_df['rate'].to_numpy(), interval_width=confidence_interval)
+    forecast_metrics = None
+    if scores:
+        forecast_metrics = {
+            'MAPE': f"{scores['mape']:.2f}%",
+            'MAE': f"{scores['mae']:.6f}",
+            'RMSE': f"{scores['rmse']:.6f}"
+        }
+    
+    fig = _build_prophet_figure(sub, historical_df, forecast, forecast_days, confidence_interval)
+    return fig, forecast_metrics, forecast
+
+
+def forecast_currency_rates(sub, forecast_days=7, confidence_interval=0.8, background=False, model_type='prophet'):
+    """
+    Forecast currency exchange rates using Facebook Prophet
+    
+    Fitted forecasts are cached by the input series and model parameters, so Prophet
+    is only refit when the underlying data changes.
+    
+    Args:
+        sub: Subscription dictionary containing currency pair information
+        forecast_days: Number of days to forecast (default: 7)
+        confidence_interval: Confidence interval for forecast (default: 0.8)
+        background: If True, fit in the forecast process pool instead of blocking,
+            and return the last available forecast (or None) while the fit runs
+        model_type: 'prophet', or 'fast' for the vectorized EWMA drift baseline
+    
+    Returns:
+        Plotly figure with historical data and forecast, or None if no data is available
+    """
+    # First get the historical data directly from the source rate YTD or 5D data file
+    pair_key = f"{sub['base'].lower()}_{sub['quote'].lower()}"
+    
+    # Get historical data using the function that reads JSON directly
+    historical_df = get_historical_data_for_forecasting(sub['base'], sub['quote'])
+    
+    if historical_df is None or historical_df.empty:
+        st.warning("No historical data available for forecasting. Please wait for data to load.")
+        return None
+    
+    if model_type == 'fast':
+        return _forecast_fast(sub, historical_df, forecast_days, confidence_interval)
+    
+    add_holidays = st.session_state.get('market_type') == 'Currency'
+    
+    # Reuse the fitted forecast if the input series hasn't changed
+    cache_key, model_name = _prophet_forecast_key(pair_key, historical_df, forecast_days,
+                                                  confidence_interval, add_holidays)
+    fit_result = forecast_cache.get(cache_key)
+    
+    if fit_result is None and background:
+        # Fit off the script thread and show the previous forecast in the meantime.
+        # Cross-validate with threads: the fit already runs in a pool worker, and a nested
+        # process pool per job would oversubscribe the CPUs.
+        error = forecast_executor.get_error(cache_key)
+        if error:
+            st.warning(error)
+        else:
+            forecast_executor.submit(cache_key, _fit_prophet_forecast, historical_df, forecast_days,
+                                     confidence_interval, add_holidays, "threads", pair_key)
+        fit_result = forecast_cache.latest(cache_key)
+        if fit_result is None:
+            return None
+    
+    if fit_result is None:
+        # Show a spinner while we process the forecast
+        with st.spinner("Generating forecast..."):
+            fit_result = _fit_prophet_forecast(historical_df, forecast_days, confidence_interval, add_holidays,
+                                               pair_key=pair_key)
+        if 'error' not in fit_result:
+            forecast_cache.put(cache_key, fit_result)
+    
+    if 'error' in fit_result:
+        st.warning(fit_result['error'])
+        return None
+    
+    for message in fit_result['warnings']:
+        st.warning(message)
+    
+    forecast = fit_result['forecast']
+    fig = _build_prophet_figure(sub, historical_df, forecast, forecast_days, confidence_interval)
+    
+    # Return the figure and metrics
+    return fig, fit_result['metrics'], forecast
 
 def _render_forecast_content(sub):
     """Helper function that contains the actual forecast UI elements"""
@@ -982,8 +1571,8 @@ def _render_forecast_content(sub):
     # Create a unique base key for this currency pair
     pair_key = f"{sub['base'].lower()}_{sub['quote'].lower()}"
     
-    # Create two columns for controls
-    col1, col2, col3 = st.columns(3)
+    # Create columns for controls
+    col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         # Forecast period selection with unique key
@@ -1010,6 +1599,16 @@ def _render_forecast_content(sub):
         )
     
     with col3:
+        # Model selection: Prophet or the fast vectorized baseline
+        model_type = st.selectbox(
+            "Model Type",
+            options=["prophet", "fast"],
+            index=0,
+            help="Prophet fits a full seasonal model; fast is an EWMA drift with a volatility cone",
+            key=f"forecast_model_{pair_key}"  # Unique key based on currency pair
+        )
+    
+    with col4:
         # Button to run/refresh forecast with unique key
         run_forecast = st.button(
             "Generate Forecast", 
@@ -1024,25 +1623,34 @@ def _render_forecast_content(sub):
     # Get pair key
     pair_key = f"{sub['base'].lower()}_{sub['quote'].lower()}"
         
-    # Run forecast if button is clicked or if we haven't forecasted this pair yet
-    if run_forecast or pair_key not in st.session_state.forecast_results:
-        # Generate the forecast
-        forecast_result = forecast_currency_rates(sub, forecast_days, confidence)
+    # Forecasts are cached by their input data, so requesting one on every run is cheap.
+    # It picks up finished background fits and starts a refit when new data arrives.
+    if run_forecast:
+        # Give previously failed fits another try
+        forecast_executor.clear_errors(pair_key, "prophet")
+    
+    # Generate the forecast in the background; the last available forecast is returned meanwhile
+    forecast_result = forecast_currency_rates(sub, forecast_days, confidence, background=True, model_type=model_type)
+    
+    if forecast_result:
+        fig, metrics, forecast_data = forecast_result
         
-        if forecast_result:
-            fig, metrics, forecast_data = forecast_result
-            
-            # Store in session state
-            st.session_state.forecast_results[pair_key] = {
-                'fig': fig,
-                'metrics': metrics,
-                'data': forecast_data,
-                'timestamp': datetime.now(),
-                'params': {
-                    'days': forecast_days,
-                    'confidence': confidence
-                }
+        # Store in session state
+        st.session_state.forecast_results[pair_key] = {
+            'fig': fig,
+            'metrics': metrics,
+            'data': forecast_data,
+            'timestamp': datetime.now(),
+            'params': {
+                'days': forecast_days,
+                'confidence': confidence,
+                'model': model_type
             }
+        }
+    
+    # Let the user know a refresh is running and poll until it lands
+    if forecast_executor.pending_keys(pair_key, "prophet"):
+        _render_pending_forecast_notice(pair_key, "prophet", pair_key)
     
     # Display forecast if available
     if pair_key in st.session_state.forecast_results:
@@ -1225,6 +1833,7 @@ def _render_forecast_content(sub):
         # Show a message if no forecast is available yet
         st.info("Waiting for sufficient historical data to generate a forecast. Please try again once the chart data is loaded.")
 
+@profile_component(detail=subscription_label)
 def add_forecast_to_dashboard(sub, use_expander=False):
     """
     Add a forecast section to the currency pair dashboard
@@ -8,6 +8,7 @@ import logging
 from datetime import datetime
 import glob
 from urllib.parse import urlparse, urljoin
+from fx_news.utils import metrics
 
 # Set up logging
 logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -233,6 +234,7 @@ def get_unique_filename(base_filepath):
     return f"{root}_{counter}{ext}"
 
 # Changes to get_latest_timestamp in article_downloader.py
+@metrics.timed("article.latest_timestamp")
 def get_latest_timestamp(folder, symbol):
     """
     Get the latest unix timestamp from existing article files for a symbol
@@ -349,6 +351,7 @@ def update_timestamp_cache(symbol, timestamp, folder):
     except Exception as e:
         logger.error(f"Error updating timestamp cache: {str(e)}")
 
+@metrics.timed("article.download_content")
 def download_article_content(url, headers=None):
     """
     Download the full content of a news article from its URL
@@ -368,20 +371,23 @@ def download_article_content(url, headers=None):
         }
 
     try:
-        time.sleep(random.uniform(0.5, 1.5))
+        with metrics.span("article.crawl_delay"):
+            time.sleep(random.uniform(0.5, 1.5))
 
         # Fix malformed URLs - KEY CHANGE HERE
         url = normalize_yahoo_url(url)
         
         logger.info(f"Downloading article from: {url}")
 
-        response = requests.get(url, headers=headers, timeout=10)
+        with metrics.span("article.fetch"):
+            response = requests.get(url, headers=headers, timeout=10)
 
         if response.status_code != 200:
             logger.error(f"Failed to fetch article content: HTTP {response.status_code}")
             return None
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+        with metrics.span("article.parse"):
+            soup = BeautifulSoup(response.text, 'html.parser')
         
         # Extract unix timestamp from the article
         unix_timestamp = extract_unix_timestamp(soup)
@@ -497,6 +503,7 @@ def download_article_content(url, headers=None):
         logger.error(f"Error downloading article content: {str(e)}")
         return None
 
+@metrics.timed("article.save")
 def save_article_to_file(symbol, article_data, folder="fx_news/scrapers/news/yahoo"):
     try:
         os.makedirs(folder, exist_ok=True)
@@ -557,6 +564,7 @@ def save_article_to_file(symbol, article_data, folder="fx_news/scrapers/news/yah
         logger.error(f"Error saving article to file: {str(e)}")
         return None
     
+@metrics.timed("article.dedupe")
 def is_duplicate_article(title, url, symbol, folder):
     """
     Check if an article is already downloaded by checking for similar titles, URLs, or timestamp
@@ -646,6 +654,7 @@ def is_duplicate_article(title, url, symbol, folder):
         return False, None
     
 # Changes to download_single_article to handle timestamp updates
+@metrics.timed("article.download")
 def download_single_article(symbol, url, folder="fx_news/scrapers/news/yahoo", sentiment_info=None):
     """
     Download and save a single article from its URL with enhanced title extraction
@@ -759,6 +768,7 @@ def download_single_article(symbol, url, folder="fx_news/scrapers/news/yahoo", s
     
     if is_duplicate:
         logger.info(f"Skipping duplicate article: {article_data['title']} (already exists at {existing_file})")
+        metrics.increment("article.duplicate")
         # If we have a file path, return it
         if existing_file:
             return existing_file
@@ -791,6 +801,8 @@ def download_single_article(symbol, url, folder="fx_news/scrapers/news/yahoo", s
     
     # Not a duplicate, save it
     filepath = save_article_to_file(symbol, article_data, folder)
+    if filepath:
+        metrics.increment("article.saved")
     
     # Verify if title was saved properly
     if filepath and (not article_data.get('title') or article_data.get('title') == "Yahoo Finance"):
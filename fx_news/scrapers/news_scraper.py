@@ -4,7 +4,6 @@ import random
 import re
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
-from textblob import TextBlob
 import logging
 import os
 import glob
@@ -13,16 +12,22 @@ from fx_news.scrapers.robots_txt_parser import RobotsTxtParser
 from fx_news.scrapers.analyze_sentiment import analyze_sentiment_with_mistral
 from fx_news.utils.notifications import add_notification
 from fx_news.config.settings import indices
+from fx_news.data.models import NewsItem
 from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
 import backoff
-from transformers import BertTokenizer, BertForSequenceClassification
-import torch
+from fx_news.utils.lazy_imports import lazy_import
+from fx_news.utils import metrics
 from typing import List, Dict, Tuple, Set, Any, Optional, Union
 import streamlit as st
 import os
 import sys
 
+# Heavy NLP libraries are only imported when sentiment analysis actually runs
+torch = lazy_import("torch")
+transformers = lazy_import("transformers")
+textblob = lazy_import("textblob")
+
 # Add the project root directory to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 
@@ -56,8 +61,8 @@ def load_finbert_model():
     global tokenizer, model
     if tokenizer is None or model is None:
         model_name = "yiyanghkust/finbert-tone"
-        tokenizer = BertTokenizer.from_pretrained(model_name)
-        model = BertForSequenceClassification.from_pretrained(model_name)
+        tokenizer = transformers.BertTokenizer.from_pretrained(model_name)
+        model = transformers.BertForSequenceClassification.from_pretrained(model_name)
         
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -883,7 +888,7 @@ def analyze_sentiment(text: str, mode: str = "textblob", api_key: str = None) ->
     
     # Analyze sentiment using TextBlob
     else:            
-        analysis = TextBlob(text)
+        analysis = textblob.TextBlob(text)
         sentiment_score = round(analysis.sentiment.polarity, 2)  # -1 to 1
         
         if sentiment_score > 0.2:
@@ -924,7 +929,8 @@ def format_currency_pair_for_yahoo(base, quote):
     else:
         return f"{base}{quote}%3DX"
 
-def load_news_from_files(symbol: str, folder: str = "fx_news/scrapers/news/yahoo", max_days_old: int = 5, ignore_processed: bool = True) -> List[Dict[str, Any]]:
+@metrics.timed("news.load_cached")
+def load_news_from_files(symbol: str, folder: str = "fx_news/scrapers/news/yahoo", max_days_old: int = 5, ignore_processed: bool = True) -> List[NewsItem]:
     """
     Load previously saved news articles from filesystem with options to bypass filters
     
@@ -935,7 +941,7 @@ def load_news_from_files(symbol: str, folder: str = "fx_news/scrapers/news/yahoo
         ignore_processed: Whether to ignore the processed timestamps check
     
     Returns:
-        List of news items loaded from files
+        List of NewsItem records loaded from files
     """
     import glob
     import logging
@@ -1207,22 +1213,21 @@ def load_news_from_files(symbol: str, folder: str = "fx_news/scrapers/news/yahoo
                 if currency == "UNKNOWN" or currency == symbol.upper():
                     currency = request_pair
             
-            # Create news item
-            news_item = {
-                "title": title,
-                "timestamp": timestamp,
-                "unix_timestamp": file_timestamp,
-                "currency": currency,
-                "currency_pairs": currency_pairs,  # Store as a set for easier matching
-                "source": source,
-                "url": url,
-                "summary": summary,
-                "related_tickers": [],
-                "file_path": file_path,  # Store the file path
-                "sentiment": sentiment_label,
-                "score": sentiment_score,
-                "article_id": article_id  # Include article ID if available
-            }
+            # Create news item (compact record, as kept in the session news caches)
+            news_item = NewsItem(
+                title=title,
+                timestamp=timestamp,
+                unix_timestamp=file_timestamp,
+                currency=currency,
+                currency_pairs=currency_pairs,
+                source=source,
+                url=url,
+                summary=summary,
+                file_path=file_path,  # Store the file path
+                sentiment=sentiment_label,
+                score=sentiment_score,
+                article_id=article_id  # Include article ID if available
+            )
             
             loaded_news.append(news_item)
             logger.info(f"Loaded news item from {file_path}: {title} ({timestamp.isoformat()}) - {sentiment_label} ({sentiment_score}) - Currency: {currency}")
@@ -1234,6 +1239,7 @@ def load_news_from_files(symbol: str, folder: str = "fx_news/scrapers/news/yahoo
     logger.info(f"Loaded {len(loaded_news)} news items for {symbol}")
     return loaded_news
 
+@metrics.timed("news.listing_fetch")
 @backoff.on_exception(
     backoff.expo,
     (requests.exceptions.RequestException, requests.exceptions.Timeout),
@@ -1244,6 +1250,7 @@ def make_request(url: str, headers: Dict[str, str], timeout: int = 10) -> reques
     """Make HTTP request with retry logic"""
     return requests.get(url, headers=headers, timeout=timeout)
 
+@metrics.timed("news.process_item")
 def process_news_item(
     item: Any, 
     symbol: str, 
@@ -1436,6 +1443,8 @@ def process_news_item(
         debug_log.append(f"Error processing news item: {str(e)}")
         return None
 
+# A stage of the app-level refresh (fetch_news / fetch_indices_news), not a refresh of its own
+@metrics.timed("news.scrape_yahoo")
 def scrape_yahoo_finance_news(
     currency_pairs: List[Tuple[str, str]], 
     max_articles: int = 5, 
@@ -1565,7 +1574,8 @@ def scrape_yahoo_finance_news(
             debug_log.append(f"Fetching news for {base}/{quote} from URL: {url}")
             
             # Add a random delay to avoid being blocked
-            time.sleep(random.uniform(0.5, 1.5))
+            with metrics.span("news.crawl_delay"):
+                time.sleep(random.uniform(0.5, 1.5))
             
             # Make request with retry logic
             try:
@@ -1580,7 +1590,8 @@ def scrape_yahoo_finance_news(
                 continue
                 
             # Parse HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
+            with metrics.span("news.listing_parse"):
+                soup = BeautifulSoup(response.text, 'html.parser')
             
             # Find news container (based on the HTML structure)
             news_container = soup.select_one('div[data-testid="news-tabs-container"]')
@@ -1603,6 +1614,7 @@ def scrape_yahoo_finance_news(
                 continue
             
             logger.info(f"Found {len(news_items)} news items for {base}/{quote}")
+            metrics.increment("news.items_listed", len(news_items))
             debug_log.append(f"Found {len(news_items)} news items for {base}/{quote}")
                 
             # Process each news item with a thread pool
@@ -1612,7 +1624,8 @@ def scrape_yahoo_finance_news(
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
                 # Submit all items for processing
                 future_to_item = {
-                    executor.submit(
+                    metrics.submit(
+                        executor,
                         process_news_item, 
                         item, 
                         symbol, 
@@ -1637,6 +1650,7 @@ def scrape_yahoo_finance_news(
                         debug_log.append(f"Error processing news item: {str(e)}")
             
             logger.info(f"Downloaded {new_articles_count} new articles for {base}/{quote}")
+            metrics.increment("news.articles_new", new_articles_count)
             debug_log.append(f"Downloaded {new_articles_count} new articles for {base}/{quote}")
             all_news.extend(pair_news)
         except Exception as e:
@@ -1679,11 +1693,12 @@ def scrape_yahoo_finance_news(
         if news_items_without_sentiment:
             logger.info(f"Running sentiment analysis for {len(news_items_without_sentiment)} news items")
             # Run sentiment analysis with rate limiting
-            analyze_news_sentiment(
-                news_items_without_sentiment, 
-                api_key=sentiment_api_key, 
-                delay_between_requests=1.0  # 1 second delay between requests
-            )
+            with metrics.span("news.sentiment"):
+                analyze_news_sentiment(
+                    news_items_without_sentiment, 
+                    api_key=sentiment_api_key, 
+                    delay_between_requests=1.0  # 1 second delay between requests
+                )
     
     # After all the processing is done and timestamp_cache is updated
     # Update the global_latest_timestamp based on all values in timestamp_cache
@@ -1789,7 +1804,7 @@ def create_mock_news(currencies=None):
     # Add sentiment analysis using TextBlob
     for news in mock_news:
         # Analyze title for sentiment
-        analysis = TextBlob(news["title"] + " " + news["summary"])
+        analysis = textblob.TextBlob(news["title"] + " " + news["summary"])
         news["score"] = round(analysis.sentiment.polarity, 2)  # -1 to 1
         
         if news["score"] > 0.2:
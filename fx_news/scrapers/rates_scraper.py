@@ -13,6 +13,11 @@ import plotly.express as px
 import streamlit as st
 from functools import lru_cache
 
+from fx_news.utils.indicators import get_indicator_set
+from fx_news.utils.downsample import downsample_frame, downsample_indices
+from fx_news.utils.render_profiler import profile_component, pair_label
+from fx_news.scrapers.triangulation import plan_triangulation, triangulate_rates, triangulate_spark, cross_check
+
 # Set up logging
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', 
@@ -30,6 +35,15 @@ FIVE_D_DIR = f"{BASE_DIR}/5d"
 for directory in [YTD_DIR, FIVE_D_DIR]:
     os.makedirs(directory, exist_ok=True)
 
+# Spark endpoint; point it at a local stand-in (see fx_news.apis.market_simulator) for offline runs
+SPARK_URL = os.environ.get("FX_SPARK_URL", "https://query1.finance.yahoo.com/v7/finance/spark")
+
+# Derive FX crosses from USD legs instead of fetching them (set FX_TRIANGULATE=0 to fetch every pair)
+TRIANGULATE_CROSSES = os.environ.get("FX_TRIANGULATE", "1") != "0"
+
+# Also fetch the crosses directly and report triangulated prices that disagree with them
+TRIANGULATION_CROSS_CHECK = os.environ.get("FX_TRIANGULATION_CROSS_CHECK", "0") == "1"
+
 #################################
 # Rate Scraper Functionality
 #################################
@@ -80,7 +94,7 @@ def fetch_spark_data(symbol, range_val, interval):
     Returns:
         JSON response data or None if fetch fails
     """
-    spark_url = f"https://query1.finance.yahoo.com/v7/finance/spark?symbols={symbol}&range={range_val}&interval={interval}&indicators=close&includeTimestamps=true"
+    spark_url = f"{SPARK_URL}?symbols={symbol}&range={range_val}&interval={interval}&indicators=close&includeTimestamps=true"
     logger.debug(f"Fetching from URL: {spark_url}")
     
     headers = get_random_headers()
@@ -261,6 +275,58 @@ def get_blended_rates(currency_pairs):
     
     return blended_rates
 
+def save_triangulated_series(crosses, directory):
+    """
+    Write the spark files of triangulated crosses from the stored files of their legs
+    
+    Args:
+        crosses: Derived pair -> (base leg, quote leg), from plan_triangulation
+        directory: Series directory (YTD_DIR or FIVE_D_DIR)
+    """
+    def read(pair):
+        filename = f"{directory}/{pair[0].lower()}_{pair[1].lower()}.json"
+        if not os.path.exists(filename):
+            return None
+        with open(filename, 'r') as f:
+            return json.load(f)
+    
+    for (base, quote), (base_leg, quote_leg) in crosses.items():
+        try:
+            base_data, quote_data = read(base_leg), read(quote_leg)
+            if base_data is None or quote_data is None:
+                logger.warning(f"Missing leg data to triangulate {base}/{quote} in {directory}")
+                continue
+            
+            cross_data = triangulate_spark((base, quote), base_leg, base_data, quote_leg, quote_data)
+            if cross_data:
+                with open(f"{directory}/{base.lower()}_{quote.lower()}.json", 'w') as f:
+                    json.dump(cross_data, f)
+        except Exception as e:
+            logger.error(f"Error triangulating {base}/{quote} in {directory}: {e}")
+
+def check_triangulated_rates(derived, debug_log):
+    """
+    Fetch triangulated crosses directly and report the ones that deviate
+    
+    Args:
+        derived: Cross quotes from triangulate_rates
+        debug_log: List to append the results to
+    """
+    direct = {}
+    for base, quotes in derived.items():
+        for quote in quotes:
+            data = fetch_spark_data(format_currency_pair_for_yahoo(base, quote), "1d", "1d")
+            if data:
+                meta = data["spark"]["result"][0].get("response", [{}])[0].get("meta", {})
+                direct.setdefault(base, {})[quote] = {"price": meta.get("regularMarketPrice")}
+    
+    for check in cross_check(derived, direct):
+        message = (f"Cross-check {check['pair']}: triangulated {check['derived']:.6f} vs direct "
+                   f"{check['direct']:.6f} ({check['deviation_pct']:.4f}%)")
+        debug_log.append(message)
+        if not check["ok"]:
+            logger.warning(message)
+
 def scrape_yahoo_finance_rates(currency_pairs, fetch_ytd=False, debug_log=None):
     """
     Scrape currency exchange rates from Yahoo Finance
@@ -275,15 +341,34 @@ def scrape_yahoo_finance_rates(currency_pairs, fetch_ytd=False, debug_log=None):
     """
     if debug_log is None:
         debug_log = []
+    
+    # Fetch USD legs instead of crosses; the crosses are derived from them below
+    fetch_pairs, crosses = currency_pairs, {}
+    if TRIANGULATE_CROSSES:
+        plan = plan_triangulation(currency_pairs)
+        fetch_pairs, crosses = plan["fetch"], plan["crosses"]
+        if crosses:
+            debug_log.append(f"Triangulating {len(crosses)} crosses: fetching {len(fetch_pairs)} symbols "
+                             f"for {len(set(currency_pairs))} pairs")
         
     # Fetch YTD data if requested (should be done once daily)
     if fetch_ytd:
         debug_log.append("Fetching YTD data for all currency pairs")
-        fetch_and_save_ytd_data(currency_pairs)
+        fetch_and_save_ytd_data(fetch_pairs)
+        save_triangulated_series(crosses, YTD_DIR)
     
     # Always fetch 5-day data for real-time rates
     debug_log.append("Fetching 5-day data for all currency pairs")
-    rates = fetch_and_save_five_day_data(currency_pairs)
+    rates = fetch_and_save_five_day_data(fetch_pairs)
+    
+    if crosses:
+        derived = triangulate_rates(crosses, rates)
+        for base, quotes in derived.items():
+            rates.setdefault(base, {}).update(quotes)
+        save_triangulated_series(crosses, FIVE_D_DIR)
+        
+        if TRIANGULATION_CROSS_CHECK:
+            check_triangulated_rates(derived, debug_log)
     
     # If we're missing any rates, try to blend with YTD data
     for base, quote in currency_pairs:
@@ -415,7 +500,74 @@ def load_five_day_chart_data(base, quote):
     
     return None
 
-def create_ytd_chart(base, quote, height=400):
+def get_chart_indicators(base, quote, series, df):
+    """
+    Get the technical indicators of a stored chart series
+    
+    Args:
+        base: Base currency code
+        quote: Quote currency code
+        series: Series name ('5d' or 'ytd')
+        df: Chart DataFrame from load_five_day_chart_data or load_ytd_chart_data
+        
+    Returns:
+        IndicatorSet aligned with the non-empty rows of df, or None if df has no rates
+    """
+    if df is None or df.empty:
+        return None
+    valid = df.dropna(subset=['rate'])
+    if valid.empty:
+        return None
+    return get_indicator_set(f"{base.lower()}_{quote.lower()}", series, valid['timestamp'].values, valid['rate'].values)
+
+# Overlays offered on the 5-day and YTD charts
+INDICATOR_OVERLAYS = ["SMA 20", "SMA 50", "EMA 20", "Bollinger Bands"]
+
+def _add_indicator_overlays(fig, indicators, overlays):
+    """Add the selected indicator overlays to a chart figure"""
+    if indicators is None or not overlays:
+        return
+    
+    # Draw the overlays at the same resolution as the rate line
+    keep = downsample_indices(indicators.timestamps.values, indicators.rates.values)
+    x = pd.to_datetime(indicators.timestamps.values[keep])
+    lines = {
+        "SMA 20": ("sma_20", "#FFC107"),
+        "SMA 50": ("sma_50", "#FF5722"),
+        "EMA 20": ("ema_20", "#E040FB"),
+    }
+    for overlay in overlays:
+        if overlay in lines:
+            name, color = lines[overlay]
+            fig.add_trace(go.Scatter(
+                x=x,
+                y=indicators.get(name)[keep],
+                mode='lines',
+                name=overlay,
+                line=dict(color=color, width=1.5),
+                hovertemplate=f'%{{x}}<br>{overlay}: %{{y:.4f}}<extra></extra>'
+            ))
+        elif overlay == "Bollinger Bands":
+            fig.add_trace(go.Scatter(
+                x=x,
+                y=indicators.get("bb_upper")[keep],
+                mode='lines',
+                name='BB Upper',
+                line=dict(color='rgba(158, 158, 158, 0.8)', width=1, dash='dot'),
+                hovertemplate='%{x}<br>BB Upper: %{y:.4f}<extra></extra>'
+            ))
+            fig.add_trace(go.Scatter(
+                x=x,
+                y=indicators.get("bb_lower")[keep],
+                mode='lines',
+                name='BB Lower',
+                line=dict(color='rgba(158, 158, 158, 0.8)', width=1, dash='dot'),
+                fill='tonexty',
+                fillcolor='rgba(158, 158, 158, 0.08)',
+                hovertemplate='%{x}<br>BB Lower: %{y:.4f}<extra></extra>'
+            ))
+
+def create_ytd_chart(base, quote, height=400, overlays=None):
     """
     Create and display a YTD chart for the given currency pair
     
@@ -423,6 +575,7 @@ def create_ytd_chart(base, quote, height=400):
         base: Base currency code
         quote: Quote currency code
         height: Chart height in pixels
+        overlays: Indicator overlays to draw (see INDICATOR_OVERLAYS)
         
     Returns:
         Plotly figure object or None if chart creation fails
@@ -437,16 +590,21 @@ def create_ytd_chart(base, quote, height=400):
         # Create the figure
         fig = go.Figure()
         
-        # Add trace for historical data
+        # Add trace for historical data, reduced to what the chart width can show
+        plot_df = downsample_frame(df)
         fig.add_trace(go.Scatter(
-            x=df['timestamp'],
-            y=df['rate'],
+            x=plot_df['timestamp'],
+            y=plot_df['rate'],
             mode='lines',
             name='YTD',
             line=dict(color='#4D9BF5', width=2),
             hovertemplate='%{x}<br>Rate: %{y:.4f}<extra></extra>'
         ))
         
+        # Add indicator overlays
+        if overlays:
+            _add_indicator_overlays(fig, get_chart_indicators(base, quote, "ytd", df), overlays)
+        
         # Add chart title
         fig.update_layout(
             title=f"{base}/{quote} Year-to-Date Performance",
@@ -544,7 +702,7 @@ def create_ytd_chart(base, quote, height=400):
         logger.error(f"Error creating YTD chart for {base}/{quote}: {e}")
         return None
 
-def create_five_day_chart(base, quote, height=400):
+def create_five_day_chart(base, quote, height=400, overlays=None):
     """
     Create and display a 5-day chart for the given currency pair
     
@@ -552,6 +710,7 @@ def create_five_day_chart(base, quote, height=400):
         base: Base currency code
         quote: Quote currency code
         height: Chart height in pixels
+        overlays: Indicator overlays to draw (see INDICATOR_OVERLAYS)
         
     Returns:
         Plotly figure object or None if chart creation fails
@@ -566,16 +725,21 @@ def create_five_day_chart(base, quote, height=400):
         # Create the figure
         fig = go.Figure()
         
-        # Add trace for historical data
+        # Add trace for historical data, reduced to what the chart width can show
+        plot_df = downsample_frame(df)
         fig.add_trace(go.Scatter(
-            x=df['timestamp'],
-            y=df['rate'],
+            x=plot_df['timestamp'],
+            y=plot_df['rate'],
             mode='lines',
             name='5-Day',
             line=dict(color='#00FF00', width=2),
             hovertemplate='%{x}<br>Rate: %{y:.4f}<extra></extra>'
         ))
         
+        # Add indicator overlays
+        if overlays:
+            _add_indicator_overlays(fig, get_chart_indicators(base, quote, "5d", df), overlays)
+        
         # Add chart title
         fig.update_layout(
             title=f"{base}/{quote} 5-Day Performance",
@@ -689,6 +853,7 @@ def create_five_day_chart(base, quote, height=400):
         logger.error(f"Error creating 5-day chart for {base}/{quote}: {e}")
         return None
 
+@profile_component(detail=pair_label)
 def display_combined_charts(base, quote):
     """
     Display both YTD and 5-day charts for a currency pair in tabs
@@ -697,12 +862,20 @@ def display_combined_charts(base, quote):
         base: Base currency code
         quote: Quote currency code
     """
+    # Indicator overlays shared by both timeframes
+    overlays = st.multiselect(
+        "Indicator overlays",
+        INDICATOR_OVERLAYS,
+        default=[],
+        key=f"chart_overlays_{base.lower()}_{quote.lower()}"
+    )
+    
     # Create tabs for different timeframes
     five_day_tab, ytd_tab = st.tabs(["5-Day","Year-to-Date"])
        
     with five_day_tab:
         # Create and display 5-day chart
-        five_day_fig = create_five_day_chart(base, quote)
+        five_day_fig = create_five_day_chart(base, quote, overlays=overlays)
         if five_day_fig:
             st.plotly_chart(five_day_fig, use_container_width=True)
             
@@ -796,13 +969,11 @@ def display_combined_charts(base, quote):
                     
                     # Calculate short-term trend using moving averages
                     if len(five_day_df) > 10:
-                        # Add simple moving averages
-                        five_day_df['SMA10'] = five_day_df['rate'].rolling(window=10).mean()
-                        five_day_df['SMA30'] = five_day_df['rate'].rolling(window=30).mean()
-                        
-                        # Determine trend based on SMA crossovers
-                        latest_sma10 = five_day_df['SMA10'].iloc[-1]
-                        latest_sma30 = five_day_df['SMA30'].iloc[-1]
+                        # Latest moving averages from the indicator engine
+                        five_day_indicators = get_chart_indicators(base, quote, "5d", five_day_df).latest()
+                        latest_sma10 = five_day_indicators['sma_10']
+                        latest_sma30 = five_day_indicators['sma_30']
+                        latest_rsi = five_day_indicators['rsi']
                         
                         if latest_sma10 > latest_sma30:
                             intraday_trend = "Bullish"
@@ -831,12 +1002,16 @@ def display_combined_charts(base, quote):
                                 <span style="color:white;">Momentum:</span>
                                 <span style="color:{momentum_color};">{momentum_str}</span>
                             </div>
-                            <div style="display:flex; justify-content:space-between;">
+                            <div style="display:flex; justify-content:space-between; margin-bottom:5px;">
                                 <span style="color:white;">Last Hour:</span>
                                 <span style="color:{momentum_color};">
                                     {'+' if momentum > 0 else ''}{momentum:.2f}%
                                 </span>
                             </div>
+                            <div style="display:flex; justify-content:space-between;">
+                                <span style="color:white;">RSI (14):</span>
+                                <span style="color:white;">{latest_rsi:.1f}</span>
+                            </div>
                         </div>
                         """, unsafe_allow_html=True)
                     else:
@@ -848,7 +1023,7 @@ def display_combined_charts(base, quote):
 
     with ytd_tab:
         # Create and display YTD chart
-        ytd_fig = create_ytd_chart(base, quote)
+        ytd_fig = create_ytd_chart(base, quote, overlays=overlays)
         if ytd_fig:
             st.plotly_chart(ytd_fig, use_container_width=True)
             
@@ -928,13 +1103,10 @@ def display_combined_charts(base, quote):
                     st.markdown("### Trend Analysis")
                     # Calculate monthly performance
                     if len(ytd_df) > 20:
-                        # Add simple moving averages
-                        ytd_df['SMA20'] = ytd_df['rate'].rolling(window=20).mean()
-                        ytd_df['SMA50'] = ytd_df['rate'].rolling(window=50).mean()
-                        
-                        # Determine trend based on SMA crossovers
-                        latest_sma20 = ytd_df['SMA20'].iloc[-1]
-                        latest_sma50 = ytd_df['SMA50'].iloc[-1]
+                        # Latest moving averages from the indicator engine
+                        ytd_indicators = get_chart_indicators(base, quote, "ytd", ytd_df).latest()
+                        latest_sma20 = ytd_indicators['sma_20']
+                        latest_sma50 = ytd_indicators['sma_50']
                         
                         if latest_sma20 > latest_sma50:
                             trend = "Bullish"
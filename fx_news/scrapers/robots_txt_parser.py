@@ -3,6 +3,7 @@ import logging
 import time
 import random
 from urllib.parse import urlparse, urljoin
+from fx_news.utils import metrics
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -21,6 +22,7 @@ class RobotsTxtParser:
         self.cache_expiry = {}  # Store when the cache should expire
         self.CACHE_DURATION = 86400  # Cache duration in seconds (24 hours)
     
+    @metrics.timed("robots.fetch")
     def fetch_robots_txt(self, url):
         """
         Fetch the robots.txt file for a given URL's domain.
@@ -76,6 +78,7 @@ class RobotsTxtParser:
             logger.error(f"Error fetching robots.txt: {str(e)}")
             return ""
     
+    @metrics.timed("robots.check")
     def is_path_allowed(self, url):
         """
         Check if a specific URL path is allowed according to robots.txt rules.
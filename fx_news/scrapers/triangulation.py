@@ -0,0 +1,292 @@
+"""
+Cross-rate triangulation for FX subscriptions.
+Crosses such as EUR/GBP or AUD/CAD are derived from USD legs (EUR/USD, GBP/USD, USD/CAD, ...)
+instead of being fetched as their own Yahoo symbols, so a refresh needs roughly one spark request
+per currency rather than one per pair.
+"""
+import copy
+import itertools
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from fx_news.config.settings import fx_currencies
+
+logger = logging.getLogger("triangulation")
+logger.setLevel(logging.WARNING)
+
+ANCHOR_CURRENCY = "USD"
+
+# Currencies conventionally quoted as CCY/USD; every other leg is fetched as USD/CCY
+USD_QUOTED_CURRENCIES = {"EUR", "GBP", "AUD", "NZD", "XAG"}
+
+# Crosses off by more than this from a direct quote are reported by the cross-check
+CROSS_CHECK_TOLERANCE_PCT = 0.05
+
+# Components with more uncovered currencies than this are planned as a whole instead of exactly
+MAX_EXACT_CURRENCIES = 12
+
+Pair = Tuple[str, str]
+
+
+def is_fx_pair(base: str, quote: str) -> bool:
+    """Whether a pair is a plain currency pair that can be triangulated (not crypto or an index)."""
+    return base.upper() in fx_currencies and quote.upper() in fx_currencies and base.upper() != quote.upper()
+
+
+def anchor_leg(currency: str) -> Pair:
+    """USD leg fetched for a currency, in market convention (EUR -> EUR/USD, JPY -> USD/JPY)."""
+    currency = currency.upper()
+    if currency in USD_QUOTED_CURRENCIES:
+        return (currency, ANCHOR_CURRENCY)
+    return (ANCHOR_CURRENCY, currency)
+
+
+def plan_triangulation(currency_pairs: List[Pair]) -> Dict:
+    """
+    Choose which pairs to fetch and which to derive.
+
+    Subscribed USD pairs are legs already. For every group of connected crosses the plan picks
+    the set of extra legs that minimises requests: a cross is derived when both its currencies
+    have a leg, and fetched directly otherwise. When deriving saves nothing the cross is fetched,
+    since a direct quote is exact.
+
+    Args:
+        currency_pairs: List of (base, quote) tuples
+
+    Returns:
+        dict: 'fetch' (pairs to request, in order), 'legs' (currency -> leg pair) and
+        'crosses' (derived pair -> (base leg, quote leg))
+    """
+    pairs = [(b.upper(), q.upper()) for b, q in currency_pairs]
+    legs: Dict[str, Pair] = {}
+    for base, quote in pairs:
+        if is_fx_pair(base, quote) and ANCHOR_CURRENCY in (base, quote):
+            currency = quote if base == ANCHOR_CURRENCY else base
+            legs.setdefault(currency, (base, quote))
+
+    cross_pairs = [p for p in dict.fromkeys(pairs) if is_fx_pair(*p) and ANCHOR_CURRENCY not in p]
+
+    # Group the crosses into connected components over their currencies
+    component_of: Dict[str, int] = {}
+    components: List[set] = []
+    for base, quote in cross_pairs:
+        ids = {component_of[c] for c in (base, quote) if c in component_of}
+        merged = {base, quote}.union(*(components[i] for i in ids))
+        components.append(merged)
+        for currency in merged:
+            component_of[currency] = len(components) - 1
+
+    new_legs = set()
+    for cid in set(component_of.values()):
+        currencies = components[cid]
+        edges = [p for p in cross_pairs if p[0] in currencies]
+        new_legs |= _choose_legs(currencies, edges, set(legs))
+
+    for currency in sorted(new_legs):
+        legs[currency] = anchor_leg(currency)
+
+    crosses = {p: (legs[p[0]], legs[p[1]]) for p in cross_pairs if p[0] in legs and p[1] in legs}
+
+    fetch = [p for p in dict.fromkeys(pairs) if p not in crosses]
+    fetch += [leg for leg in legs.values() if leg not in fetch]
+
+    if crosses:
+        logger.info(f"Triangulating {len(crosses)} crosses from {len(legs)} USD legs "
+                    f"({len(fetch)} requests instead of {len(set(pairs))})")
+    return {"fetch": fetch, "legs": legs, "crosses": crosses}
+
+
+def _choose_legs(currencies: set, edges: List[Pair], covered: set) -> set:
+    """Extra legs minimising (legs added + crosses fetched directly) for one component."""
+    free = sorted(currencies - covered)
+
+    def cost(chosen: set) -> Tuple[int, int]:
+        have = covered | chosen
+        direct = sum(1 for b, q in edges if b not in have or q not in have)
+        return (len(chosen) + direct, len(chosen))
+
+    if len(free) > MAX_EXACT_CURRENCIES:
+        everything = set(free)
+        return everything if cost(everything) < cost(set()) else set()
+
+    best, best_cost = set(), cost(set())
+    for size in range(1, len(free) + 1):
+        for combo in itertools.combinations(free, size):
+            chosen = set(combo)
+            combo_cost = cost(chosen)
+            if combo_cost < best_cost:
+                best, best_cost = chosen, combo_cost
+    return best
+
+
+def _usd_value(leg: Pair, values):
+    """Dollar value of one unit of the leg's non-USD currency, given leg prices."""
+    values = np.asarray(values, dtype=np.float64)
+    if leg[1] == ANCHOR_CURRENCY:
+        return values
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 1.0 / values
+
+
+def triangulate_rates(crosses: Dict[Pair, Tuple[Pair, Pair]], rates: Dict) -> Dict:
+    """
+    Derive the price and previous close of every cross from the fetched leg quotes.
+
+    Args:
+        crosses: Derived pair -> (base leg, quote leg), from plan_triangulation
+        rates: Fetched quotes as {BASE: {QUOTE: {'price', 'previous_close'}}}
+
+    Returns:
+        dict: Cross quotes in the same nested format
+    """
+    if not crosses:
+        return {}
+
+    def leg_quotes(leg):
+        quote = rates.get(leg[0], {}).get(leg[1]) or {}
+        return [quote.get("price"), quote.get("previous_close")]
+
+    # One (crosses x [price, previous close]) matrix per side, combined in a single division
+    names = list(crosses)
+    base_side = np.array([_usd_value(crosses[p][0], _as_float(leg_quotes(crosses[p][0]))) for p in names])
+    quote_side = np.array([_usd_value(crosses[p][1], _as_float(leg_quotes(crosses[p][1]))) for p in names])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        derived = base_side / quote_side
+
+    result: Dict[str, Dict] = {}
+    for (base, quote), (price, previous_close) in zip(names, derived):
+        if not np.isfinite(price):
+            continue
+        result.setdefault(base, {})[quote] = {
+            "price": float(price),
+            "previous_close": float(previous_close) if np.isfinite(previous_close) else None,
+            "triangulated": True,
+        }
+    return result
+
+
+def _as_float(values: List[Optional[float]]) -> List[float]:
+    return [np.nan if v is None else v for v in values]
+
+
+def _spark_series(data: Dict):
+    response = data["spark"]["result"][0]["response"][0]
+    timestamps = np.asarray(response.get("timestamp", []), dtype=np.int64)
+    closes = np.asarray(_as_float(response.get("indicators", {}).get("quote", [{}])[0].get("close", [])),
+                        dtype=np.float64)
+    return response, timestamps, closes
+
+
+def triangulate_spark(cross: Pair, base_leg: Pair, base_data: Dict, quote_leg: Pair, quote_data: Dict) -> Optional[Dict]:
+    """
+    Build a spark payload for a cross from the payloads of its two legs.
+
+    The quote leg is aligned to the base leg's timestamps with an as-of join (its latest
+    close at or before each bar, if no older than two of its bars).
+
+    Args:
+        cross: (base, quote) of the derived pair
+        base_leg: Leg of the cross's base currency
+        base_data: Spark payload of base_leg
+        quote_leg: Leg of the cross's quote currency
+        quote_data: Spark payload of quote_leg
+
+    Returns:
+        dict: Spark payload in Yahoo's format, readable by the chart loaders, or None
+    """
+    try:
+        base_response, base_ts, base_close = _spark_series(base_data)
+        quote_response, quote_ts, quote_close = _spark_series(quote_data)
+    except (KeyError, IndexError, TypeError):
+        return None
+    if not len(base_ts) or not len(quote_ts) or len(base_ts) != len(base_close) or len(quote_ts) != len(quote_close):
+        return None
+
+    position = np.searchsorted(quote_ts, base_ts, side="right") - 1
+    matched = position >= 0
+    max_lag = 2 * float(np.median(np.diff(quote_ts))) if len(quote_ts) > 1 else np.inf
+    safe_position = np.maximum(position, 0)
+    matched &= (base_ts - quote_ts[safe_position]) <= max_lag
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rates = _usd_value(base_leg, base_close) / _usd_value(quote_leg, quote_close[safe_position])
+    rates = np.where(matched & np.isfinite(rates), rates, np.nan)
+    keep = ~np.isnan(rates)
+    if not keep.any():
+        return None
+
+    base_meta, quote_meta = base_response.get("meta", {}), quote_response.get("meta", {})
+    meta_quotes = {
+        "price": ("regularMarketPrice", "regularMarketPrice"),
+        "previous_close": ("previousClose", "previousClose"),
+        "chart_previous_close": ("chartPreviousClose", "chartPreviousClose"),
+    }
+    derived = {}
+    for name, (base_key, quote_key) in meta_quotes.items():
+        b, q = base_meta.get(base_key), quote_meta.get(quote_key)
+        derived[name] = (float(_usd_value(base_leg, b) / _usd_value(quote_leg, q))
+                         if b is not None and q is not None else None)
+
+    base, quote = cross
+    symbol = f"{base}{quote}=X"
+    meta = {
+        k: v for k, v in copy.deepcopy(base_meta).items()
+        if k not in ("fiftyTwoWeekHigh", "fiftyTwoWeekLow", "regularMarketDayHigh", "regularMarketDayLow")
+    }
+    meta.update({
+        "currency": quote,
+        "symbol": symbol,
+        "longName": f"{base}/{quote}",
+        "shortName": f"{base}/{quote}",
+        "regularMarketPrice": derived["price"],
+        "previousClose": derived["previous_close"],
+        "chartPreviousClose": derived["chart_previous_close"],
+        "regularMarketTime": max(base_meta.get("regularMarketTime") or 0, quote_meta.get("regularMarketTime") or 0),
+        "triangulatedFrom": [base_meta.get("symbol"), quote_meta.get("symbol")],
+    })
+
+    return {
+        "spark": {
+            "result": [{
+                "symbol": symbol,
+                "response": [{
+                    "meta": meta,
+                    "timestamp": base_ts[keep].tolist(),
+                    "indicators": {"quote": [{"close": np.round(rates[keep], 6).tolist()}]},
+                }],
+            }],
+            "error": None,
+        }
+    }
+
+
+def cross_check(derived: Dict, direct: Dict, tolerance_pct: float = CROSS_CHECK_TOLERANCE_PCT) -> List[Dict]:
+    """
+    Compare triangulated prices with directly fetched ones.
+
+    Args:
+        derived: Cross quotes from triangulate_rates
+        direct: Directly fetched quotes in the same format
+        tolerance_pct: Largest accepted deviation in percent
+
+    Returns:
+        list: One dict per compared cross with 'pair', 'derived', 'direct', 'deviation_pct'
+        and 'ok'
+    """
+    checks = []
+    for base, quotes in derived.items():
+        for quote, data in quotes.items():
+            direct_price = direct.get(base, {}).get(quote, {}).get("price")
+            if direct_price is None or data.get("price") is None:
+                continue
+            deviation = abs(data["price"] / direct_price - 1) * 100
+            checks.append({
+                "pair": f"{base}/{quote}",
+                "derived": data["price"],
+                "direct": direct_price,
+                "deviation_pct": deviation,
+                "ok": deviation <= tolerance_pct,
+            })
+    return checks
@@ -0,0 +1,193 @@
+"""
+Threshold alert engine.
+Evaluates every alert rule of every subscribed pair in one vectorized pass per tick, firing only
+when a rule crosses into breach (edge-triggered), re-arming once the value recovers past a
+hysteresis band, and holding each rule quiet for a cooldown after it fires.
+"""
+import math
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Rule types, one column each in the state matrices
+RULE_PERCENT_MOVE = "percent_move"
+RULE_LEVEL_ABOVE = "level_above"
+RULE_LEVEL_BELOW = "level_below"
+RULE_VOLATILITY_SPIKE = "volatility_spike"
+RULES = [RULE_PERCENT_MOVE, RULE_LEVEL_ABOVE, RULE_LEVEL_BELOW, RULE_VOLATILITY_SPIKE]
+
+# A percent-move rule re-arms once the move falls back below this share of its threshold
+PERCENT_REARM_RATIO = 0.8
+
+# A level rule re-arms once the rate is this far (in %) back on the other side of the level
+LEVEL_REARM_PCT = 0.05
+
+# A tick move this many standard deviations from the recent moves is a volatility spike ...
+SPIKE_SIGMA = 4.0
+
+# ... and the rule re-arms once moves are back under this many
+SPIKE_REARM_SIGMA = 2.0
+
+# Decay of the running variance of tick returns used by the spike rule
+SPIKE_VARIANCE_ALPHA = 0.1
+
+# Ticks of returns needed before spikes are reported
+SPIKE_WARMUP_TICKS = 10
+
+# Minimum time between two alerts of the same rule and pair
+ALERT_COOLDOWN_SECONDS = 300
+
+
+class AlertEngine:
+    """Edge-triggered alert state for many pairs and rules, updated once per tick."""
+
+    def __init__(self, cooldown: float = ALERT_COOLDOWN_SECONDS):
+        self.cooldown = cooldown
+        self.pair_keys: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._armed = np.ones((0, len(RULES)), dtype=bool)
+        self._last_fired = np.full((0, len(RULES)), -np.inf)
+        self._last_rate = np.full(0, np.nan)
+        self._return_var = np.full(0, np.nan)
+        self._return_count = np.zeros(0)
+
+    def sync_pairs(self, pair_keys: Iterable[str]) -> None:
+        """
+        Match the state rows to the current subscriptions, keeping the state of existing pairs.
+
+        Args:
+            pair_keys: Pair keys (e.g., 'eur_usd') in display order
+        """
+        pair_keys = list(dict.fromkeys(pair_keys))
+        if pair_keys == self.pair_keys:
+            return
+
+        rows = np.array([self._index.get(k, -1) for k in pair_keys], dtype=np.int64)
+        known = rows >= 0
+
+        def take(values: np.ndarray, fill) -> np.ndarray:
+            out = np.full((len(pair_keys),) + values.shape[1:], fill, dtype=values.dtype)
+            out[known] = values[rows[known]]
+            return out
+
+        self._armed = take(self._armed, True)
+        self._last_fired = take(self._last_fired, -np.inf)
+        self._last_rate = take(self._last_rate, np.nan)
+        self._return_var = take(self._return_var, np.nan)
+        self._return_count = take(self._return_count, 0.0)
+        self.pair_keys = pair_keys
+        self._index = {k: i for i, k in enumerate(pair_keys)}
+
+    def evaluate(self, current: np.ndarray, reference: np.ndarray, thresholds: np.ndarray,
+                 above: np.ndarray, below: np.ndarray, now: Optional[float] = None) -> List[Dict]:
+        """
+        Evaluate every rule for every pair on one tick.
+
+        All arrays are aligned with pair_keys; NaN disables a rule for a pair (no rate, no
+        reference, no level set).
+
+        Args:
+            current: Current rate per pair
+            reference: Reference rate per pair (previous close or last rate)
+            thresholds: Percent-move threshold per pair
+            above: Level the rate must rise to, per pair
+            below: Level the rate must fall to, per pair
+            now: Tick time in seconds (default: time.time())
+
+        Returns:
+            list: One dict per fired alert with 'pair_key', 'rule', 'rate' and 'value'
+            (the percent move, level or move in sigmas that triggered it)
+        """
+        now = time.time() if now is None else now
+        n = len(self.pair_keys)
+        breach = np.zeros((n, len(RULES)), dtype=bool)
+        recovered = np.zeros((n, len(RULES)), dtype=bool)
+        values = np.full((n, len(RULES)), np.nan)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            move = (current - reference) / reference * 100
+            abs_move = np.abs(move)
+            col = RULES.index(RULE_PERCENT_MOVE)
+            breach[:, col] = abs_move > thresholds
+            recovered[:, col] = abs_move < thresholds * PERCENT_REARM_RATIO
+            values[:, col] = move
+
+            col = RULES.index(RULE_LEVEL_ABOVE)
+            breach[:, col] = current >= above
+            recovered[:, col] = current < above * (1 - LEVEL_REARM_PCT / 100)
+            values[:, col] = above
+
+            col = RULES.index(RULE_LEVEL_BELOW)
+            breach[:, col] = current <= below
+            recovered[:, col] = current > below * (1 + LEVEL_REARM_PCT / 100)
+            values[:, col] = below
+
+            # Tick return against the running variance of the previous returns
+            tick_return = np.log(current / self._last_rate)
+            sigmas = np.abs(tick_return) / np.sqrt(self._return_var)
+            warm = self._return_count >= SPIKE_WARMUP_TICKS
+            col = RULES.index(RULE_VOLATILITY_SPIKE)
+            breach[:, col] = warm & (sigmas > SPIKE_SIGMA)
+            recovered[:, col] = warm & (sigmas < SPIKE_REARM_SIGMA)
+            values[:, col] = sigmas
+
+        self._update_variance(tick_return, current)
+
+        # Rules that have recovered arm again; armed rules in breach fire unless cooling down
+        self._armed |= recovered
+        fire = breach & self._armed & (now - self._last_fired >= self.cooldown)
+        self._armed &= ~breach
+        self._last_fired[fire] = now
+
+        alerts = []
+        for row, col in zip(*np.nonzero(fire)):
+            alerts.append({
+                "pair_key": self.pair_keys[row],
+                "rule": RULES[col],
+                "rate": float(current[row]),
+                "value": float(values[row, col]),
+            })
+        return alerts
+
+    def _update_variance(self, tick_return: np.ndarray, current: np.ndarray) -> None:
+        valid = np.isfinite(tick_return) & (tick_return != 0)
+        squared = np.where(valid, tick_return ** 2, np.nan)
+        first = valid & np.isnan(self._return_var)
+        self._return_var = np.where(first, squared, self._return_var)
+        update = valid & ~first
+        self._return_var = np.where(
+            update, (1 - SPIKE_VARIANCE_ALPHA) * self._return_var + SPIKE_VARIANCE_ALPHA * squared, self._return_var
+        )
+        self._return_count += valid
+        self._last_rate = np.where(np.isnan(current), self._last_rate, current)
+
+
+def format_alert(alert: Dict, base: str, quote: str, threshold: Optional[float] = None) -> str:
+    """
+    Notification text for a fired alert.
+
+    Args:
+        alert: Alert from AlertEngine.evaluate
+        base: Base currency code
+        quote: Quote currency code
+        threshold: Percent-move threshold of the pair
+
+    Returns:
+        str: Message for add_notification
+    """
+    pair = f"{base}/{quote}"
+    rule, value = alert["rule"], alert["value"]
+    if rule == RULE_PERCENT_MOVE:
+        direction = "increased" if value > 0 else "decreased"
+        return f"{pair} {direction} by {abs(value):.2f}% (threshold: {threshold}%)"
+    if rule == RULE_LEVEL_ABOVE:
+        return f"{pair} rose to {alert['rate']:.4f} (above {value:.4f})"
+    if rule == RULE_LEVEL_BELOW:
+        return f"{pair} fell to {alert['rate']:.4f} (below {value:.4f})"
+    return f"{pair} volatility spike: {value:.1f}σ move to {alert['rate']:.4f}"
+
+
+def optional_level(value) -> float:
+    """Level from a subscription field; None and non-positive values disable the rule."""
+    return float(value) if value is not None and value > 0 else math.nan
@@ -14,6 +14,7 @@ from fx_news.data.models import EconomicEvent
 from fx_news.utils.notifications import add_notification
 from fx_news.scrapers.economic_calendar_scraper import scrape_investing_economic_calendar, create_mock_economic_events, get_economic_events_for_currency
 from fx_news.services.crypto_service import fetch_all_crypto_events
+from fx_news.utils.render_profiler import profile_component, pair_label
 
 logger = logging.getLogger("events_service")
 
@@ -109,6 +110,7 @@ def render_crypto_event_card(event, highlight_coins=None):
     """
     st.markdown(card_html, unsafe_allow_html=True)
 
+@profile_component(detail=pair_label)
 def display_economic_calendar_for_currency_pair(base, quote, debug_log=None):
     """
     Display economic calendar for a currency pair in a tab interface,
@@ -16,8 +16,10 @@ from bs4 import BeautifulSoup
 import requests
 from fx_news.scrapers.news_scraper import scrape_yahoo_finance_news, create_mock_news, analyze_news_sentiment, load_news_from_files, scrape_indices_news
 from fx_news.scrapers.article_downloader import is_timestamp_processed
-from fx_news.data.models import NewsItem
+from fx_news.data.models import (NewsItem, compact_news, newest_first,
+                                  MARKET_FX, MARKET_CRYPTO, MARKET_INDICES, MARKET_GENERAL)
 from fx_news.utils.notifications import add_notification
+from fx_news.utils import metrics
 import gc
 
 # To Do FT 19th MArch
@@ -261,6 +263,7 @@ def reset_news_session_state():
     return "Session state reset complete!"
 
 
+@metrics.timed_refresh("news")
 def fetch_news(currencies: List[str] = None, use_mock_fallback: bool = True, 
               force: bool = False, page: int = 1, items_per_page: int = 20) -> List[NewsItem]:
     """
@@ -382,6 +385,7 @@ def fetch_news(currencies: List[str] = None, use_mock_fallback: bool = True,
             force_refresh=force
         )
         
+        scraped_news = compact_news(scraped_news)
         logger.info(f"Scraped {len(scraped_news)} new articles from Yahoo Finance")
         
     except Exception as e:
@@ -465,14 +469,14 @@ def merge_news(new_items, existing_news, market_cached_news):
         market_cached_news: Market-specific cached news items
         
     Returns:
-        List of merged news items with duplicates removed
+        List of merged NewsItem records with duplicates removed
     """
     merged_news = []
     seen_ids = set()
     
     # Add existing cached news first (both general and market-specific)
     for news_sources in [existing_news, market_cached_news]:
-        for item in news_sources:
+        for item in compact_news(news_sources):
             # Try to extract or create a unique ID for each item
             item_id = None
             
@@ -497,7 +501,7 @@ def merge_news(new_items, existing_news, market_cached_news):
                 seen_ids.add(item_id)
     
     # Then add new items, avoiding duplicates
-    for item in new_items:
+    for item in compact_news(new_items):
         # Try to extract or create a unique ID for each item
         item_id = None
         
@@ -522,19 +526,17 @@ def merge_news(new_items, existing_news, market_cached_news):
             seen_ids.add(item_id)
     
     # Sort by timestamp (newest first)
-    merged_news.sort(key=lambda x: x.get('timestamp', datetime.now()), reverse=True)
-    
-    return merged_news
+    return newest_first(merged_news)
 
 def process_news(news_items):
     """
     Process and categorize news items by market type, with robust error handling.
     
     Args:
-        news_items: List of news items to process
+        news_items: List of news items (dicts or NewsItem records) to process
         
     Returns:
-        Dictionary with categorized news
+        Dictionary with categorized NewsItem records
     """
     import streamlit as st
     from datetime import datetime
@@ -562,6 +564,8 @@ def process_news(news_items):
         
         return empty_result
     
+    news_items = compact_news(news_items)
+    
     # Try to add article IDs, but don't fail if it's not possible
     try:
         for item in news_items:
@@ -583,14 +587,12 @@ def process_news(news_items):
     tagged_news = tag_news_by_market_type(news_items)
     
     # Separate news based on market type
-    fx_news = [item for item in tagged_news if item.get('is_fx', False)]
-    crypto_news = [item for item in tagged_news if item.get('is_crypto', False)]
-    indices_news = [item for item in tagged_news if item.get('is_indices', False)]
-    market_news = [item for item in tagged_news if 
-                  item.get('is_market', False) or
-                  not (item.get('is_fx', False) or 
-                       item.get('is_crypto', False) or 
-                       item.get('is_indices', False))]
+    fx_news = [item for item in tagged_news if item.flags & MARKET_FX]
+    crypto_news = [item for item in tagged_news if item.flags & MARKET_CRYPTO]
+    indices_news = [item for item in tagged_news if item.flags & MARKET_INDICES]
+    market_news = [item for item in tagged_news if
+                   item.flags & MARKET_GENERAL or
+                   not item.flags & (MARKET_FX | MARKET_CRYPTO | MARKET_INDICES)]
     
     # Deduplicate market news using URLs or titles as fallbacks
     market_news_deduplicated = []
@@ -609,19 +611,15 @@ def process_news(news_items):
             market_news_deduplicated.append(item)
             seen_ids.add(item_id)
     
-    # Add deduplicated market news to all categories
-    for market_item in market_news_deduplicated:
-        if market_item not in fx_news:
-            fx_news.append(market_item)
-        if market_item not in crypto_news:
-            crypto_news.append(market_item)
-        if market_item not in indices_news:
-            indices_news.append(market_item)
+    # Add deduplicated market news to all categories (records compare by identity)
+    for category in (fx_news, crypto_news, indices_news):
+        present = set(map(id, category))
+        category.extend(item for item in market_news_deduplicated if id(item) not in present)
     
     # Sort each category by timestamp
-    fx_news = sorted(fx_news, key=lambda x: x.get('timestamp', datetime.now()), reverse=True)
-    crypto_news = sorted(crypto_news, key=lambda x: x.get('timestamp', datetime.now()), reverse=True)
-    indices_news = sorted(indices_news, key=lambda x: x.get('timestamp', datetime.now()), reverse=True)
+    fx_news = newest_first(fx_news)
+    crypto_news = newest_first(crypto_news)
+    indices_news = newest_first(indices_news)
     
     # Store in session state
     st.session_state.fx_news = fx_news
@@ -790,10 +788,10 @@ def tag_news_by_market_type(news_items):
     Tags news items with appropriate market type flags based on market-specific currencies.
     
     Args:
-        news_items: List of news item dictionaries
+        news_items: List of news items (dicts or NewsItem records)
     
     Returns:
-        List of news items with market_type tags
+        List of NewsItem records with their MARKET_* flags set
     """
     if not news_items:
         return []
@@ -811,23 +809,16 @@ def tag_news_by_market_type(news_items):
     
     indices_names = {'DOW JONES', 'S&P 500', 'NASDAQ', 'FTSE 100', 'DAX', 'CAC 40', 'NIKKEI 225'}
     
+    news_items = compact_news(news_items)
+    
     for item in news_items:
-        # Reset market type flags
-        item['is_fx'] = False
-        item['is_crypto'] = False
-        item['is_indices'] = False
-        item['is_market'] = False
+        flags = 0
         
         # Get the currency from the item
-        currency = item.get('currency', '')
-        if isinstance(currency, str):
-            currency = currency.upper()
-        else:
-            currency = ""
+        currency = item.currency.upper() if isinstance(item.currency, str) else ""
         
         # Extract file path to check file name pattern
-        file_path = item.get('file_path', '')
-        file_name = os.path.basename(file_path) if file_path else ''
+        file_name = os.path.basename(item.file_path) if item.file_path else ''
         
         # First check currency pair structure
         if '/' in currency:
@@ -835,16 +826,16 @@ def tag_news_by_market_type(news_items):
             
             # Crypto pair: if base is a crypto currency, it's crypto news
             if base in crypto_currencies:
-                item['is_crypto'] = True
+                flags = MARKET_CRYPTO
             # FX pair: if both base and quote are FX currencies, it's FX news
             elif base in fx_currencies and quote in fx_currencies:
-                item['is_fx'] = True
+                flags = MARKET_FX
             # If base is an index symbol, it's indices news
             elif base in indices_symbols or base in indices_names:
-                item['is_indices'] = True
+                flags = MARKET_INDICES
             # Default to market news
             else:
-                item['is_market'] = True
+                flags = MARKET_GENERAL
         
         # If not a pair, check the file name pattern
         elif file_name:
@@ -855,39 +846,38 @@ def tag_news_by_market_type(news_items):
                 
                 # Crypto file: if base is a crypto currency, it's crypto news
                 if base in crypto_currencies:
-                    item['is_crypto'] = True
+                    flags = MARKET_CRYPTO
                 # FX file: if both base and quote are FX currencies, it's FX news
                 elif base in fx_currencies and quote in fx_currencies:
-                    item['is_fx'] = True
+                    flags = MARKET_FX
                 # Default to market news
                 else:
-                    item['is_market'] = True
+                    flags = MARKET_GENERAL
             else:
                 # Check for indices in file name (no quote currency)
                 match = re.search(r'article_\d+_([a-z0-9]+)\.txt', file_name.lower())
                 if match and match.group(1).upper() in indices_symbols:
-                    item['is_indices'] = True
+                    flags = MARKET_INDICES
                 else:
-                    item['is_market'] = True
+                    flags = MARKET_GENERAL
         
         # If no classification yet, check currency directly
-        if not (item['is_fx'] or item['is_crypto'] or item['is_indices'] or item['is_market']):
+        if not flags:
             if currency in indices_names or currency in indices_symbols:
-                item['is_indices'] = True
+                flags = MARKET_INDICES
             elif currency in crypto_currencies:
-                item['is_crypto'] = True
+                flags = MARKET_CRYPTO
             elif currency in fx_currencies:
-                item['is_fx'] = True
+                flags = MARKET_FX
             else:
-                item['is_market'] = True
+                flags = MARKET_GENERAL
         
         # Special case for Market news (applies to all market types)
         if currency == "MARKET":
-            item['is_market'] = True
             # Market news should appear in all categories
-            item['is_fx'] = True
-            item['is_crypto'] = True
-            item['is_indices'] = True
+            flags = MARKET_GENERAL | MARKET_FX | MARKET_CRYPTO | MARKET_INDICES
+        
+        item.flags = flags
     
     return news_items
 
@@ -952,6 +942,7 @@ def fetch_market_specific_news(force=False):
 
 
 
+@metrics.timed_refresh("indices_news")
 def fetch_indices_news(indices_list=None, use_mock_fallback=True, force=False):
     """Fetch news for indices, with fallback to mock data."""
     
@@ -981,7 +972,7 @@ def fetch_indices_news(indices_list=None, use_mock_fallback=True, force=False):
     
     try:
         with st.spinner("Fetching latest indices news..."):
-            news_items = scrape_indices_news(indices_list, debug_log=st.session_state.debug_log, news_folder="fx_news/scrapers/news/yahoo")            
+            news_items = compact_news(scrape_indices_news(indices_list, debug_log=st.session_state.debug_log, news_folder="fx_news/scrapers/news/yahoo"))
             if news_items:
                 add_notification(f"Successfully fetched {len(news_items)} indices news items", "success")
                 st.session_state.last_indices_news_fetch = datetime.now()
@@ -1251,9 +1242,7 @@ def create_mock_indices_news(indices_list=None):
         mock_news.append(news_item)
     
     # Sort by timestamp, newest first
-    mock_news.sort(key=lambda x: x["timestamp"], reverse=True)
-    
-    return mock_news
+    return newest_first(compact_news(mock_news))
 
 
 def filter_news_by_market_type(news_items, subscription_pairs, market_type):
@@ -0,0 +1,182 @@
+"""
+Tiered rate source for the live rate tick.
+Plain FX pairs are priced from one bulk currency document per anchor (or per base) currency,
+cached for a short TTL, while pairs the bulk source does not cover (indices, crypto) and the
+periodic 5D/YTD chart refresh still go through the Yahoo spark scraper. Bulk prices fill the
+ticks between spark refreshes; every rate is tagged with its 'source' so callers can keep bulk
+prices out of the live series.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from fx_news.apis.rates_fetch import fetch_currency_rates
+from fx_news.scrapers.rates_scraper import scrape_yahoo_finance_rates
+from fx_news.scrapers.triangulation import is_fx_pair
+
+logger = logging.getLogger("rate_source")
+logger.setLevel(logging.WARNING)
+
+# Bulk documents are reused for this long, so one call serves each 35-second tick
+BULK_TTL_SECONDS = 30
+
+# Every pair still goes through spark this often, to refresh the 5D charts and previous closes
+SPARK_REFRESH_SECONDS = 300
+
+# Price every FX pair from one document for this currency; empty means one document per base
+BULK_ANCHOR = os.environ.get("FX_BULK_ANCHOR", "usd").lower()
+
+# Set FX_BULK_RATES=0 to fetch every tick through spark
+USE_BULK_RATES = os.environ.get("FX_BULK_RATES", "1") != "0"
+
+Pair = Tuple[str, str]
+
+_bulk_cache: Dict[str, Tuple[float, Dict[str, float]]] = {}
+_previous_closes: Dict[Pair, float] = {}
+_spark_quote_times: Dict[Pair, float] = {}
+_last_spark_refresh: Optional[float] = None
+_source_lock = threading.Lock()
+
+
+def get_bulk_rates(base: str, debug_log: Optional[List[str]] = None) -> Optional[Dict[str, float]]:
+    """
+    Return every quote of a base currency, from the cache while it is fresh.
+
+    Args:
+        base: Base currency code (e.g., 'usd')
+        debug_log: Optional list to append debug information to
+
+    Returns:
+        dict: Lower-case quote currency to rate, or None if the fetch failed
+    """
+    base = base.lower()
+    with _source_lock:
+        cached = _bulk_cache.get(base)
+    if cached is not None and time.time() - cached[0] < BULK_TTL_SECONDS:
+        return cached[1]
+
+    data = fetch_currency_rates(base, debug_log=debug_log)
+    if not data or base not in data:
+        # Serve the stale document rather than nothing
+        return cached[1] if cached is not None else None
+
+    quotes = {k.lower(): v for k, v in data[base].items() if isinstance(v, (int, float))}
+    quotes[base] = 1.0
+    with _source_lock:
+        _bulk_cache[base] = (time.time(), quotes)
+    return quotes
+
+
+def clear_bulk_cache() -> None:
+    """Drop the cached bulk documents so the next tick fetches them again."""
+    with _source_lock:
+        _bulk_cache.clear()
+
+
+def bulk_price(base: str, quote: str, documents: Dict[str, Dict[str, float]]) -> Optional[float]:
+    """
+    Price a pair from the fetched bulk documents.
+
+    Args:
+        base: Base currency code
+        quote: Quote currency code
+        documents: Currency -> quotes, as returned by get_bulk_rates
+
+    Returns:
+        float: Rate, or None if the documents do not cover the pair
+    """
+    base, quote = base.lower(), quote.lower()
+    if base in documents and quote in documents[base]:
+        return documents[base][quote]
+    anchor = documents.get(BULK_ANCHOR)
+    if anchor and anchor.get(base) and anchor.get(quote):
+        # Both rates are per unit of the anchor, so base/quote = anchor->quote / anchor->base
+        return anchor[quote] / anchor[base]
+    return None
+
+
+def _spark_due(fetch_ytd: bool, bulk_pairs: List[Pair]) -> bool:
+    if fetch_ytd or _last_spark_refresh is None:
+        return True
+    if time.time() - _last_spark_refresh >= SPARK_REFRESH_SECONDS:
+        return True
+    # Pairs never fetched through spark have no previous close or chart files yet
+    return any(pair not in _spark_quote_times for pair in bulk_pairs)
+
+
+def _record_spark(rates: Dict) -> Dict:
+    """Tag spark rates with their source and remember their quote time and previous close."""
+    now = time.time()
+    with _source_lock:
+        for base, quotes in rates.items():
+            for quote, data in quotes.items():
+                if not isinstance(data, dict):
+                    continue
+                data["source"] = "spark"
+                pair = (base.upper(), quote.upper())
+                _spark_quote_times[pair] = now
+                if data.get("previous_close") is not None:
+                    _previous_closes[pair] = data["previous_close"]
+    return rates
+
+
+def get_tiered_rates(currency_pairs: List[Pair], fetch_ytd: bool = False,
+                     debug_log: Optional[List[str]] = None) -> Dict:
+    """
+    Fetch the current rates of all pairs from the cheapest source that covers them.
+
+    Args:
+        currency_pairs: List of (base, quote) tuples
+        fetch_ytd: Whether the YTD files are due (forces a spark refresh)
+        debug_log: Optional list to append debug information to
+
+    Returns:
+        dict: {BASE: {QUOTE: {'price', 'previous_close', 'source'}}}, like scrape_yahoo_finance_rates;
+        'source' is 'bulk' or 'spark'
+    """
+    global _last_spark_refresh
+    if debug_log is None:
+        debug_log = []
+
+    pairs = list(dict.fromkeys((b.upper(), q.upper()) for b, q in currency_pairs))
+    bulk_pairs = [p for p in pairs if is_fx_pair(*p)] if USE_BULK_RATES else []
+    spark_pairs = [p for p in pairs if p not in bulk_pairs]
+
+    if not bulk_pairs or _spark_due(fetch_ytd, bulk_pairs):
+        rates = _record_spark(scrape_yahoo_finance_rates(pairs, fetch_ytd=fetch_ytd, debug_log=debug_log))
+        with _source_lock:
+            _last_spark_refresh = time.time()
+        return rates
+
+    if BULK_ANCHOR:
+        bases = [BULK_ANCHOR]
+    else:
+        bases = list(dict.fromkeys(b.lower() for b, _ in bulk_pairs))
+    documents = {}
+    for base in bases:
+        quotes = get_bulk_rates(base, debug_log)
+        if quotes is not None:
+            documents[base] = quotes
+
+    rates: Dict[str, Dict] = {}
+    for base, quote in bulk_pairs:
+        price = bulk_price(base, quote, documents)
+        if price is None:
+            spark_pairs.append((base, quote))
+            continue
+        rates.setdefault(base, {})[quote] = {
+            "price": price,
+            "previous_close": _previous_closes.get((base, quote)),
+            "source": "bulk",
+        }
+
+    bulk_served = sum(len(quotes) for quotes in rates.values())
+    debug_log.append(f"Bulk rates: {bulk_served} pairs from {len(documents)} documents, "
+                     f"{len(spark_pairs)} pairs via spark")
+
+    if spark_pairs:
+        for base, quotes in _record_spark(scrape_yahoo_finance_rates(spark_pairs, debug_log=debug_log)).items():
+            rates.setdefault(base, {}).update(quotes)
+    return rates
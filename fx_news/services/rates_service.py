@@ -7,11 +7,15 @@ import random
 
 from streamlit_autorefresh import st_autorefresh
 from fx_news.apis.rates_fetch import fetch_currency_rates, update_rates_with_variation, get_mock_currency_rates
-from fx_news.scrapers.rates_scraper import scrape_yahoo_finance_rates
+from fx_news.services.rate_source import get_tiered_rates
 
 from fx_news.utils.notifications import add_notification
+from fx_news.data.rate_history import RateHistory
+from fx_news.services.volatility_engine import build_volatility_engine
+from fx_news.services.alert_engine import AlertEngine, format_alert, optional_level
 from fx_news.services.sentiment_service import update_all_sentiment_data
 from fx_news.services.events_service import fetch_all_economic_events
+from fx_news.utils.render_profiler import profile_component
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +53,7 @@ def setup_auto_refresh():
             st.session_state.last_sentiment_auto_refresh_time = current_time
             update_all_sentiment_data(force=True)
 
+@profile_component()
 def update_rates(use_mock_data=False):
     """
     Update currency rates for all subscriptions
@@ -74,7 +79,7 @@ def update_rates(use_mock_data=False):
                     updated_any = True
             add_notification("Using mock currency data for testing", "info")
         else:
-            # Use the optimized scraper method
+            # Bulk documents for plain FX pairs, spark for the rest and the periodic chart refresh
             currency_pairs = [(sub["base"], sub["quote"]) for sub in st.session_state.subscriptions]
             
             # Determine if we should also fetch YTD data (once per day is enough)
@@ -84,7 +89,7 @@ def update_rates(use_mock_data=False):
             elif (datetime.now() - st.session_state.last_ytd_fetch).days >= 1:
                 fetch_ytd = True
                 
-            results = scrape_yahoo_finance_rates(currency_pairs, fetch_ytd=fetch_ytd, debug_log=st.session_state.debug_log)
+            results = get_tiered_rates(currency_pairs, fetch_ytd=fetch_ytd, debug_log=st.session_state.debug_log)
             
             # Update last YTD fetch time if we fetched YTD data
             if fetch_ytd:
@@ -96,6 +101,13 @@ def update_rates(use_mock_data=False):
                 updated_any = True
 
         if updated_any:
+            # Rates of this tick, fed to the volatility engine in one update. Sync the engine's
+            # pairs before the histories grow; a new engine is seeded from them later instead.
+            volatility_tick = {}
+            volatility_engine = None
+            if st.session_state.get('volatility_engine') is not None:
+                volatility_engine = get_volatility_engine(st.session_state.subscriptions)
+            
             # Update subscriptions with new rates
             for sub in st.session_state.subscriptions:
                 base = sub["base"].lower()
@@ -116,10 +128,12 @@ def update_rates(use_mock_data=False):
                         # New format with price and previous_close
                         sub["previous_close"] = rate_data.get("previous_close")
                         sub["current_rate"] = rate_data["price"]
+                        sub["rate_source"] = rate_data.get("source")
                     else:
                         # Old format with just a rate value
                         sub["last_rate"] = sub["current_rate"]
                         sub["current_rate"] = rate_data
+                        sub["rate_source"] = None
 
                     # Optional: Add small random variations for testing UI updates
                     if 'show_debug' in st.session_state and st.session_state.show_debug and 'add_variations' in st.session_state and st.session_state.add_variations:
@@ -128,34 +142,31 @@ def update_rates(use_mock_data=False):
                     # Initialize rate history if needed
                     pair_key = f"{base}_{quote}"
                     if pair_key not in st.session_state.rate_history:
-                        st.session_state.rate_history[pair_key] = []
+                        st.session_state.rate_history[pair_key] = RateHistory()
 
-                    # Add to history (keep only last 100 points)
-                    st.session_state.rate_history[pair_key].append({
-                        "timestamp": datetime.now(),
-                        "rate": sub["current_rate"]
-                    })
-                    if len(st.session_state.rate_history[pair_key]) > 100:
-                        st.session_state.rate_history[pair_key] = st.session_state.rate_history[pair_key][-100:]
+                    # Bulk-document prices only update the display: the history, volatility and
+                    # alerts stay on the live quotes so the two sources never mix in one series
+                    if sub.get("rate_source") == "bulk":
+                        continue
+                    sub["live_rate"] = sub["current_rate"]
 
-                    # Check for threshold breach using previous_close if available
-                    reference_price = None
-                    if sub.get("previous_close") is not None:
-                        reference_price = sub["previous_close"]
-                    elif sub.get("last_rate") is not None:
-                        reference_price = sub["last_rate"]
-                        
-                    if reference_price is not None and sub["current_rate"] is not None:
-                        percent_change = abs((sub["current_rate"] - reference_price) / reference_price * 100)
-                        if percent_change > sub["threshold"]:
-                            direction = "increased" if sub["current_rate"] > reference_price else "decreased"
-                            add_notification(
-                                f"{sub['base']}/{sub['quote']} {direction} by {percent_change:.2f}% (threshold: {sub['threshold']}%)",
-                                "price"
-                            )
+                    # Add to history (the ring buffer drops the oldest point once full)
+                    if sub["current_rate"] is not None:
+                        st.session_state.rate_history[pair_key].append(sub["current_rate"])
+                        volatility_tick[pair_key] = sub["current_rate"]
 
+            if volatility_engine is not None:
+                volatility_engine.push(volatility_tick)
+            
+            # Threshold, level and volatility alerts for all pairs; only new breaches notify
+            check_rate_alerts(st.session_state.subscriptions)
+            
             st.session_state.last_refresh = datetime.now()
             add_notification("Currency rates updated successfully", "success")
+            
+            # Precompute forecasts in the background now that new bars may have landed
+            from fx_news.predict.forecast_scheduler import maybe_precompute_forecasts
+            maybe_precompute_forecasts(st.session_state.subscriptions)
             return True
         else:
             add_notification("Failed to update any currency rates", "error")
@@ -197,11 +208,113 @@ def calculate_percentage_variation(subscriptions):
                 })
     return variations
 
+def live_rate(sub):
+    """
+    Latest rate of a subscription from a live quote.
+    
+    Bulk-document prices are shown as the current rate but are not live quotes,
+    so alerts and volatility keep using the last live rate instead.
+    
+    Args:
+        sub: Subscription dictionary
+        
+    Returns:
+        float: Rate, or None if the pair has no rate yet
+    """
+    if sub.get("rate_source") == "bulk":
+        return sub.get("live_rate")
+    return sub.get("current_rate")
+
+def check_rate_alerts(subscriptions):
+    """
+    Evaluate the alert rules of every subscription and notify the ones that just fired.
+    
+    Percent-move alerts use the subscription threshold against previous_close (or last_rate),
+    level alerts use the optional 'alert_above'/'alert_below' fields, and volatility spikes
+    compare each tick's move with the pair's recent moves.
+    
+    Args:
+        subscriptions: List of subscription dictionaries
+        
+    Returns:
+        list: Alerts fired on this tick
+    """
+    if not subscriptions:
+        return []
+    
+    if st.session_state.get('alert_engine') is None:
+        st.session_state.alert_engine = AlertEngine()
+    engine = st.session_state.alert_engine
+    
+    pair_keys = [f"{sub['base'].lower()}_{sub['quote'].lower()}" for sub in subscriptions]
+    engine.sync_pairs(pair_keys)
+    
+    # One value per engine row; duplicate subscriptions share the row of their first occurrence
+    by_key = {}
+    for pair_key, sub in zip(pair_keys, subscriptions):
+        by_key.setdefault(pair_key, sub)
+    rows = [by_key[k] for k in engine.pair_keys]
+    
+    def column(get):
+        return np.array([get(sub) for sub in rows], dtype=np.float64)
+    
+    def reference(sub):
+        if sub.get("previous_close") is not None:
+            return sub["previous_close"]
+        return sub.get("last_rate")
+    
+    alerts = engine.evaluate(
+        current=column(lambda sub: live_rate(sub) if live_rate(sub) is not None else np.nan),
+        reference=column(lambda sub: reference(sub) if reference(sub) is not None else np.nan),
+        thresholds=column(lambda sub: sub.get("threshold", np.nan)),
+        above=column(lambda sub: optional_level(sub.get("alert_above"))),
+        below=column(lambda sub: optional_level(sub.get("alert_below"))),
+    )
+    
+    # One sound per tick however many alerts fired
+    for i, alert in enumerate(alerts):
+        sub = by_key[alert["pair_key"]]
+        add_notification(format_alert(alert, sub["base"], sub["quote"], sub.get("threshold")), "price",
+                         play_sound=(i == 0))
+    return alerts
+
+def get_volatility_engine(subscriptions):
+    """
+    Return the session's volatility engine with one row per subscribed pair.
+    
+    The engine is created on first use and new pairs are seeded from their rate history.
+    
+    Args:
+        subscriptions: List of subscription dictionaries
+        
+    Returns:
+        VolatilityEngine: Engine tracking every subscribed pair
+    """
+    pair_keys = [f"{sub['base'].lower()}_{sub['quote'].lower()}" for sub in subscriptions]
+    
+    engine = st.session_state.get('volatility_engine')
+    if engine is None:
+        engine = build_volatility_engine(st.session_state.rate_history, pair_keys)
+        st.session_state.volatility_engine = engine
+        return engine
+    
+    new_pairs = [k for k in dict.fromkeys(pair_keys) if k not in engine.pair_keys]
+    engine.sync_pairs(pair_keys)
+    for pair_key in new_pairs:
+        history = st.session_state.rate_history.get(pair_key)
+        if history is not None and len(history):
+            engine.seed(pair_key, history.rates(engine.window))
+    return engine
+
+@profile_component()
 def calculate_market_volatility(subscriptions):
     """
     Calculate a market volatility index based on the short-term 
     movement of all currency pairs.
     
+    Scores for all pairs come from one vectorized pass over the volatility engine,
+    and the result is reused until a new tick arrives or a rate changes.
+    
     Args:
         subscriptions: List of subscription dictionaries containing currency data
     
@@ -212,65 +325,31 @@ def calculate_market_volatility(subscriptions):
     if not subscriptions:
         return 0, {}
     
-    pair_volatility = {}
-    volatility_scores = []
+    engine = get_volatility_engine(subscriptions)
     
-    for sub in subscriptions:
-        # Skip pairs with insufficient data
-        if sub.get("current_rate") is None:
-            continue
-            
-        # Get reference price for calculating volatility
-        reference_rate = None
-        if sub.get("previous_close") is not None:
-            reference_rate = sub["previous_close"]
-        elif sub.get("last_rate") is not None:
-            reference_rate = sub["last_rate"]
-            
-        if reference_rate is None:
-            continue
-            
-        # Calculate percent change as basic volatility measure
-        percent_change = abs((sub["current_rate"] - reference_rate) / reference_rate * 100)
-        
-        # Get historical data if available
-        pair_key = f"{sub['base'].lower()}_{sub['quote'].lower()}"
-        historical_volatility = 0
-        
-        if pair_key in st.session_state.rate_history and len(st.session_state.rate_history[pair_key]) > 3:
-            # Get recent history
-            history = st.session_state.rate_history[pair_key][-20:]  # Last 20 data points
-            rates = [point["rate"] for point in history]
-            
-            # Calculate standard deviation as a volatility measure if we have enough data
-            if len(rates) >= 3:
-                std_dev = np.std(rates)
-                mean_rate = np.mean(rates)
-                if mean_rate > 0:
-                    # Coefficient of variation (normalized standard deviation)
-                    historical_volatility = (std_dev / mean_rate) * 100
-        
-        # Combine recent change and historical volatility
-        # Weight recent change more heavily (70%) than historical volatility (30%)
-        volatility_score = (0.7 * percent_change) + (0.3 * historical_volatility)
-        
-        # Store pair-specific volatility
-        pair_volatility[f"{sub['base']}/{sub['quote']}"] = volatility_score
-        volatility_scores.append(volatility_score)
+    # Current and reference rates aligned with the engine rows
+    by_key = {f"{sub['base'].lower()}_{sub['quote'].lower()}": sub for sub in subscriptions}
+    subs = [by_key[k] for k in engine.pair_keys]
+    current = np.array([live_rate(sub) for sub in subs], dtype=np.float64)
+    reference = np.array([
+        sub["previous_close"] if sub.get("previous_close") is not None else sub.get("last_rate")
+        for sub in subs
+    ], dtype=np.float64)
     
-    # Calculate overall market volatility index (scale 0-100)
-    # We use the 80th percentile to reduce impact of outliers
-    if volatility_scores:
-        # Get the 80th percentile of all volatility scores
-        high_volatility = np.percentile(volatility_scores, 80) if len(volatility_scores) >= 5 else max(volatility_scores)
-        
-        # Scale to 0-100 range (assuming 5% change is very volatile -> 100)
-        # This scaling factor can be adjusted based on normal market conditions
-        volatility_index = min(100, (high_volatility / 5) * 100)
-    else:
-        volatility_index = 0
+    cache_key = (engine.version, tuple(engine.pair_keys), current.tobytes(), reference.tobytes())
+    cached = st.session_state.get('volatility_result')
+    if cached and cached[0] == cache_key:
+        return cached[1]
+    
+    volatility_index, scores = engine.market_volatility(current, reference)
+    pair_volatility = {
+        f"{sub['base']}/{sub['quote']}": float(score)
+        for sub, score in zip(subs, scores) if np.isfinite(score)
+    }
     
-    return volatility_index, pair_volatility
+    result = (volatility_index, pair_volatility)
+    st.session_state.volatility_result = (cache_key, result)
+    return result
 
 
 # Prepare data for the geomap
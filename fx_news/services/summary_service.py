@@ -0,0 +1,481 @@
+"""
+Summary service for the News Summarizer.
+Caches generated summaries on disk, keyed by the set of articles they were built from,
+so re-runs only regenerate pairs whose news has actually changed.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger("summary_service")
+
+SUMMARY_CACHE_DIR = "fx_news/scrapers/news/summary_cache"
+SUMMARY_CACHE_FILE = os.path.join(SUMMARY_CACHE_DIR, "summaries.json")
+MAX_CACHE_ENTRIES = 500
+
+_cache: Optional[Dict[str, Dict[str, Any]]] = None
+_cache_lock = threading.Lock()
+
+
+def get_article_id(article: Dict[str, Any]) -> str:
+    """
+    Return a stable identifier for a news article.
+
+    Local files don't carry an explicit article ID, so fall back to the
+    filename, file path, URL and finally the title.
+
+    Args:
+        article: Article dictionary or DataFrame row
+
+    Returns:
+        str: Identifier for the article
+    """
+    for key in ("article_id", "filename", "file_path", "url"):
+        value = article.get(key)
+        if isinstance(value, str) and value:
+            return value
+    title = article.get("title") or ""
+    date = article.get("date") or article.get("timestamp") or ""
+    return f"{title}|{date}"
+
+
+def get_model_id(model: Any) -> str:
+    """Return the Hugging Face identifier of a loaded model."""
+    config = getattr(model, "config", None)
+    return getattr(config, "name_or_path", None) or type(model).__name__
+
+
+def make_summary_key(pair: str, article_ids: Iterable[str], summary_length: str,
+                     include_sentiment: bool, model_id: str, mode: str = "standard") -> str:
+    """
+    Build the cache key for a pair summary.
+
+    Args:
+        pair: Currency pair (e.g., 'EUR/USD')
+        article_ids: Identifiers of the articles being summarized
+        summary_length: Summary length option
+        include_sentiment: Whether sentiment analysis was requested
+        model_id: Identifier of the summarization model
+        mode: Summarization mode (e.g., 'standard', 'map-reduce')
+
+    Returns:
+        str: Hex digest identifying the summary inputs
+    """
+    payload = json.dumps({
+        "pair": pair,
+        "articles": sorted(set(article_ids)),
+        "length": summary_length,
+        "sentiment": bool(include_sentiment),
+        "model": model_id,
+        "mode": mode,
+    }, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _load_cache() -> Dict[str, Dict[str, Any]]:
+    """Load the summary cache from disk once per process."""
+    global _cache
+    if _cache is None:
+        _cache = {}
+        if os.path.exists(SUMMARY_CACHE_FILE):
+            try:
+                with open(SUMMARY_CACHE_FILE, "r", encoding="utf-8") as f:
+                    _cache = json.load(f)
+                logger.info(f"Loaded {len(_cache)} cached summaries from {SUMMARY_CACHE_FILE}")
+            except Exception as e:
+                logger.warning(f"Could not read summary cache, starting empty: {str(e)}")
+                _cache = {}
+    return _cache
+
+
+def _save_cache() -> None:
+    """Write the summary cache to disk atomically."""
+    try:
+        os.makedirs(SUMMARY_CACHE_DIR, exist_ok=True)
+        tmp_file = SUMMARY_CACHE_FILE + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(_cache, f)
+        os.replace(tmp_file, SUMMARY_CACHE_FILE)
+    except Exception as e:
+        logger.error(f"Error writing summary cache: {str(e)}")
+
+
+def get_cached_summary(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a cached summary.
+
+    Args:
+        key: Key returned by make_summary_key
+
+    Returns:
+        dict: Cached summary entry, or None on a miss
+    """
+    with _cache_lock:
+        entry = _load_cache().get(key)
+        if entry is not None:
+            entry["last_used"] = time.time()
+            entry["hits"] = entry.get("hits", 0) + 1
+            return dict(entry)
+    return None
+
+
+def store_summary(key: str, summary: Dict[str, Any], generation_seconds: float) -> None:
+    """
+    Store a generated summary with its timing metadata.
+
+    Errored summaries are never cached so they get retried on the next run.
+
+    Args:
+        key: Key returned by make_summary_key
+        summary: Summary dictionary as built by generate_summaries
+        generation_seconds: Wall time spent generating the summary
+    """
+    if summary.get("error"):
+        return
+
+    with _cache_lock:
+        cache = _load_cache()
+        entry = dict(summary)
+        entry["generation_seconds"] = round(generation_seconds, 3)
+        entry["cached_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        entry["last_used"] = time.time()
+        entry["hits"] = 0
+        cache[key] = entry
+
+        # Evict least recently used entries once the cache grows too large
+        if len(cache) > MAX_CACHE_ENTRIES:
+            stale = sorted(cache, key=lambda k: cache[k].get("last_used", 0))
+            for old_key in stale[:len(cache) - MAX_CACHE_ENTRIES]:
+                del cache[old_key]
+
+        _save_cache()
+
+
+def clear_summary_cache() -> None:
+    """Remove all cached summaries from memory and disk."""
+    global _cache
+    with _cache_lock:
+        _cache = {}
+        if os.path.exists(SUMMARY_CACHE_FILE):
+            os.remove(SUMMARY_CACHE_FILE)
+
+
+def get_summary_cache_stats() -> Dict[str, Any]:
+    """
+    Return summary cache statistics for display.
+
+    Returns:
+        dict: Entry count, total hits and generation time saved
+    """
+    with _cache_lock:
+        cache = _load_cache()
+        entries: List[Dict[str, Any]] = list(cache.values())
+    return {
+        "entries": len(entries),
+        "hits": sum(e.get("hits", 0) for e in entries),
+        "seconds_saved": round(sum(e.get("hits", 0) * e.get("generation_seconds", 0) for e in entries), 1),
+    }
+
+
+#################################
+# Map-reduce summarization
+#################################
+
+SUMMARY_INSTRUCTION = "Please include market sentiment analysis and potential impact on trading in the summary."
+
+
+def format_article_for_summary(article: Dict[str, Any], snippet_chars: int = 300) -> str:
+    """
+    Format an article as a Title/Source/Date/Content block for the summarizer.
+
+    Args:
+        article: Article dictionary or DataFrame row
+        snippet_chars: Number of content characters to keep
+
+    Returns:
+        str: Formatted article block
+    """
+    text = article.get('text', '') or ''
+    text_snippet = text[:snippet_chars] + "..." if len(text) > snippet_chars else text
+    date = article.get('date', '')
+    date_str = date.strftime('%Y-%m-%d %H:%M') if isinstance(date, datetime) else date
+    article_info = f"Title: {article.get('title', '')}\n"
+    article_info += f"Source: {article.get('source', '')}\n"
+    article_info += f"Date: {date_str}\n"
+    article_info += f"Content: {text_snippet}\n\n"
+    return article_info
+
+
+def chunk_by_tokens(tokenizer: Any, texts: List[str], max_tokens: int) -> List[str]:
+    """
+    Pack texts into chunks whose real token count fits the model input.
+
+    Texts longer than max_tokens on their own are truncated at the token level
+    rather than dropped.
+
+    Args:
+        tokenizer: Hugging Face tokenizer
+        texts: Texts to pack, in order
+        max_tokens: Maximum tokens per chunk
+
+    Returns:
+        list: Chunk strings
+    """
+    if not texts:
+        return []
+
+    separator_tokens = len(tokenizer("\n\n", add_special_tokens=False)["input_ids"])
+    token_ids = tokenizer(texts, add_special_tokens=False)["input_ids"]
+
+    chunks = []
+    current, current_tokens = [], 0
+    for text, ids in zip(texts, token_ids):
+        if len(ids) > max_tokens:
+            text = tokenizer.decode(ids[:max_tokens], skip_special_tokens=True)
+            ids = ids[:max_tokens]
+        needed = len(ids) + (separator_tokens if current else 0)
+        if current and current_tokens + needed > max_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+            needed = len(ids)
+        current.append(text)
+        current_tokens += needed
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def summarize_batch(tokenizer: Any, model: Any, texts: List[str], min_length: int, max_length: int,
+                    device: str = "cpu", batch_size: int = 4, num_beams: int = 4) -> List[str]:
+    """
+    Summarize several texts with padded, batched generation.
+
+    Args:
+        tokenizer: Hugging Face tokenizer
+        model: Seq2seq summarization model
+        texts: Input texts
+        min_length: Minimum summary length in tokens
+        max_length: Maximum summary length in tokens
+        device: Torch device name
+        batch_size: Number of texts per generate() call
+        num_beams: Beam width
+
+    Returns:
+        list: Summaries in the same order as texts
+    """
+    import torch
+
+    model_max = min(getattr(tokenizer, "model_max_length", 1024), 1024)
+    results = []
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        inputs = tokenizer(batch, max_length=model_max, truncation=True, padding=True,
+                           return_tensors="pt").to(device)
+        with torch.no_grad():
+            summary_ids = model.generate(
+                inputs["input_ids"],
+                attention_mask=inputs["attention_mask"],
+                num_beams=num_beams,
+                min_length=min_length,
+                max_length=max_length,
+                early_stopping=True
+            )
+        results.extend(tokenizer.batch_decode(summary_ids, skip_special_tokens=True))
+    return results
+
+
+def map_reduce_summarize(tokenizer: Any, model: Any, article_texts: List[str], min_length: int, max_length: int,
+                         include_sentiment: bool = False, device: str = "cpu", batch_size: int = 4,
+                         max_rounds: int = 8) -> str:
+    """
+    Summarize an arbitrarily large set of articles in map and reduce steps.
+
+    The map step packs articles into token-sized chunks and summarizes them in
+    batches. The reduce step summarizes the chunk summaries, repeating until
+    they fit into a single model input.
+
+    Args:
+        tokenizer: Hugging Face tokenizer
+        model: Seq2seq summarization model
+        article_texts: Formatted article blocks
+        min_length: Minimum final summary length in tokens
+        max_length: Maximum final summary length in tokens
+        include_sentiment: Whether to append the sentiment instruction to the final input
+        device: Torch device name
+        batch_size: Number of chunks per generate() call
+        max_rounds: Maximum number of reduce rounds; reducing also stops when a round no longer
+            shrinks the number of chunks
+
+    Returns:
+        str: Final summary text
+    """
+    model_max = min(getattr(tokenizer, "model_max_length", 1024), 1024)
+    instruction = f"\n\n{SUMMARY_INSTRUCTION}" if include_sentiment else ""
+    reserved = len(tokenizer(instruction, add_special_tokens=False)["input_ids"]) if instruction else 0
+    # Leave room for the special tokens the tokenizer adds around each input
+    chunk_tokens = model_max - reserved - 8
+
+    # Intermediate summaries are kept short so several fit in the reduce input
+    map_min, map_max = min(30, min_length), max(60, max_length // 2)
+
+    chunks = chunk_by_tokens(tokenizer, article_texts, chunk_tokens)
+    logger.info(f"Map-reduce summarizing {len(article_texts)} articles in {len(chunks)} chunks")
+
+    rounds = 0
+    while len(chunks) > 1 and rounds < max_rounds:
+        partials = summarize_batch(tokenizer, model, chunks, map_min, map_max, device, batch_size)
+        reduced = chunk_by_tokens(tokenizer, partials, chunk_tokens)
+        rounds += 1
+        logger.info(f"Reduce round {rounds}: {len(partials)} partial summaries -> {len(reduced)} chunks")
+        if len(reduced) >= len(chunks):
+            chunks = reduced
+            break
+        chunks = reduced
+
+    if len(chunks) == 1:
+        final_input = chunks[0] + instruction
+    else:
+        # The model input is truncated from the end, so keep the instruction ahead of the text
+        logger.warning(f"Map-reduce stopped with {len(chunks)} chunks after {rounds} rounds; "
+                       f"text past {model_max} tokens of the final input is dropped")
+        final_input = instruction.strip() + "\n\n" + "\n\n".join(chunks) if instruction else "\n\n".join(chunks)
+    return summarize_batch(tokenizer, model, [final_input], min_length, max_length, device, 1)[0]
+
+
+#################################
+# Incremental rolling summaries
+#################################
+
+ROLLING_SUMMARY_FILE = os.path.join(SUMMARY_CACHE_DIR, "rolling_summaries.json")
+
+_rolling: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+def _load_rolling() -> Dict[str, Dict[str, Any]]:
+    """Load the rolling summary state from disk once per process."""
+    global _rolling
+    if _rolling is None:
+        _rolling = {}
+        if os.path.exists(ROLLING_SUMMARY_FILE):
+            try:
+                with open(ROLLING_SUMMARY_FILE, "r", encoding="utf-8") as f:
+                    _rolling = json.load(f)
+            except Exception as e:
+                logger.warning(f"Could not read rolling summaries, starting empty: {str(e)}")
+                _rolling = {}
+    return _rolling
+
+
+def _save_rolling() -> None:
+    """Write the rolling summary state to disk atomically."""
+    try:
+        os.makedirs(SUMMARY_CACHE_DIR, exist_ok=True)
+        tmp_file = ROLLING_SUMMARY_FILE + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(_rolling, f)
+        os.replace(tmp_file, ROLLING_SUMMARY_FILE)
+    except Exception as e:
+        logger.error(f"Error writing rolling summaries: {str(e)}")
+
+
+def get_rolling_summary(pair: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the rolling summary state for a pair.
+
+    Args:
+        pair: Currency pair (e.g., 'EUR/USD')
+
+    Returns:
+        dict: Summary text, covered article IDs and settings, or None
+    """
+    with _cache_lock:
+        state = _load_rolling().get(pair)
+        return dict(state) if state else None
+
+
+def reset_rolling_summaries(pair: Optional[str] = None) -> None:
+    """
+    Drop rolling summary state so the next run rebuilds from the full window.
+
+    Args:
+        pair: Pair to reset, or None to reset all pairs
+    """
+    with _cache_lock:
+        rolling = _load_rolling()
+        if pair is None:
+            rolling.clear()
+        else:
+            rolling.pop(pair, None)
+        _save_rolling()
+
+
+def rolling_summarize(pair: str, articles: Dict[str, str], tokenizer: Any, model: Any, min_length: int,
+                      max_length: int, settings_key: str, include_sentiment: bool = False,
+                      device: str = "cpu") -> Dict[str, Any]:
+    """
+    Update a pair's rolling summary with only the articles it hasn't seen yet.
+
+    New articles are summarized on their own, then merged with the previous
+    summary. The merge input is two bounded summaries, so the cost of a refresh
+    depends on the number of new articles rather than the size of the window.
+    The state is rebuilt from scratch when the summary settings change, or when
+    covered articles leave the window, since their content cannot be taken back
+    out of the merged text.
+
+    Args:
+        pair: Currency pair (e.g., 'EUR/USD')
+        articles: Formatted article blocks keyed by article ID
+        tokenizer: Hugging Face tokenizer
+        model: Seq2seq summarization model
+        min_length: Minimum summary length in tokens
+        max_length: Maximum summary length in tokens
+        settings_key: Identifier of the summary settings (length, sentiment, model, time window)
+        include_sentiment: Whether to append the sentiment instruction to the merge input
+        device: Torch device name
+
+    Returns:
+        dict: summary text, new_count and covered_count
+    """
+    with _cache_lock:
+        state = _load_rolling().get(pair)
+    if state and state.get("settings") != settings_key:
+        state = None
+    if state and not set(state["covered_ids"]) <= set(articles):
+        logger.info(f"Rebuilding the rolling summary of {pair}: covered articles left the window")
+        state = None
+
+    covered = set(state["covered_ids"]) if state else set()
+    new_ids = [article_id for article_id in articles if article_id not in covered]
+
+    if state and not new_ids:
+        return {"summary": state["summary"], "new_count": 0, "covered_count": len(covered)}
+
+    new_texts = [articles[article_id] for article_id in new_ids]
+    new_summary = map_reduce_summarize(tokenizer, model, new_texts, min_length, max_length,
+                                       include_sentiment=include_sentiment and not state, device=device)
+
+    if state:
+        instruction = f"\n\n{SUMMARY_INSTRUCTION}" if include_sentiment else ""
+        merge_input = f"Earlier developments: {state['summary']}\n\nLatest developments: {new_summary}{instruction}"
+        summary_text = summarize_batch(tokenizer, model, [merge_input], min_length, max_length, device, 1)[0]
+    else:
+        summary_text = new_summary
+
+    covered |= set(new_ids)
+
+    with _cache_lock:
+        _load_rolling()[pair] = {
+            "summary": summary_text,
+            "covered_ids": sorted(covered),
+            "settings": settings_key,
+            "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        _save_rolling()
+
+    logger.info(f"Rolling summary for {pair}: {len(new_ids)} new articles, {len(covered)} covered")
+    return {"summary": summary_text, "new_count": len(new_ids), "covered_count": len(covered)}
@@ -0,0 +1,229 @@
+"""
+Multi-pair volatility engine.
+Keeps the last few ticks of every subscribed pair in an aligned (pairs x time) matrix with
+running sums, so rolling std, coefficient of variation, realized volatility and the market
+volatility index are updated per tick and computed for all pairs in one vectorized pass.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Ticks per pair used for the historical volatility (matches the previous 20-point window)
+VOLATILITY_WINDOW = 20
+
+# Minimum ticks before a pair's historical volatility is used
+MIN_HISTORY_POINTS = 4
+
+# Recompute the running sums from the window every so often to shed floating-point drift
+RESYNC_TICKS = 500
+
+# Weight of the move vs. the reference price; the rest goes to historical volatility
+RECENT_CHANGE_WEIGHT = 0.7
+
+# A 5% move maps to a volatility index of 100
+INDEX_SCALE_PCT = 5.0
+
+
+class VolatilityEngine:
+    """Rolling volatility statistics for many pairs, updated incrementally as ticks arrive."""
+
+    def __init__(self, window: int = VOLATILITY_WINDOW):
+        self.window = window
+        self.pair_keys: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._rates = np.full((0, window), np.nan)
+        self._returns = np.full((0, window), np.nan)
+        self._last = np.full(0, np.nan)
+        self._anchor = np.full(0, np.nan)
+        self._pos = 0
+        self._ticks = 0
+        self.version = 0
+        self._reset_sums()
+
+    def _reset_sums(self) -> None:
+        n = len(self.pair_keys)
+        self._count = np.zeros(n)
+        self._sum = np.zeros(n)
+        self._sumsq = np.zeros(n)
+        self._ret_count = np.zeros(n)
+        self._ret_sumsq = np.zeros(n)
+
+    def sync_pairs(self, pair_keys: Iterable[str]) -> None:
+        """
+        Match the matrix rows to the current subscriptions, keeping the history of existing pairs.
+
+        Args:
+            pair_keys: Pair keys (e.g., 'eur_usd') in display order
+        """
+        pair_keys = list(dict.fromkeys(pair_keys))
+        if pair_keys == self.pair_keys:
+            return
+
+        rows = [self._index.get(k) for k in pair_keys]
+
+        def take(matrix: np.ndarray, fill_shape: Tuple[int, ...]) -> np.ndarray:
+            out = np.full((len(pair_keys),) + fill_shape, np.nan)
+            for i, row in enumerate(rows):
+                if row is not None:
+                    out[i] = matrix[row]
+            return out
+
+        self._rates = take(self._rates, (self.window,))
+        self._returns = take(self._returns, (self.window,))
+        self._last = take(self._last, ())
+        self._anchor = take(self._anchor, ())
+        self.pair_keys = pair_keys
+        self._index = {k: i for i, k in enumerate(pair_keys)}
+        self._resync()
+
+    def seed(self, pair_key: str, rates: np.ndarray) -> None:
+        """
+        Load a pair's recent history, e.g. from its RateHistory, when the engine is created.
+
+        Args:
+            pair_key: Pair key already added with sync_pairs
+            rates: Recent rates, oldest first
+        """
+        row = self._index[pair_key]
+        rates = np.asarray(rates, dtype=np.float64)[-self.window:]
+        # Lay the points out so they end at the current write position
+        cols = (self._pos - len(rates) + np.arange(len(rates))) % self.window
+        self._rates[row] = np.nan
+        self._rates[row, cols] = rates
+        self._returns[row] = np.nan
+        if len(rates) > 1:
+            self._returns[row, cols[1:]] = np.diff(np.log(rates))
+        if len(rates):
+            self._last[row] = rates[-1]
+            self._anchor[row] = rates[0]
+        self._resync()
+
+    def push(self, tick: Dict[str, float]) -> None:
+        """
+        Add one tick for every pair; pairs missing from the tick repeat their last rate.
+
+        Args:
+            tick: Pair key to latest rate
+        """
+        column = self._last.copy()
+        for pair_key, rate in tick.items():
+            row = self._index.get(pair_key)
+            if row is not None and rate is not None:
+                column[row] = rate
+
+        # Anchor each pair on its first rate so the running sums work on small deviations
+        new_anchor = np.isnan(self._anchor) & ~np.isnan(column)
+        self._anchor[new_anchor] = column[new_anchor]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            new_returns = np.log(column / self._last)
+
+        pos = self._pos
+        self._remove(self._rates[:, pos], self._returns[:, pos])
+        self._rates[:, pos] = column
+        self._returns[:, pos] = new_returns
+        self._add(column, new_returns)
+
+        self._last = column
+        self._pos = (pos + 1) % self.window
+        self._ticks += 1
+        self.version += 1
+        if self._ticks % RESYNC_TICKS == 0:
+            self._resync()
+
+    def _accumulate(self, rates: np.ndarray, returns: np.ndarray, sign: float) -> None:
+        valid = ~np.isnan(rates)
+        deviation = np.where(valid, rates - self._anchor, 0.0)
+        self._count += sign * valid
+        self._sum += sign * deviation
+        self._sumsq += sign * deviation ** 2
+
+        valid_ret = np.isfinite(returns)
+        self._ret_count += sign * valid_ret
+        self._ret_sumsq += sign * np.where(valid_ret, returns, 0.0) ** 2
+
+    def _add(self, rates: np.ndarray, returns: np.ndarray) -> None:
+        self._accumulate(rates, returns, 1.0)
+
+    def _remove(self, rates: np.ndarray, returns: np.ndarray) -> None:
+        self._accumulate(rates, returns, -1.0)
+
+    def _resync(self) -> None:
+        """Recompute the running sums from the window matrix."""
+        self._reset_sums()
+        valid = ~np.isnan(self._rates)
+        deviation = np.where(valid, self._rates - self._anchor[:, None], 0.0)
+        self._count = valid.sum(axis=1).astype(np.float64)
+        self._sum = deviation.sum(axis=1)
+        self._sumsq = (deviation ** 2).sum(axis=1)
+
+        valid_ret = np.isfinite(self._returns)
+        self._ret_count = valid_ret.sum(axis=1).astype(np.float64)
+        self._ret_sumsq = (np.where(valid_ret, self._returns, 0.0) ** 2).sum(axis=1)
+
+    def rolling_stats(self) -> Dict[str, np.ndarray]:
+        """
+        Rolling statistics of every pair over the window.
+
+        Returns:
+            dict: Per-pair arrays 'count', 'mean', 'std' (population), 'cv' (std / mean, %)
+            and 'realized' (square root of the summed squared log returns, %)
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            count = self._count
+            mean_dev = self._sum / count
+            variance = np.maximum(self._sumsq / count - mean_dev ** 2, 0.0)
+            mean = self._anchor + mean_dev
+            std = np.sqrt(variance)
+            cv = np.where(mean > 0, std / mean * 100, 0.0)
+            realized = np.sqrt(self._ret_sumsq) * 100
+        return {"count": count, "mean": mean, "std": std, "cv": cv, "realized": realized}
+
+    def market_volatility(self, current: np.ndarray, reference: np.ndarray) -> Tuple[float, np.ndarray]:
+        """
+        Score every pair and the market in one pass.
+
+        The pair score weights the move from the reference price (70%) against the rolling
+        coefficient of variation (30%); the market index is the 80th percentile of the pair
+        scores (or the maximum with fewer than five pairs), scaled so a 5% move reads 100.
+
+        Args:
+            current: Current rate per pair row (NaN if unknown)
+            reference: Reference rate per pair row (previous close or last rate, NaN if unknown)
+
+        Returns:
+            tuple: (volatility index 0-100, per-row scores with NaN for pairs without data)
+        """
+        stats = self.rolling_stats()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            percent_change = np.abs((current - reference) / reference * 100)
+        historical = np.where(stats["count"] >= MIN_HISTORY_POINTS, stats["cv"], 0.0)
+        scores = RECENT_CHANGE_WEIGHT * percent_change + (1 - RECENT_CHANGE_WEIGHT) * historical
+
+        valid = scores[np.isfinite(scores)]
+        if not len(valid):
+            return 0.0, scores
+        high = np.percentile(valid, 80) if len(valid) >= 5 else valid.max()
+        return float(min(100.0, high / INDEX_SCALE_PCT * 100)), scores
+
+
+def build_volatility_engine(rate_histories: Dict, pair_keys: List[str],
+                            window: int = VOLATILITY_WINDOW) -> VolatilityEngine:
+    """
+    Create an engine for the given pairs, seeded from their rate histories.
+
+    Args:
+        rate_histories: Pair key to RateHistory
+        pair_keys: Pair keys to track
+        window: Ticks per pair
+
+    Returns:
+        VolatilityEngine
+    """
+    engine = VolatilityEngine(window)
+    engine.sync_pairs(pair_keys)
+    for pair_key in engine.pair_keys:
+        history = rate_histories.get(pair_key)
+        if history is not None and len(history):
+            engine.seed(pair_key, history.rates(window))
+    return engine
@@ -5,9 +5,11 @@ from datetime import datetime
 from fx_news.services.sentiment_service import get_sentiment_for_pair
 from fx_news.services.events_service import display_economic_calendar_for_currency_pair
 from fx_news.utils.notifications import add_notification
-from fx_news.scrapers.rates_scraper import display_combined_charts
+from fx_news.scrapers.rates_scraper import display_combined_charts, load_five_day_chart_data, get_chart_indicators
 from fx_news.predict.predictions import add_forecast_to_dashboard, add_forecast_comparison_card, add_darts_forecast_tab
+from fx_news.utils.render_profiler import profile_component, subscription_label
 
+@profile_component(detail=subscription_label)
 def display_currency_pair(sub):
     """
     Display a currency pair card with real-time data, charts, and forecasts
@@ -120,6 +122,9 @@ def display_currency_pair(sub):
             with darts_tab:
                 # NEW: DARTS forecasting tab
                 add_darts_forecast_tab(sub)
+                
+                # Side-by-side view of Prophet, DARTS and the fast baseline
+                add_forecast_comparison_card(sub)
             
             with calendar_tab:
                 # Economic calendar
@@ -130,6 +135,7 @@ def display_currency_pair(sub):
                 from fx_news.services.sentiment_service import display_sentiment_tab
                 display_sentiment_tab(sub['base'], sub['quote'])
 
+@profile_component(detail=subscription_label)
 def display_rate_info_tab(sub, key_base):
     """Display the rate information tab content"""
     # Top row with remove button
@@ -203,6 +209,8 @@ def display_rate_info_tab(sub, key_base):
             change_color = "green" if percent_change > 0 else "red" if percent_change < 0 else "gray"
             sign = "+" if percent_change > 0 else ""
             st.markdown(f"**Change:** <span style='color:{change_color};font-weight:bold;'>{sign}{percent_change:.4f}%</span>", unsafe_allow_html=True)
+
+        display_indicator_summary(sub)
     else:
         st.info("Loading rate data...")
 
@@ -222,4 +230,88 @@ def display_rate_info_tab(sub, key_base):
             if s['base'] == sub['base'] and s['quote'] == sub['quote']:
                 st.session_state.subscriptions[i]["threshold"] = new_threshold
                 add_notification(f"Updated threshold for {sub['base']}/{sub['quote']} to {new_threshold}%", "system")
-                break
\ No newline at end of file
+                break
+
+    # Price level alerts (0 disables a level)
+    level_cols = st.columns(2)
+    with level_cols[0]:
+        alert_above = st.number_input(
+            "Alert above",
+            min_value=0.0,
+            value=float(sub.get("alert_above") or 0.0),
+            format="%.4f",
+            key=f"alert_above_{key_base}"
+        )
+    with level_cols[1]:
+        alert_below = st.number_input(
+            "Alert below",
+            min_value=0.0,
+            value=float(sub.get("alert_below") or 0.0),
+            format="%.4f",
+            key=f"alert_below_{key_base}"
+        )
+
+    if alert_above != (sub.get("alert_above") or 0.0) or alert_below != (sub.get("alert_below") or 0.0):
+        for i, s in enumerate(st.session_state.subscriptions):
+            if s['base'] == sub['base'] and s['quote'] == sub['quote']:
+                st.session_state.subscriptions[i]["alert_above"] = alert_above or None
+                st.session_state.subscriptions[i]["alert_below"] = alert_below or None
+                add_notification(f"Updated level alerts for {sub['base']}/{sub['quote']}", "system")
+                break
+
+
+@profile_component(detail=subscription_label)
+def display_indicator_summary(sub):
+    """Display the latest 5-day technical indicators of a currency pair"""
+    five_day_df = load_five_day_chart_data(sub['base'], sub['quote'])
+    indicators = get_chart_indicators(sub['base'], sub['quote'], "5d", five_day_df)
+    if indicators is None:
+        return
+
+    latest = indicators.latest()
+    last_rate = indicators.rates.at(-1)
+
+    def fmt(value, pattern):
+        return "N/A" if value != value else pattern.format(value)
+
+    rsi = latest['rsi']
+    if rsi != rsi:
+        rsi_color = "#6c757d"
+    elif rsi >= 70:
+        rsi_color = "red"
+    elif rsi <= 30:
+        rsi_color = "green"
+    else:
+        rsi_color = "#6c757d"
+
+    atr_pct = latest['atr'] / last_rate * 100 if last_rate else float('nan')
+
+    sma_20, sma_50 = latest['sma_20'], latest['sma_50']
+    if sma_20 != sma_20 or sma_50 != sma_50:
+        trend, trend_color = "N/A", "#6c757d"
+    elif sma_20 > sma_50:
+        trend, trend_color = "Bullish", "green"
+    elif sma_20 < sma_50:
+        trend, trend_color = "Bearish", "red"
+    else:
+        trend, trend_color = "Neutral", "#6c757d"
+
+    html = f"""
+    <div style="display: flex; justify-content: space-between; margin: 10px 0 5px 0;">
+        <span>RSI (14):</span>
+        <span style="color: {rsi_color};">{fmt(rsi, "{:.1f}")}</span>
+    </div>
+    <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
+        <span>ATR (14):</span>
+        <span style="color: #6c757d;">{fmt(atr_pct, "{:.3f}%")}</span>
+    </div>
+    <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
+        <span>Realized Vol (20):</span>
+        <span style="color: #6c757d;">{fmt(latest['realized_vol'], "{:.3f}%")}</span>
+    </div>
+    <div style="display: flex; justify-content: space-between; margin-bottom: 10px;">
+        <span>SMA 20/50 Trend:</span>
+        <span style="color: {trend_color};">{trend}</span>
+    </div>
+    """
+    st.markdown(html, unsafe_allow_html=True)
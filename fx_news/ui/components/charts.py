@@ -12,6 +12,9 @@ import random
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
+from fx_news.utils.downsample import downsample_frame
+from fx_news.utils.render_profiler import profile_component
+
 def display_rate_history_chart(pair_key: str, title: str = None):
     """
     Display a chart of rate history for a currency pair.
@@ -25,11 +28,10 @@ def display_rate_history_chart(pair_key: str, title: str = None):
         return
         
     # Prepare data
-    history_data = st.session_state.rate_history[pair_key]
-    df = pd.DataFrame(history_data)
+    df = st.session_state.rate_history[pair_key].to_frame()
     
     # Create dark-themed figure
-    fig = px.line(df, x="timestamp", y="rate", 
+    fig = px.line(downsample_frame(df), x="timestamp", y="rate", 
                 title=title or f"Rate History",
                 labels={"timestamp": "Time", "rate": "Rate"})
     
@@ -480,7 +482,7 @@ def display_simulated_5day_chart(base: str, quote: str):
     })
     
     # Create the chart
-    fig = px.line(df, x="timestamp", y="rate", 
+    fig = px.line(downsample_frame(df), x="timestamp", y="rate", 
                 title=f"{base}/{quote} - Last 5 Days",
                 labels={"timestamp": "Time", "rate": "Rate"})
     
@@ -579,7 +581,7 @@ def display_simulated_historical_chart(base: str, quote: str):
     })
     
     # Create the chart
-    fig = px.line(df, x="timestamp", y="rate", 
+    fig = px.line(downsample_frame(df), x="timestamp", y="rate", 
                 title=f"{base}/{quote} - Historical Data",
                 labels={"timestamp": "Date", "rate": "Rate"})
     
@@ -616,6 +618,7 @@ def display_simulated_historical_chart(base: str, quote: str):
 
 
 # Add this to display the market volatility index
+@profile_component()
 def display_volatility_index(volatility_index, pair_volatility):
     """
     Display the market volatility index as a gauge and pair-specific volatility.
@@ -7,6 +7,7 @@ import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Optional
+from fx_news.utils.render_profiler import profile_component
 
 def display_fx_maps(map_data: List[Dict[str, Any]]):
     """
@@ -136,6 +137,7 @@ def display_region_map(map_data: List[Dict[str, Any]], filter_locations: List[st
 
     st.plotly_chart(fig, use_container_width=True)
 
+@profile_component()
 def display_indices_world_map():
     """Create a world map visualization showing performance of major indices by region"""
     
@@ -285,6 +287,7 @@ def display_indices_world_map():
 
 
 
+@profile_component()
 def display_indices_visualization():
     """Display an indices market visualization with performance bars"""
     
@@ -358,6 +361,7 @@ def display_indices_visualization():
     
     st.plotly_chart(fig, use_container_width=True)
 
+@profile_component()
 def display_crypto_market_visualization():
     """Display a cryptocurrency market visualization using a treemap"""
     
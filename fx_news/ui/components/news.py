@@ -1,8 +1,17 @@
+import bisect
+import time
 import streamlit as st
 from datetime import datetime
 from datetime import datetime, timedelta
 from fx_news.services.news_service import fetch_news, filter_news_by_market_type, reset_news_session_state, debug_news_file_loading
+from fx_news.data.models import NewsItem, compact_news, newest_first, MARKET_FX, MARKET_CRYPTO, MARKET_INDICES, MARKET_GENERAL
 from fx_news.utils.notifications import add_notification
+from fx_news.utils import metrics
+from fx_news.utils.render_profiler import profile_component
+
+# Page sizes offered by the news feed
+NEWS_PAGE_SIZES = [10, 20, 50]
+DEFAULT_NEWS_PAGE_SIZE = 20
 
 def force_load_news_files():
     """Force load news files from the disk, bypassing the usual loading mechanism."""
@@ -121,30 +130,27 @@ def force_load_news_files():
                     currency_pairs = {currency}
             
             # Create news item
-            news_item = {
-                "title": title,
-                "summary": summary,
-                "source": source,
-                "timestamp": file_date,
-                "unix_timestamp": file_timestamp,
-                "currency": currency,
-                "currency_pairs": currency_pairs,
-                "sentiment": sentiment,
-                "score": score,
-                "file_path": file_path,
-                # Add market type flags
-                "is_fx": True,  # Default to all types for now to ensure display
-                "is_crypto": True,
-                "is_indices": True,
-                "is_market": True
-            }
+            news_item = NewsItem(
+                title=title,
+                summary=summary,
+                source=source,
+                timestamp=file_date,
+                unix_timestamp=file_timestamp,
+                currency=currency,
+                currency_pairs=currency_pairs,
+                sentiment=sentiment,
+                score=score,
+                file_path=file_path,
+                # Default to all market types for now to ensure display
+                flags=MARKET_FX | MARKET_CRYPTO | MARKET_INDICES | MARKET_GENERAL
+            )
             
             all_news.append(news_item)
         except Exception as e:
             st.error(f"Error processing {filename}: {str(e)}")
     
     # Sort by timestamp (newest first)
-    all_news.sort(key=lambda x: x["timestamp"], reverse=True)
+    all_news = newest_first(all_news)
     
     # Update session state
     st.session_state.fx_news = all_news.copy()
@@ -163,6 +169,7 @@ def force_load_news_files():
     return all_news
 
 
+@profile_component()
 def display_news_sidebar():
 
     # Reset all news-related state to force a fresh load
@@ -436,14 +443,229 @@ def simple_news_debug():
         # Optional: Force rerun
         st.rerun()
 
+    display_pipeline_timings()
+
+
+def display_pipeline_timings():
+    """Show the per-stage timing breakdown of recent news refreshes, with metric exports."""
+    st.subheader("Pipeline Timings")
+
+    refreshes = metrics.registry.refresh_breakdowns()
+    if not refreshes:
+        st.info("No news refresh has been timed yet in this process.")
+        return
+
+    labels = [
+        f"{datetime.fromtimestamp(r['started']).strftime('%H:%M:%S')} - {r['name']} ({r['wall_seconds']:.1f}s)"
+        for r in refreshes
+    ]
+    choice = st.selectbox("Refresh", range(len(refreshes)), format_func=lambda i: labels[i],
+                          key="pipeline_timings_refresh")
+    refresh = refreshes[choice]
+    wall = refresh["wall_seconds"]
+
+    # Stages run in worker threads overlap, so shares can add up to more than 100%
+    rows = [
+        {
+            "Stage": stage,
+            "Calls": stats["count"],
+            "Errors": stats["errors"],
+            "Total (s)": round(stats["total_seconds"], 3),
+            "Mean (ms)": round(stats["mean_seconds"] * 1000, 1),
+            "Max (ms)": round(stats["max_seconds"] * 1000, 1),
+            "Share of refresh": f"{stats['total_seconds'] / wall:.0%}" if wall else "-",
+        }
+        for stage, stats in refresh["stages"].items()
+    ]
+    st.write(f"Wall time: {wall:.2f}s")
+    st.dataframe(rows, hide_index=True, use_container_width=True)
+    if refresh["counters"]:
+        st.write(", ".join(f"{name}: {value:g}" for name, value in refresh["counters"].items()))
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("Export Prometheus", metrics.registry.to_prometheus(),
+                           file_name="news_metrics.prom", mime="text/plain")
+    with col2:
+        st.download_button("Export JSON", metrics.registry.to_json(),
+                           file_name="news_metrics.json", mime="application/json")
+
+
+
+def _feed_key(item):
+    """Sort key of a news item in the feed: newest first, ties broken by article identity."""
+    return (-(item.epoch or 0), item.article_id or item.url or item.title or "")
+
+
+def build_feed_index(news_items):
+    """
+    Sort a news feed once and keep the index in session state until the items change.
+
+    Args:
+        news_items: List of news items (dicts or NewsItem records)
+
+    Returns:
+        dict: 'items' (NewsItem records, newest first), 'keys' (their sort keys, ascending,
+        used as page cursors) and 'multi_day' (whether the feed spans more than one day)
+    """
+    # The cached index holds the records, so their ids cannot be reused while it lives
+    signature = (len(news_items), hash(tuple(map(id, news_items))))
+    index = st.session_state.get('news_feed_index')
+    if index is not None and index['signature'] == signature:
+        return index
+
+    items = sorted(compact_news(news_items), key=_feed_key)
+    days = {datetime.fromtimestamp(item.epoch).date() for item in (items[:1] + items[-1:]) if item.epoch}
+    index = {
+        'signature': signature,
+        'items': items,
+        'keys': [_feed_key(item) for item in items],
+        'multi_day': len(days) > 1,
+    }
+    st.session_state.news_feed_index = index
+    return index
+
+
+def feed_page_bounds(index, cursor, page_size):
+    """
+    Slice of the feed index shown for a page cursor.
+
+    A cursor is the sort key of the first item of a page, so a page stays anchored on the same
+    articles when newer news arrives at the top of the feed between reruns.
+
+    Args:
+        index: Feed index from build_feed_index
+        cursor: Sort key of the first item of the page (None for the newest page)
+        page_size: Number of items per page
+
+    Returns:
+        tuple: (start, end) positions in index['items']
+    """
+    start = 0 if cursor is None else bisect.bisect_left(index['keys'], cursor)
+    return start, min(start + page_size, len(index['items']))
+
+
+def _push_feed_cursor(cursors_key, cursor):
+    st.session_state[cursors_key].append(cursor)
+
+
+def _pop_feed_cursor(cursors_key):
+    if len(st.session_state[cursors_key]) > 1:
+        st.session_state[cursors_key].pop()
+
+
+def _reset_feed_cursor(cursors_key):
+    st.session_state[cursors_key] = [None]
+
 
+def _relative_time(epoch, now):
+    """Relative time of an epoch timestamp, e.g. '3h ago'."""
+    if epoch is None:
+        return ""
+    seconds = now - epoch
+    if seconds >= 86400:
+        return f"{seconds // 86400}d ago"
+    if seconds >= 3600:
+        return f"{seconds // 3600}h ago"
+    if seconds >= 60:
+        return f"{seconds // 60}m ago"
+    return "just now"
 
+
+def _news_card_html(item, time_str, market_type):
+    """
+    HTML card of one news item in the feed.
+
+    Args:
+        item: News item to render
+        time_str: Relative time of the item (e.g., '3h ago')
+        market_type: Current market type ('FX', 'Crypto' or 'Indices')
+
+    Returns:
+        str: Card HTML for st.markdown
+    """
+    # Create color based on sentiment
+    if 'sentiment' in item and item['sentiment'] == 'positive':
+        border_color = "green"
+        bg_color = "#d4edda"
+        text_color = "#28a745"
+    elif 'sentiment' in item and item['sentiment'] == 'negative':
+        border_color = "red"
+        bg_color = "#f8d7da"
+        text_color = "#dc3545"
+    else:  # neutral
+        border_color = "gray"
+        bg_color = "#f8f9fa"
+        text_color = "#6c757d"
+
+    # Customize the badge color based on market type
+    currency_badge = item.get('currency', 'Unknown')
+
+    # Set badge color based on market type
+    badge_bg = "#e0e8ff"  # Default blue
+    badge_text = "black"
+
+    # Check if the item has market type flags
+    if item.get('is_crypto', False) or market_type == 'Crypto':
+        badge_bg = "#9C27B0"  # Purple for crypto
+        badge_text = "white"
+    elif item.get('is_indices', False) or market_type == 'Indices':
+        badge_bg = "#FF9800"  # Orange for indices
+        badge_text = "white"
+    elif item.get('is_fx', False) or market_type == 'FX':
+        badge_bg = "#1E88E5"  # Blue for FX
+        badge_text = "white"
+    elif currency_badge == "Market":
+        badge_bg = "#607D8B"  # Gray-blue for general market
+        badge_text = "white"
+
+    # Title with link if available
+    title_html = f"""<div style="padding:12px; margin-bottom:12px; border-left:4px solid {border_color}; border-radius:4px; background-color:#ffffff;">"""
+
+    if 'url' in item and item['url']:
+        title_html += f"""<div style="font-weight:bold; margin-bottom:8px;">
+            <a href="{item['url']}" target="_blank" style="text-decoration:none; color:#1e88e5;">
+                {item['title']} <span style="font-size:0.8em;">🔗</span>
+            </a>
+        </div>"""
+    else:
+        title_html += f"""<div style="font-weight:bold; margin-bottom:8px;">{item['title']}</div>"""
+
+    # Add a brief summary if available (truncated)
+    if 'summary' in item and item['summary']:
+        summary = item['summary']
+        if len(summary) > 150:
+            summary = summary[:147] + "..."
+        title_html += f"""<div style="font-size:0.9em; color:#333; margin-bottom:8px;">{summary}</div>"""
+
+    # Add the currency badge and metadata
+    title_html += f"""
+        <div style="display:flex; justify-content:space-between; align-items:center;">
+            <div>
+                <span style="background-color:{badge_bg}; color:{badge_text}; padding:2px 6px; border-radius:3px; margin-right:5px; font-size:0.8em;">
+                    {currency_badge}
+                </span>
+                <span style="color:#6c757d; font-size:0.8em;">{item['source']}</span>
+            </div>
+            <div>
+                <span style="color:#6c757d; font-size:0.8em; margin-right:5px;">{time_str}</span>
+                <span style="background-color:{bg_color}; color:{text_color}; padding:2px 6px; border-radius:10px; font-size:0.8em;">
+                    {item.get('sentiment', 'neutral')} ({'+' if item.get('score', 0) > 0 else ''}{item.get('score', 0)})
+                </span>
+            </div>
+        </div>
+    </div>"""
+    return title_html
+
+
+@profile_component()
 def display_news_items(news_items):
     """
     Display news items with better debugging information and market-specific styling.
+    Items are shown one page at a time, with cursor-based Newest/Newer/Older navigation.
     
     Args:
-        news_items: List of news item dictionaries to display
+        news_items: List of news items (dicts or NewsItem records) to display
     """
     # Check if we have any news to display
     if not news_items:
@@ -475,118 +697,41 @@ def display_news_items(news_items):
                         st.markdown(f"Market types: {', '.join(flags) if flags else 'None'}")
         return
     
-    # Group items by day for better organization
-    grouped_news = {}
-    for item in news_items:
-        # Extract the date (just the day)
-        if 'timestamp' in item:
-            day_key = item['timestamp'].strftime('%Y-%m-%d')
-        else:
-            day_key = "Unknown Date"
-            
-        if day_key not in grouped_news:
-            grouped_news[day_key] = []
-            
-        grouped_news[day_key].append(item)
-    
-    # Order days with most recent first
-    sorted_days = sorted(grouped_news.keys(), reverse=True)
-    
-    for day in sorted_days:
-        # Only add date header if more than one day
-        if len(sorted_days) > 1:
-            # Format the date nicely
-            try:
-                display_date = datetime.strptime(day, '%Y-%m-%d').strftime('%A, %B %d, %Y')
-                st.markdown(f"### {display_date}")
-            except:
+    # Only the visible page is rendered, located by cursor in a cached, pre-sorted index
+    index = build_feed_index(news_items)
+    market_type = st.session_state.market_type
+    cursors_key = f"news_feed_cursors_{market_type}"
+    if cursors_key not in st.session_state:
+        st.session_state[cursors_key] = [None]
+    cursors = st.session_state[cursors_key]
+
+    page_size = st.selectbox("News per page", NEWS_PAGE_SIZES,
+                             index=NEWS_PAGE_SIZES.index(DEFAULT_NEWS_PAGE_SIZE), key="news_page_size")
+    start, end = feed_page_bounds(index, cursors[-1], page_size)
+    total = len(index['items'])
+    page = index['items'][start:end]
+    next_cursor = index['keys'][end] if end < total else None
+
+    newest_col, newer_col, older_col = st.columns(3)
+    newest_col.button("Newest", key="news_page_newest", disabled=len(cursors) == 1,
+                      on_click=_reset_feed_cursor, args=(cursors_key,))
+    newer_col.button("‹ Newer", key="news_page_newer", disabled=len(cursors) == 1,
+                     on_click=_pop_feed_cursor, args=(cursors_key,))
+    older_col.button("Older ›", key="news_page_older", disabled=next_cursor is None,
+                     on_click=_push_feed_cursor, args=(cursors_key, next_cursor))
+    st.caption(f"Showing {start + 1 if page else 0}-{end} of {total} news items")
+
+    # Relative times and day headers are computed once for the page
+    now = int(time.time())
+    time_strs = [_relative_time(item.epoch, now) for item in page]
+    current_day = None
+
+    for item, time_str in zip(page, time_strs):
+        # Only add date headers if the feed spans more than one day
+        if index['multi_day']:
+            day = datetime.fromtimestamp(item.epoch).strftime('%A, %B %d, %Y') if item.epoch else "Unknown Date"
+            if day != current_day:
                 st.markdown(f"### {day}")
-        
-        # Display each item for this day
-        for item in sorted(grouped_news[day], key=lambda x: x.get('timestamp', datetime.now()), reverse=True):
-            # Format timestamp
-            time_diff = datetime.now() - item["timestamp"]
-            if time_diff.days > 0:
-                time_str = f"{time_diff.days}d ago"
-            elif time_diff.seconds // 3600 > 0:
-                time_str = f"{time_diff.seconds // 3600}h ago"
-            elif time_diff.seconds // 60 > 0:
-                time_str = f"{time_diff.seconds // 60}m ago"
-            else:
-                time_str = "just now"
-
-            # Create color based on sentiment
-            if 'sentiment' in item and item['sentiment'] == 'positive':
-                border_color = "green"
-                bg_color = "#d4edda"
-                text_color = "#28a745"
-            elif 'sentiment' in item and item['sentiment'] == 'negative':
-                border_color = "red"
-                bg_color = "#f8d7da"
-                text_color = "#dc3545"
-            else:  # neutral
-                border_color = "gray"
-                bg_color = "#f8f9fa"
-                text_color = "#6c757d"
-
-            # Customize the badge color based on market type
-            currency_badge = item.get('currency', 'Unknown')
-            
-            # Set badge color based on market type
-            badge_bg = "#e0e8ff"  # Default blue
-            badge_text = "black"
-            
-            # Check if the item has market type flags
-            if item.get('is_crypto', False) or st.session_state.market_type == 'Crypto':
-                badge_bg = "#9C27B0"  # Purple for crypto
-                badge_text = "white"
-            elif item.get('is_indices', False) or st.session_state.market_type == 'Indices':
-                badge_bg = "#FF9800"  # Orange for indices
-                badge_text = "white"
-            elif item.get('is_fx', False) or st.session_state.market_type == 'FX':
-                badge_bg = "#1E88E5"  # Blue for FX
-                badge_text = "white"
-            elif currency_badge == "Market":
-                badge_bg = "#607D8B"  # Gray-blue for general market
-                badge_text = "white"
-
-            # Display the news item
-            with st.container():
-                # Title with link if available
-                title_html = f"""<div style="padding:12px; margin-bottom:12px; border-left:4px solid {border_color}; border-radius:4px; background-color:#ffffff;">"""
-                
-                if 'url' in item and item['url']:
-                    title_html += f"""<div style="font-weight:bold; margin-bottom:8px;">
-                        <a href="{item['url']}" target="_blank" style="text-decoration:none; color:#1e88e5;">
-                            {item['title']} <span style="font-size:0.8em;">🔗</span>
-                        </a>
-                    </div>"""
-                else:
-                    title_html += f"""<div style="font-weight:bold; margin-bottom:8px;">{item['title']}</div>"""
-                
-                # Add a brief summary if available (truncated)
-                if 'summary' in item and item['summary']:
-                    summary = item['summary']
-                    if len(summary) > 150:
-                        summary = summary[:147] + "..."
-                    title_html += f"""<div style="font-size:0.9em; color:#333; margin-bottom:8px;">{summary}</div>"""
-                
-                # Add the currency badge and metadata
-                title_html += f"""
-                    <div style="display:flex; justify-content:space-between; align-items:center;">
-                        <div>
-                            <span style="background-color:{badge_bg}; color:{badge_text}; padding:2px 6px; border-radius:3px; margin-right:5px; font-size:0.8em;">
-                                {currency_badge}
-                            </span>
-                            <span style="color:#6c757d; font-size:0.8em;">{item['source']}</span>
-                        </div>
-                        <div>
-                            <span style="color:#6c757d; font-size:0.8em; margin-right:5px;">{time_str}</span>
-                            <span style="background-color:{bg_color}; color:{text_color}; padding:2px 6px; border-radius:10px; font-size:0.8em;">
-                                {item.get('sentiment', 'neutral')} ({'+' if item.get('score', 0) > 0 else ''}{item.get('score', 0)})
-                            </span>
-                        </div>
-                    </div>
-                </div>"""
-                
-                st.markdown(title_html, unsafe_allow_html=True)
\ No newline at end of file
+                current_day = day
+
+        st.markdown(_news_card_html(item, time_str, market_type), unsafe_allow_html=True)
\ No newline at end of file
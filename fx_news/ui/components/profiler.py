@@ -0,0 +1,125 @@
+"""
+Render profiler panel for the sidebar.
+Starts a profile at the top of a rerun when profiling is switched on, and shows the per-component
+table and a flame-style timeline of the last profiled reruns.
+"""
+import streamlit as st
+import plotly.graph_objects as go
+from collections import deque
+from datetime import datetime
+
+from fx_news.utils.render_profiler import PROFILE_RENDER, MAX_PROFILES, start_profile, stop_profile
+
+# Colors cycled over component names in the flame bar
+FLAME_COLORS = ["#4D9BF0", "#FF9800", "#4CAF50", "#E91E63", "#9C27B0", "#00BCD4", "#FFC107", "#8BC34A", "#F44336", "#795548"]
+
+SORT_COLUMNS = {
+    "Total time": "total_ms",
+    "Self time": "self_ms",
+    "Calls": "calls",
+    "Plotly payload": "plotly_kb",
+    "Cache misses": "cache_misses",
+}
+
+
+def begin_render_profile(page: str):
+    """
+    Start profiling this rerun if enabled by FX_PROFILE_RENDER or the sidebar toggle.
+
+    Call at the top of the page script, before any component renders.
+
+    Args:
+        page: Name of the page, shown in the profiler panel
+    """
+    if PROFILE_RENDER or st.session_state.get("render_profiling", False):
+        start_profile(page)
+
+
+def display_render_profiler():
+    """
+    Finish the current profile and show the profiler panel in the sidebar.
+
+    Call at the end of the page script so every component of the rerun is included.
+    """
+    profile = stop_profile()
+    if 'render_profiles' not in st.session_state:
+        st.session_state.render_profiles = deque(maxlen=MAX_PROFILES)
+    if profile is not None and profile.calls:
+        st.session_state.render_profiles.appendleft(profile)
+
+    with st.sidebar.expander("Render Profiler"):
+        st.checkbox("Profile reruns", key="render_profiling", value=PROFILE_RENDER,
+                    help="Record wall time, Plotly payload and cache hits per component on each rerun")
+
+        profiles = list(st.session_state.render_profiles)
+        if not profiles:
+            st.caption("No profiled rerun yet. Switch profiling on and interact with the page.")
+            return
+
+        labels = [
+            f"{datetime.fromtimestamp(p.started).strftime('%H:%M:%S')} - {p.page} ({p.wall_seconds:.2f}s)"
+            for p in profiles
+        ]
+        choice = st.selectbox("Rerun", range(len(profiles)), format_func=lambda i: labels[i],
+                              key="render_profile_choice")
+        profile = profiles[choice]
+
+        sort_by = st.selectbox("Sort by", list(SORT_COLUMNS), key="render_profile_sort")
+        rows = sorted(profile.summary(), key=lambda r: r[SORT_COLUMNS[sort_by]], reverse=True)
+        st.write(f"Rerun: {profile.wall_seconds * 1000:.0f} ms, "
+                 f"Plotly: {sum(r['plotly_kb'] for r in rows):.0f} KB")
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+
+        st.plotly_chart(create_flame_chart(profile), use_container_width=True)
+
+        if st.button("Clear Profiles"):
+            st.session_state.render_profiles.clear()
+            st.rerun()
+
+
+def create_flame_chart(profile):
+    """
+    Flame-style timeline of a rerun: one bar per component call, nested calls stacked below.
+
+    Args:
+        profile: RerunProfile to draw
+
+    Returns:
+        go.Figure: Horizontal bar chart with time (ms) on the x axis and call depth on the y axis
+    """
+    names = list(dict.fromkeys(call["name"] for call in profile.calls))
+    color_of = {name: FLAME_COLORS[i % len(FLAME_COLORS)] for i, name in enumerate(names)}
+
+    calls = profile.calls
+    labels = [f"{c['name']} ({c['detail']})" if c["detail"] else c["name"] for c in calls]
+    fig = go.Figure(go.Bar(
+        x=[c["seconds"] * 1000 for c in calls],
+        base=[c["start"] * 1000 for c in calls],
+        y=[c["depth"] for c in calls],
+        orientation="h",
+        marker_color=[color_of[c["name"]] for c in calls],
+        marker_line_width=0.5,
+        marker_line_color="#1E1E1E",
+        text=labels,
+        textposition="inside",
+        insidetextanchor="start",
+        hovertext=[
+            f"{label}<br>{c['seconds'] * 1000:.1f} ms, {c['plotly_bytes'] / 1024:.0f} KB, "
+            f"{c['cache_hits']} hits / {c['cache_misses']} misses"
+            for label, c in zip(labels, calls)
+        ],
+        hoverinfo="text",
+    ))
+    max_depth = max(c["depth"] for c in calls) if calls else 0
+    fig.update_layout(
+        height=80 + 28 * (max_depth + 1),
+        margin=dict(l=10, r=10, t=10, b=30),
+        bargap=0.05,
+        showlegend=False,
+        plot_bgcolor="#1E1E1E",
+        paper_bgcolor="#1E1E1E",
+        font=dict(color="white", size=10),
+        xaxis=dict(title="ms", gridcolor="#333333"),
+        yaxis=dict(autorange="reversed", showticklabels=False, showgrid=False),
+    )
+    return fig
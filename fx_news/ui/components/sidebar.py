@@ -7,6 +7,7 @@ from typing import Dict, List, Any, Callable
 from datetime import datetime
 import gc
 from fx_news.utils.notifications import add_notification
+from fx_news.utils.render_profiler import profile_component
 from fx_news.data.session import switch_market_type
 from fx_news.services.rates_service import update_rates
 from fx_news.services.sentiment_service import update_all_sentiment_data
@@ -15,6 +16,7 @@ from fx_news.config.settings import (
     fx_currencies, crypto_currencies, indices
 )
 
+@profile_component()
 def create_sidebar():
     """Create the sidebar UI for the FX Monitor page."""
     with st.sidebar:
@@ -7,7 +7,9 @@ from fx_news.ui.components.news import display_news_sidebar
 from fx_news.ui.components.cards import display_currency_pair
 from fx_news.services.rates_service import calculate_percentage_variation, prepare_map_data
 from fx_news.data.currencies import currency_to_country
+from fx_news.utils.render_profiler import profile_component
 
+@profile_component()
 def create_layout(volatility_index, pair_volatility):
     """
     Create the main layout for the Market Monitor page.
@@ -172,6 +174,7 @@ def create_volatility_gauge(volatility_index):
     
     return fig
 
+@profile_component()
 def display_trader_sentiment_overview():
     """Display the trader sentiment overview section"""
     # Import here to avoid circular imports
@@ -310,6 +313,7 @@ def create_sentiment_gauge(long_pct, pair_name):
     # Display the gauge
     st.plotly_chart(fig, use_container_width=True)
 
+@profile_component()
 def display_fx_maps(map_data):
     """Display FX market maps for different regions"""
     import plotly.graph_objects as go
@@ -431,6 +435,7 @@ def display_fx_maps(map_data):
         else:
             st.info("No variation data available for Asian countries")
 
+@profile_component()
 def display_indices_tabs():
     """Display tabs for indices visualizations"""
     tab1, tab2 = st.tabs(["Performance Overview", "World Map"])
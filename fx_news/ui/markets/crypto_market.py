@@ -8,7 +8,7 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 from fx_news.ui.components.charts import display_treemap, display_volatility_gauge
-from fx_news.services.sentiment_service import calculate_market_volatility
+from fx_news.services.rates_service import calculate_market_volatility
 
 def display_crypto_market_overview():
     """Display the cryptocurrency market overview section."""
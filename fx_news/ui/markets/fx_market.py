@@ -10,7 +10,7 @@ from typing import List, Dict, Any, Optional
 from fx_news.utils.helpers import calculate_percentage_variation, prepare_map_data
 from fx_news.data.currencies import currency_to_country
 from fx_news.ui.components.maps import display_fx_maps
-from fx_news.services.sentiment_service import calculate_market_volatility
+from fx_news.services.rates_service import calculate_market_volatility
 from fx_news.ui.components.charts import display_volatility_gauge, display_volatility_trend_chart
 
 def display_fx_market_overview():
@@ -0,0 +1,149 @@
+"""
+Downsampling of rate series before they are handed to plotly.
+A line chart cannot show more than about one point per horizontal pixel, so series are reduced
+to the chart's pixel width with largest-triangle-three-buckets (LTTB) or min/max bucketing,
+which keep the visible shape (peaks, troughs, trend) while shrinking the figure JSON.
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Width assumed for full-width charts inside a card, in pixels
+CHART_WIDTH_PX = 900
+
+# Points kept per horizontal pixel
+POINTS_PER_PIXEL = 1.0
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+
+def target_points(width_px: Optional[int] = None) -> int:
+    """
+    Number of points worth drawing on a chart of the given width.
+
+    Args:
+        width_px: Chart width in pixels (default: CHART_WIDTH_PX)
+
+    Returns:
+        int: Point budget for the chart
+    """
+    return max(3, int((width_px or CHART_WIDTH_PX) * POINTS_PER_PIXEL))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select points with largest-triangle-three-buckets.
+
+    The first and last points are kept; every bucket in between keeps the point that forms
+    the largest triangle with the point kept in the previous bucket and the mean of the next one.
+
+    Args:
+        x: Monotonic x values (e.g., int64 nanosecond timestamps)
+        y: Values
+        threshold: Number of points to keep
+
+    Returns:
+        np.ndarray: Sorted indices of the kept points
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Bucket boundaries over the points between the first and the last
+    edges = (np.arange(threshold - 1) * ((n - 2) / (threshold - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def minmax_indices(y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select the minimum and maximum of equal-width buckets.
+
+    Cheaper than LTTB and exact for the extremes, at the cost of a slightly jagged line.
+
+    Args:
+        y: Values
+        threshold: Number of points to keep (two per bucket)
+
+    Returns:
+        np.ndarray: Sorted, unique indices of the kept points
+    """
+    n = len(y)
+    if threshold >= n or threshold < 4:
+        return np.arange(n)
+
+    buckets = threshold // 2
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(buckets, size)
+    # A bucket can only be all-NaN if it is entirely padding, so drop those rows
+    padded = padded[~np.all(np.isnan(padded), axis=1)]
+    offsets = np.arange(len(padded)) * size
+    picks = np.concatenate((offsets + np.nanargmin(padded, axis=1), offsets + np.nanargmax(padded, axis=1)))
+    return np.unique(np.concatenate(([0, n - 1], picks)))
+
+
+def downsample_indices(x: np.ndarray, y: np.ndarray, max_points: Optional[int] = None,
+                       method: str = "lttb") -> np.ndarray:
+    """
+    Indices of the points to draw for a series.
+
+    Args:
+        x: Monotonic x values
+        y: Values, without NaNs
+        max_points: Point budget (default: target_points())
+        method: 'lttb' or 'minmax'
+
+    Returns:
+        np.ndarray: Sorted indices into x and y
+    """
+    max_points = max_points or target_points()
+    if method == "minmax":
+        return minmax_indices(y, max_points)
+    return lttb_indices(x, y, max_points)
+
+
+def downsample_frame(df: pd.DataFrame, x: str = "timestamp", y: str = "rate",
+                     max_points: Optional[int] = None, method: str = "lttb") -> pd.DataFrame:
+    """
+    Reduce a DataFrame to the rows worth drawing.
+
+    Rows with a missing y value are dropped first. Frames already within the budget are
+    returned unchanged.
+
+    Args:
+        df: DataFrame sorted by x
+        x: Name of the x column (datetimes or numbers)
+        y: Name of the y column
+        max_points: Point budget (default: target_points())
+        method: 'lttb' or 'minmax'
+
+    Returns:
+        pd.DataFrame: Subset of the rows, in order
+    """
+    max_points = max_points or target_points()
+    if df is None or len(df) <= max_points:
+        return df
+
+    valid = df.dropna(subset=[y])
+    x_values = valid[x].to_numpy()
+    if np.issubdtype(x_values.dtype, np.datetime64):
+        x_values = x_values.astype("datetime64[ns]").astype(np.int64)
+    indices = downsample_indices(x_values, valid[y].to_numpy(dtype=np.float64), max_points, method)
+    return valid.iloc[indices]
@@ -0,0 +1,380 @@
+"""
+Record/replay layer for the scrapers' HTTP traffic.
+Requests to Yahoo (news, articles, spark), MyFxBook, Investing.com, CoinMarketCap, Mistral and the
+currency API are served from recorded fixtures, in-process or through a local fixture server,
+with optional injected latency, so scrapers can be benchmarked and regression-tested offline.
+
+Enable with FX_HTTP_REPLAY=replay (fixtures only) or FX_HTTP_REPLAY=record (live, saving
+responses). FX_HTTP_REPLAY_LATENCY / FX_HTTP_REPLAY_JITTER add seconds per response, and
+FX_HTTP_REPLAY_SERVER=http://127.0.0.1:8766 routes replayed requests through the fixture server:
+
+    python -m fx_news.utils.http_replay serve [--port 8766] [--latency 0.2]
+    python -m fx_news.utils.http_replay list
+"""
+import argparse
+import glob
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger("http_replay")
+logger.setLevel(logging.WARNING)
+
+FIXTURES_DIR = "fx_news/scrapers/fixtures"
+RATES_DIR = "fx_news/scrapers/rates"
+
+YAHOO_HOSTS = ["finance.yahoo.com", "uk.finance.yahoo.com", "www.yahoo.com"]
+
+# Endpoints served from fixtures. 'key' lists the query parameters that identify a response
+# (others, like cache-busting random numbers, are ignored); 'body' keys on the request body too;
+# 'static' routes answer the same whatever the request, so any recording of the route can serve
+# them; 'default' is a captured page used when nothing was recorded for the request.
+ROUTES = [
+    {"name": "yahoo_spark", "hosts": ["query1.finance.yahoo.com", "query2.finance.yahoo.com"],
+     "path": r"^/v7/finance/spark", "key": ["symbols", "range", "interval"]},
+    {"name": "yahoo_news", "hosts": YAHOO_HOSTS, "path": r"^/quote/[^/]+/news",
+     "default": "fx_news/debug_page.html"},
+    {"name": "yahoo_article", "hosts": YAHOO_HOSTS, "path": r"^/(news|m|markets)/",
+     "default": "fx_news/scrapers/sample_yahoo_news.html"},
+    {"name": "myfxbook_outlook", "hosts": ["www.myfxbook.com", "myfxbook.com"], "path": r"^/community/outlook",
+     "static": True},
+    {"name": "investing_calendar", "hosts": ["www.investing.com", "investing.com"], "path": r"^/economic-calendar",
+     "static": True},
+    {"name": "coinmarketcap_events", "hosts": ["coinmarketcap.com", "www.coinmarketcap.com"], "path": r"^/events",
+     "static": True, "default": "fx_news/coinmarketcap_response.html"},
+    {"name": "mistral_chat", "hosts": ["api.mistral.ai"], "path": r"^/v1/chat/completions", "body": True},
+    {"name": "currency_api", "hosts": ["currency-api.pages.dev", "cdn.jsdelivr.net"],
+     "path": r"/currencies/[a-z0-9]+\.json$"},
+]
+
+# Reply used for Mistral calls that were never recorded
+MISTRAL_DEFAULT_REPLY = "neutral 0.50"
+
+
+def match_route(url: str) -> Optional[Dict]:
+    """Return the route serving a URL, or None if it is not replayed."""
+    parsed = urlparse(url)
+    for route in ROUTES:
+        if parsed.hostname in route["hosts"] and re.search(route["path"], parsed.path):
+            return route
+    return None
+
+
+def fixture_key(route: Dict, url: str, body: Optional[bytes] = None) -> str:
+    """Stable identifier of a request within its route."""
+    parsed = urlparse(url)
+    query = parse_qs(parsed.query)
+    parts = [parsed.path] + [f"{k}={','.join(query.get(k, []))}" for k in route.get("key", [])]
+    if route.get("body") and body:
+        parts.append(hashlib.sha1(body).hexdigest())
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:20]
+
+
+#################################
+# Fixture store
+#################################
+
+class FixtureStore:
+    """Recorded responses on disk: <dir>/<route>/<key>.json (metadata) and <key>.body."""
+
+    def __init__(self, directory: str = FIXTURES_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _paths(self, route: Dict, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, route["name"], key)
+        return f"{base}.json", f"{base}.body"
+
+    def save(self, route: Dict, url: str, body: Optional[bytes], status: int,
+             headers: Dict[str, str], content: bytes) -> None:
+        """Record a response."""
+        meta_path, body_path = self._paths(route, fixture_key(route, url, body))
+        meta = {
+            "url": url,
+            "status": status,
+            "content_type": headers.get("Content-Type", "text/html; charset=utf-8"),
+            "recorded_at": time.time(),
+        }
+        with self._lock:
+            os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+            with open(body_path, "wb") as f:
+                f.write(content)
+            with open(meta_path, "w") as f:
+                json.dump(meta, f, indent=2)
+
+    def load(self, route: Dict, url: str, body: Optional[bytes] = None) -> Optional[Tuple[int, str, bytes]]:
+        """
+        Find the response for a request.
+
+        Looks for the exact recording, then any recording of a static route, then the route's
+        captured default page or a generated answer (spark files, Mistral). Routes whose path
+        identifies the answer (a news listing's symbol, an article) never borrow another request's
+        recording.
+
+        Returns:
+            tuple: (status, content type, body), or None if nothing can serve the request
+        """
+        meta_path, body_path = self._paths(route, fixture_key(route, url, body))
+        if not os.path.exists(meta_path):
+            recorded = sorted(glob.glob(os.path.join(self.directory, route["name"], "*.json")))
+            # Only fall back across requests where the exact request does not change the answer
+            if recorded and route.get("static"):
+                meta_path = recorded[-1]
+                body_path = meta_path[:-len(".json")] + ".body"
+            else:
+                return _generated_response(route, url)
+
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            return meta["status"], meta["content_type"], f.read()
+
+    def summary(self) -> Dict[str, int]:
+        """Number of recordings per route."""
+        return {route["name"]: len(glob.glob(os.path.join(self.directory, route["name"], "*.json")))
+                for route in ROUTES}
+
+
+def _generated_response(route: Dict, url: str) -> Optional[Tuple[int, str, bytes]]:
+    """Answer from the captured pages and stored rate files when no recording exists."""
+    if route.get("default") and os.path.exists(route["default"]):
+        with open(route["default"], "rb") as f:
+            return 200, "text/html; charset=utf-8", f.read()
+
+    if route["name"] == "mistral_chat":
+        reply = {"choices": [{"message": {"role": "assistant", "content": MISTRAL_DEFAULT_REPLY}}]}
+        return 200, "application/json", json.dumps(reply).encode("utf-8")
+
+    if route["name"] == "yahoo_spark":
+        query = parse_qs(urlparse(url).query)
+        folder = "ytd" if query.get("range", ["5d"])[0] == "ytd" else "5d"
+        results = []
+        for symbol in ",".join(query.get("symbols", [])).split(","):
+            path = _spark_file(symbol, os.path.join(RATES_DIR, folder))
+            if path:
+                with open(path, "r") as f:
+                    results.extend(json.load(f).get("spark", {}).get("result", []))
+        if results:
+            return 200, "application/json", json.dumps({"spark": {"result": results, "error": None}}).encode("utf-8")
+    return None
+
+
+def _spark_file(symbol: str, folder: str) -> Optional[str]:
+    """Stored rate file of a Yahoo symbol ('EURUSD=X', 'JPY=X', 'BTC-USD', '^GSPC')."""
+    symbol = symbol.strip().upper()
+    if symbol.startswith("^"):
+        matches = glob.glob(os.path.join(folder, f"{symbol.lower()}_*.json"))
+        return matches[0] if matches else None
+    if symbol.endswith("=X"):
+        code = symbol[:-2]
+        pair = ("usd", code.lower()) if len(code) == 3 else (code[:3].lower(), code[3:].lower())
+    elif "-" in symbol:
+        pair = tuple(symbol.lower().split("-", 1))
+    else:
+        return None
+    path = os.path.join(folder, f"{pair[0]}_{pair[1]}.json")
+    return path if os.path.exists(path) else None
+
+
+#################################
+# requests integration
+#################################
+
+class ReplayAdapter(HTTPAdapter):
+    """Transport adapter that records or replays the routed endpoints."""
+
+    def __init__(self, store: FixtureStore, mode: str = "replay", latency: float = 0.0,
+                 jitter: float = 0.0, server: Optional[str] = None):
+        super().__init__()
+        self.store = store
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+        self.server = server.rstrip("/") if server else None
+
+    def send(self, request, **kwargs):
+        route = match_route(request.url)
+        body = request.body.encode("utf-8") if isinstance(request.body, str) else request.body
+
+        if route is None:
+            if self.mode == "replay":
+                return _make_response(request, 599, "text/plain", b"No replay route for this URL")
+            return super().send(request, **kwargs)
+
+        if self.mode == "record":
+            response = super().send(request, **kwargs)
+            self.store.save(route, request.url, body, response.status_code, response.headers, response.content)
+            return response
+
+        if self.server:
+            # The fixture server does the lookup and the latency; only rewrite the address
+            parsed = urlparse(request.url)
+            request.url = f"{self.server}/{parsed.hostname}{parsed.path}" + (f"?{parsed.query}" if parsed.query else "")
+            return super().send(request, **kwargs)
+
+        fixture = self.store.load(route, request.url, body)
+        _sleep(self.latency, self.jitter)
+        if fixture is None:
+            logger.warning(f"No fixture for {request.url}")
+            return _make_response(request, 404, "text/plain", b"No fixture recorded")
+        status, content_type, content = fixture
+        return _make_response(request, status, content_type, content)
+
+
+def _sleep(latency: float, jitter: float) -> None:
+    delay = latency + (random.uniform(-jitter, jitter) if jitter else 0.0)
+    if delay > 0:
+        time.sleep(delay)
+
+
+def _make_response(request, status: int, content_type: str, content: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.reason = "OK" if status == 200 else "Replay"
+    response.headers = CaseInsensitiveDict({"Content-Type": content_type, "Content-Length": str(len(content))})
+    response._content = content
+    response.encoding = "utf-8"
+    response.url = request.url
+    response.request = request
+    return response
+
+
+_original_get_adapter = requests.sessions.Session.get_adapter
+_installed_adapter: Optional[ReplayAdapter] = None
+
+
+def install(mode: str = "replay", directory: str = FIXTURES_DIR, latency: float = 0.0,
+            jitter: float = 0.0, server: Optional[str] = None) -> ReplayAdapter:
+    """
+    Route every requests call in this process through the replay adapter.
+
+    Args:
+        mode: 'replay' (fixtures only, no network) or 'record' (live, saving responses)
+        directory: Fixture folder
+        latency: Seconds added to every replayed response
+        jitter: Random +/- seconds around the latency
+        server: Fixture server base URL; replayed requests go through it when set
+
+    Returns:
+        ReplayAdapter: The installed adapter
+    """
+    global _installed_adapter
+    _installed_adapter = ReplayAdapter(FixtureStore(directory), mode, latency, jitter, server)
+    requests.sessions.Session.get_adapter = lambda self, url: _installed_adapter
+    logger.warning(f"HTTP {mode} enabled (fixtures: {directory})")
+    return _installed_adapter
+
+
+def uninstall() -> None:
+    """Restore normal network access."""
+    global _installed_adapter
+    requests.sessions.Session.get_adapter = _original_get_adapter
+    _installed_adapter = None
+
+
+def install_from_env() -> Optional[ReplayAdapter]:
+    """Install the adapter if FX_HTTP_REPLAY is 'replay' or 'record'."""
+    mode = os.environ.get("FX_HTTP_REPLAY", "").lower()
+    if mode not in ("replay", "record"):
+        return None
+    return install(
+        mode=mode,
+        directory=os.environ.get("FX_HTTP_REPLAY_DIR", FIXTURES_DIR),
+        latency=float(os.environ.get("FX_HTTP_REPLAY_LATENCY", "0")),
+        jitter=float(os.environ.get("FX_HTTP_REPLAY_JITTER", "0")),
+        server=os.environ.get("FX_HTTP_REPLAY_SERVER"),
+    )
+
+
+#################################
+# Fixture server
+#################################
+
+def make_handler(store: FixtureStore, latency: float = 0.0, jitter: float = 0.0):
+    """Handler serving /<host>/<path>?<query> from the fixture store."""
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def _serve(self, body: Optional[bytes] = None):
+            parsed = urlparse(self.path)
+            host, _, path = parsed.path.lstrip("/").partition("/")
+            url = f"https://{host}/{path}" + (f"?{parsed.query}" if parsed.query else "")
+            route = match_route(url)
+            fixture = store.load(route, url, body) if route else None
+
+            _sleep(latency, jitter)
+            status, content_type, content = fixture or (404, "text/plain", b"No fixture recorded")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def do_GET(self):
+            self._serve()
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            self._serve(self.rfile.read(length) if length else None)
+
+        def log_message(self, format, *args):
+            pass
+
+    return FixtureHandler
+
+
+def serve(directory: str = FIXTURES_DIR, host: str = "127.0.0.1", port: int = 8766,
+          latency: float = 0.0, jitter: float = 0.0) -> ThreadingHTTPServer:
+    """
+    Start the fixture server in a background thread.
+
+    Args:
+        directory: Fixture folder
+        host: Bind address
+        port: Port (0 picks a free one)
+        latency: Seconds added to every response
+        jitter: Random +/- seconds around the latency
+
+    Returns:
+        ThreadingHTTPServer: Running server; call shutdown() to stop it
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(FixtureStore(directory), latency, jitter))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded scraper responses")
+    parser.add_argument("command", choices=["serve", "list"])
+    parser.add_argument("--dir", default=FIXTURES_DIR, help="Fixture folder")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to each response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- seconds around the latency")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for name, count in FixtureStore(args.dir).summary().items():
+            route = next(r for r in ROUTES if r["name"] == name)
+            fallback = "default page" if route.get("default") else "generated" if name in ("yahoo_spark", "mistral_chat") else "none"
+            print(f"{name:<22} {count:>5} recorded   fallback: {fallback}")
+    else:
+        httpd = serve(args.dir, args.host, args.port, args.latency, args.jitter)
+        print(f"Serving fixtures from {args.dir} on http://{args.host}:{httpd.server_port}")
+        print(f"Run with FX_HTTP_REPLAY=replay FX_HTTP_REPLAY_SERVER=http://{args.host}:{httpd.server_port}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            httpd.shutdown()
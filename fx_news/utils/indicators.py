@@ -0,0 +1,390 @@
+"""
+Technical indicators over the stored rate series.
+SMA, EMA, RSI, ATR, Bollinger bands and realized volatility are backfilled with vectorized NumPy
+when a series is first seen, then updated bar by bar from running state when the 5D or YTD file
+is refreshed, so chart overlays and card stats cost almost nothing per render.
+"""
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from fx_news.utils.render_profiler import record_cache
+
+SMA_PERIODS = (10, 20, 30, 50)
+EMA_PERIODS = (20,)
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+BOLLINGER_PERIOD = 20
+BOLLINGER_WIDTH = 2.0
+REALIZED_VOL_PERIOD = 20
+
+# Longest stretch handled in one closed-form EMA block before the weights underflow
+_EMA_BLOCK = 256
+
+
+class _Buffer:
+    """Growable array with amortised O(1) append and O(1) trimming from the front."""
+
+    __slots__ = ("_data", "_start", "_end")
+
+    def __init__(self, values: np.ndarray, dtype=np.float64):
+        values = np.asarray(values, dtype=dtype)
+        self._data = np.empty(max(16, 2 * len(values)), dtype=dtype)
+        self._data[:len(values)] = values
+        self._start = 0
+        self._end = len(values)
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def append(self, value: float) -> None:
+        if self._end == len(self._data):
+            live = self.values.copy()
+            self._data = np.empty(max(16, 2 * len(live)), dtype=live.dtype)
+            self._data[:len(live)] = live
+            self._start, self._end = 0, len(live)
+        self._data[self._end] = value
+        self._end += 1
+
+    def drop_front(self, count: int) -> None:
+        self._start = min(self._end, self._start + count)
+
+    def pop(self) -> None:
+        """Remove the latest value."""
+        self._end = max(self._start, self._end - 1)
+
+    def at(self, offset: int) -> float:
+        """Value counted from the end (-1 is the latest), NaN if out of range."""
+        index = self._end + offset
+        return self._data[index].item() if index >= self._start else math.nan
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._data[self._start:self._end]
+
+
+#################################
+# Vectorized backfills
+#################################
+
+def rolling_sum(values: np.ndarray, period: int) -> np.ndarray:
+    """Sum over a trailing window; NaN until the window is full."""
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        csum = np.concatenate(([0.0], np.cumsum(values)))
+        out[period - 1:] = csum[period:] - csum[:-period]
+    return out
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average."""
+    return rolling_sum(values, period) / period
+
+
+def rolling_std(values: np.ndarray, period: int) -> np.ndarray:
+    """Population standard deviation over a trailing window."""
+    mean = sma(values, period)
+    mean_sq = rolling_sum(values * values, period) / period
+    return np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
+
+
+def ewm(values: np.ndarray, alpha: float, start: int = 0, seed: Optional[float] = None) -> np.ndarray:
+    """
+    Exponentially weighted mean e[t] = alpha * x[t] + (1 - alpha) * e[t-1], without a Python loop.
+
+    Each block is solved in closed form with powers of the decay, and blocks are kept short
+    enough that the powers never underflow.
+
+    Args:
+        values: Input series
+        alpha: Smoothing factor in (0, 1]
+        start: First index with a value; earlier outputs are NaN
+        seed: Value of e[start] (default: values[start])
+
+    Returns:
+        np.ndarray: Smoothed series
+    """
+    out = np.full(len(values), np.nan)
+    if start >= len(values):
+        return out
+    decay = 1.0 - alpha
+    prev = values[start] if seed is None else seed
+    out[start] = prev
+    i = start + 1
+    while i < len(values):
+        block = values[i:i + _EMA_BLOCK]
+        powers = decay ** np.arange(1, len(block) + 1)
+        # e[k] = decay^k * (prev + alpha * sum_{j<=k} x[j] / decay^j)
+        out[i:i + len(block)] = powers * (prev + alpha * np.cumsum(block / powers))
+        prev = out[i + len(block) - 1]
+        i += len(block)
+    return out
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """Exponential moving average seeded with the first value (pandas ewm(adjust=False))."""
+    return ewm(values, 2.0 / (period + 1))
+
+
+def _wilder(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder smoothing of values[1:], seeded with the mean of the first period values."""
+    if len(values) <= period:
+        return np.full(len(values), np.nan)
+    seed = float(np.mean(values[1:period + 1]))
+    return ewm(values, 1.0 / period, start=period, seed=seed)
+
+
+def rsi(values: np.ndarray, period: int = RSI_PERIOD) -> np.ndarray:
+    """Relative strength index with Wilder smoothing."""
+    change = np.diff(values, prepend=values[:1])
+    avg_gain = _wilder(np.maximum(change, 0.0), period)
+    avg_loss = _wilder(np.maximum(-change, 0.0), period)
+    return _rsi_from_averages(avg_gain, avg_loss)
+
+
+def _rsi_from_averages(avg_gain, avg_loss):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+
+
+def atr(values: np.ndarray, period: int = ATR_PERIOD) -> np.ndarray:
+    """
+    Average true range with Wilder smoothing.
+
+    The stored series only have closing prices, so the true range is the absolute
+    close-to-close move.
+    """
+    true_range = np.abs(np.diff(values, prepend=values[:1]))
+    return _wilder(true_range, period)
+
+
+def realized_volatility(values: np.ndarray, period: int = REALIZED_VOL_PERIOD) -> np.ndarray:
+    """Standard deviation of log returns over a trailing window, in percent per bar."""
+    returns = np.diff(np.log(values), prepend=np.nan)
+    out = np.full(len(values), np.nan)
+    if len(values) > period:
+        out[period:] = rolling_std(returns[1:], period)[period - 1:] * 100
+    return out
+
+
+#################################
+# Incremental indicator set
+#################################
+
+class IndicatorSet:
+    """
+    Indicators of one rate series, kept aligned with its timestamps.
+
+    Built once with vectorized backfills; afterwards new bars update every indicator from
+    running state (window sums, last smoothed values), and bars that age out of a sliding
+    5D window are dropped from the front without recomputing anything.
+    """
+
+    def __init__(self, timestamps: np.ndarray, rates: np.ndarray):
+        self.timestamps = _Buffer(timestamps, dtype=np.int64)
+        rates = np.asarray(rates, dtype=np.float64)
+        self.rates = _Buffer(rates)
+        self.series: Dict[str, _Buffer] = {}
+
+        for period in SMA_PERIODS:
+            self.series[f"sma_{period}"] = _Buffer(sma(rates, period))
+        for period in EMA_PERIODS:
+            self.series[f"ema_{period}"] = _Buffer(ema(rates, period))
+
+        change = np.diff(rates, prepend=rates[:1])
+        self._avg_gain = _wilder(np.maximum(change, 0.0), RSI_PERIOD)
+        self._avg_loss = _wilder(np.maximum(-change, 0.0), RSI_PERIOD)
+        self.series["rsi"] = _Buffer(_rsi_from_averages(self._avg_gain, self._avg_loss))
+        # RSI averages before the latest bar, so that bar can be revised (see sync)
+        self._prev_averages = (_last(self._avg_gain[:-1]), _last(self._avg_loss[:-1]))
+        self._avg_gain, self._avg_loss = _last(self._avg_gain), _last(self._avg_loss)
+
+        self.series["atr"] = _Buffer(atr(rates, ATR_PERIOD))
+
+        mid = sma(rates, BOLLINGER_PERIOD)
+        width = BOLLINGER_WIDTH * rolling_std(rates, BOLLINGER_PERIOD)
+        self.series["bb_mid"] = _Buffer(mid)
+        self.series["bb_upper"] = _Buffer(mid + width)
+        self.series["bb_lower"] = _Buffer(mid - width)
+
+        self.series["realized_vol"] = _Buffer(realized_volatility(rates, REALIZED_VOL_PERIOD))
+
+    def __len__(self) -> int:
+        return len(self.rates)
+
+    def update(self, timestamp: int, rate: float) -> None:
+        """
+        Append one bar and update every indicator in O(1).
+
+        Args:
+            timestamp: Bar time (int64, same unit as the backfill timestamps)
+            rate: Closing rate of the bar
+        """
+        prev = self.rates.at(-1)
+        self._prev_averages = (self._avg_gain, self._avg_loss)
+        self.timestamps.append(timestamp)
+        self.rates.append(rate)
+        n = len(self.rates)
+
+        for period in SMA_PERIODS:
+            self.series[f"sma_{period}"].append(self._window_mean(period, n))
+        for period in EMA_PERIODS:
+            last = self.series[f"ema_{period}"].at(-1)
+            alpha = 2.0 / (period + 1)
+            self.series[f"ema_{period}"].append(rate if math.isnan(last) else alpha * rate + (1 - alpha) * last)
+
+        change = rate - prev if not math.isnan(prev) else 0.0
+        self._avg_gain = _wilder_step(self._avg_gain, max(change, 0.0), RSI_PERIOD, self.rates, n, up=True)
+        self._avg_loss = _wilder_step(self._avg_loss, max(-change, 0.0), RSI_PERIOD, self.rates, n, up=False)
+        self.series["rsi"].append(float(_rsi_from_averages(self._avg_gain, self._avg_loss)))
+
+        atr_last = self.series["atr"].at(-1)
+        if math.isnan(atr_last):
+            atr_value = float(atr(self.rates.values[-(ATR_PERIOD + 1):], ATR_PERIOD)[-1]) if n > ATR_PERIOD else math.nan
+        else:
+            atr_value = (atr_last * (ATR_PERIOD - 1) + abs(change)) / ATR_PERIOD
+        self.series["atr"].append(atr_value)
+
+        window = self.rates.values[-BOLLINGER_PERIOD:]
+        if len(window) == BOLLINGER_PERIOD:
+            mid, width = float(window.mean()), BOLLINGER_WIDTH * float(window.std())
+        else:
+            mid = width = math.nan
+        self.series["bb_mid"].append(mid)
+        self.series["bb_upper"].append(mid + width)
+        self.series["bb_lower"].append(mid - width)
+
+        window = self.rates.values[-(REALIZED_VOL_PERIOD + 1):]
+        if len(window) == REALIZED_VOL_PERIOD + 1:
+            self.series["realized_vol"].append(float(np.std(np.diff(np.log(window)))) * 100)
+        else:
+            self.series["realized_vol"].append(math.nan)
+
+    def _window_mean(self, period: int, n: int) -> float:
+        if n < period:
+            return math.nan
+        last = self.series[f"sma_{period}"].at(-1)
+        if math.isnan(last):
+            return float(self.rates.values[-period:].mean())
+        return last + (self.rates.at(-1) - self.rates.at(-period - 1)) / period
+
+    def _undo_last(self) -> None:
+        """Remove the latest bar and restore the running state from before it."""
+        self.timestamps.pop()
+        self.rates.pop()
+        for buffer in self.series.values():
+            buffer.pop()
+        self._avg_gain, self._avg_loss = self._prev_averages
+
+    def drop_front(self, count: int) -> None:
+        """Forget the oldest bars (e.g., when a 5D window slides forward)."""
+        self.timestamps.drop_front(count)
+        self.rates.drop_front(count)
+        for buffer in self.series.values():
+            buffer.drop_front(count)
+
+    def sync(self, timestamps: np.ndarray, rates: np.ndarray) -> bool:
+        """
+        Bring the set in line with a refreshed series.
+
+        The last known bar is treated as still forming: Yahoo revises it on every fetch since it
+        carries the live price, so a changed value there replaces the bar (one undo and one
+        update) instead of forcing a rebuild.
+
+        Args:
+            timestamps: Refreshed bar times
+            rates: Refreshed rates
+
+        Returns:
+            bool: True if the refresh continued the known series (appends, front drops and a
+            revised last bar), False if it diverged and the set must be rebuilt
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        rates = np.asarray(rates, dtype=np.float64)
+        known = self.timestamps.values
+        if not len(known) or not len(timestamps):
+            return False
+
+        # Bars that aged out of the front
+        dropped = int(np.searchsorted(known, timestamps[0]))
+        overlap = known[dropped:]
+        if len(overlap) < 2 or len(overlap) > len(timestamps) or not np.array_equal(overlap, timestamps[:len(overlap)]):
+            return False
+        settled = len(overlap) - 1
+        if not np.allclose(self.rates.values[dropped:dropped + settled], rates[:settled], equal_nan=True):
+            return False
+
+        if dropped:
+            self.drop_front(dropped)
+        revised = float(rates[settled])
+        if not np.isclose(self.rates.at(-1), revised, equal_nan=True):
+            self._undo_last()
+            self.update(int(timestamps[settled]), revised)
+        for ts, rate in zip(timestamps[len(overlap):], rates[len(overlap):]):
+            self.update(int(ts), float(rate))
+        return True
+
+    def get(self, name: str) -> np.ndarray:
+        """Return an indicator series (e.g., 'sma_20', 'rsi', 'bb_upper') aligned with the rates."""
+        return self.series[name].values
+
+    def latest(self) -> Dict[str, float]:
+        """Return the latest value of every indicator."""
+        return {name: buffer.at(-1) for name, buffer in self.series.items()}
+
+
+def _last(values: np.ndarray) -> float:
+    return float(values[-1]) if len(values) else math.nan
+
+
+def _wilder_step(avg: float, value: float, period: int, rates: _Buffer, n: int, up: bool) -> float:
+    """One Wilder smoothing step; seeds from the window mean once enough bars exist."""
+    if not math.isnan(avg):
+        return (avg * (period - 1) + value) / period
+    if n <= period:
+        return math.nan
+    change = np.diff(rates.values[-(period + 1):])
+    return float(np.mean(np.maximum(change if up else -change, 0.0)))
+
+
+#################################
+# Per-series cache
+#################################
+
+_sets: Dict[Tuple[str, str], IndicatorSet] = {}
+_sets_lock = threading.Lock()
+
+
+def get_indicator_set(pair_key: str, series: str, timestamps: Iterable, rates: Iterable) -> IndicatorSet:
+    """
+    Return the indicators of a stored series, updating the cached set with any new bars.
+
+    Args:
+        pair_key: Pair key (e.g., 'eur_usd')
+        series: Series name ('5d', 'ytd')
+        timestamps: Bar times (datetime64 values or int64 nanoseconds)
+        rates: Closing rates
+
+    Returns:
+        IndicatorSet: Indicators aligned with the given bars
+    """
+    timestamps = np.asarray(timestamps).astype("datetime64[ns]").astype(np.int64)
+    rates = np.asarray(rates, dtype=np.float64)
+    with _sets_lock:
+        indicator_set = _sets.get((pair_key, series))
+        hit = indicator_set is not None and indicator_set.sync(timestamps, rates)
+        if not hit:
+            indicator_set = IndicatorSet(timestamps, rates)
+            _sets[(pair_key, series)] = indicator_set
+    record_cache(hit)
+    return indicator_set
+
+
+def clear_indicator_cache(pair_keys: Optional[List[str]] = None) -> None:
+    """Drop cached indicator sets, for the given pairs or all of them."""
+    with _sets_lock:
+        for key in list(_sets):
+            if pair_keys is None or key[0] in pair_keys:
+                del _sets[key]
@@ -0,0 +1,81 @@
+"""
+Lazy import helpers.
+Heavy libraries (torch, transformers, textblob, prophet, boto3, pydub) are only needed
+by a few code paths, so they are loaded on first attribute access instead of at page start.
+"""
+import importlib
+import logging
+import threading
+import time
+from types import ModuleType
+from typing import Dict
+
+logger = logging.getLogger("lazy_imports")
+
+# Seconds spent importing each lazily loaded module, for the import audit
+_import_timings: Dict[str, float] = {}
+_import_lock = threading.Lock()
+
+
+class LazyModule(ModuleType):
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_name"] = name
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with _import_lock:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    name = self.__dict__["_lazy_name"]
+                    start = time.perf_counter()
+                    module = importlib.import_module(name)
+                    elapsed = time.perf_counter() - start
+                    _import_timings[name] = elapsed
+                    logger.info(f"Lazily imported {name} in {elapsed:.2f}s")
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__dict__['_lazy_name']}' ({state})>"
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Return a proxy for a module that is imported on first use.
+
+    Args:
+        name: Fully qualified module name (e.g., 'torch', 'prophet.diagnostics')
+
+    Returns:
+        ModuleType: Proxy module
+    """
+    return LazyModule(name)
+
+
+def is_loaded(module: ModuleType) -> bool:
+    """Return True if a lazy module has already been imported."""
+    if isinstance(module, LazyModule):
+        return module.__dict__["_lazy_module"] is not None
+    return True
+
+
+def get_import_timings() -> Dict[str, float]:
+    """
+    Return the time spent importing each lazily loaded module.
+
+    Returns:
+        dict: Module name to import time in seconds
+    """
+    return dict(_import_timings)
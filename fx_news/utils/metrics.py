@@ -0,0 +1,263 @@
+"""
+In-process timing metrics for the news ingestion pipeline.
+Stages are timed with the span() context manager or the timed() decorator, aggregated in a
+thread-safe registry, broken down per refresh, and exported as Prometheus text or JSON.
+Stages count towards the refreshes of the context they run in; use submit() to hand work to a
+thread pool without losing that attribution.
+"""
+import contextvars
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Prefix of every exported Prometheus metric
+METRIC_PREFIX = "fx_news"
+
+# Number of per-refresh breakdowns kept for the debug panel
+MAX_REFRESH_HISTORY = 20
+
+
+class _StageStats:
+    """Call count and duration aggregates of one stage."""
+
+    __slots__ = ("count", "errors", "total", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def add(self, seconds: float, failed: bool = False) -> None:
+        self.count += 1
+        self.errors += failed
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def as_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_seconds": round(self.total, 6),
+            "mean_seconds": round(self.total / self.count, 6) if self.count else 0.0,
+            "min_seconds": round(self.min, 6) if self.count else 0.0,
+            "max_seconds": round(self.max, 6),
+        }
+
+
+class MetricsRegistry:
+    """Stage timings and event counters shared by every thread of the process."""
+
+    def __init__(self, max_refreshes: int = MAX_REFRESH_HISTORY):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, _StageStats] = {}
+        self._counters: Dict[str, float] = {}
+        # Refreshes in progress in the current context (thread, or a copied context in a pool
+        # worker); each collects its own copy of the stages recorded under it
+        self._current: contextvars.ContextVar[Tuple[Dict, ...]] = contextvars.ContextVar(
+            f"metrics_refreshes_{id(self)}", default=())
+        self._refreshes = deque(maxlen=max_refreshes)
+
+    def record(self, stage: str, seconds: float, failed: bool = False) -> None:
+        """
+        Add one timed call of a stage.
+
+        Args:
+            stage: Stage name (e.g., 'article.fetch')
+            seconds: Wall time of the call
+            failed: Whether the call raised
+        """
+        with self._lock:
+            self._stages.setdefault(stage, _StageStats()).add(seconds, failed)
+            for refresh in self._current.get():
+                refresh["stages"].setdefault(stage, _StageStats()).add(seconds, failed)
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Add to an event counter (e.g., 'article.duplicate')."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+            for refresh in self._current.get():
+                refresh["counters"][name] = refresh["counters"].get(name, 0) + value
+
+    @contextmanager
+    def span(self, stage: str):
+        """Time the enclosed block as one call of a stage; exceptions are counted and re-raised."""
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.record(stage, time.perf_counter() - start, failed)
+
+    def timed(self, stage: Optional[str] = None) -> Callable:
+        """Decorator timing every call of a function as a stage (default: the function name)."""
+        def decorator(func):
+            name = stage or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @contextmanager
+    def refresh(self, name: str):
+        """
+        Collect a breakdown of every stage recorded under the block.
+
+        Only stages recorded in this context count, so concurrent refreshes (e.g., two sessions)
+        keep separate breakdowns; pool workers join in when their calls go through submit().
+        Refreshes that record nothing (e.g., backed off before doing any work) are not kept.
+
+        Args:
+            name: Name of the refresh (e.g., 'news')
+        """
+        refresh = {"name": name, "started": time.time(), "stages": {}, "counters": {}}
+        start = time.perf_counter()
+        token = self._current.set(self._current.get() + (refresh,))
+        try:
+            yield refresh
+        finally:
+            wall = time.perf_counter() - start
+            self._current.reset(token)
+            with self._lock:
+                if refresh["stages"] or refresh["counters"]:
+                    refresh["wall_seconds"] = wall
+                    self._refreshes.append(refresh)
+                    self._stages.setdefault(f"refresh.{name}", _StageStats()).add(wall)
+
+    def refresh_decorator(self, name: str) -> Callable:
+        """Decorator running every call of a function as a refresh."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.refresh(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> Dict:
+        """
+        Totals since start-up (or the last reset).
+
+        Returns:
+            dict: 'stages' (stage -> count, errors and duration stats) and 'counters'
+        """
+        with self._lock:
+            return {
+                "stages": {name: stats.as_dict() for name, stats in sorted(self._stages.items())},
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+    def refresh_breakdowns(self, name: Optional[str] = None) -> List[Dict]:
+        """
+        Completed refreshes, newest first.
+
+        Args:
+            name: Only return refreshes with this name
+
+        Returns:
+            list: One dict per refresh with 'name', 'started', 'wall_seconds', 'stages' and
+            'counters'; stages are sorted by total time, slowest first
+        """
+        with self._lock:
+            refreshes = [r for r in reversed(self._refreshes) if name is None or r["name"] == name]
+            return [_breakdown(r) for r in refreshes]
+
+    def last_refresh(self, name: Optional[str] = None) -> Optional[Dict]:
+        """The most recent completed refresh, or None."""
+        breakdowns = self.refresh_breakdowns(name)
+        return breakdowns[0] if breakdowns else None
+
+    def reset(self) -> None:
+        """Drop all recorded timings, counters and refreshes."""
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+            self._refreshes.clear()
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Totals and refresh breakdowns as a JSON document."""
+        document = self.snapshot()
+        document["refreshes"] = self.refresh_breakdowns()
+        return json.dumps(document, indent=indent)
+
+    def to_prometheus(self, prefix: str = METRIC_PREFIX) -> str:
+        """Totals in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        stages = snapshot["stages"]
+        lines = [
+            f"# HELP {prefix}_stage_seconds Wall time spent in each pipeline stage.",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for stage, stats in stages.items():
+            label = _label(stage)
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{label}"}} {stats["total_seconds"]}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{label}"}} {stats["count"]}')
+
+        lines += [
+            f"# HELP {prefix}_stage_max_seconds Slowest single call of each pipeline stage.",
+            f"# TYPE {prefix}_stage_max_seconds gauge",
+        ]
+        lines += [f'{prefix}_stage_max_seconds{{stage="{_label(s)}"}} {v["max_seconds"]}' for s, v in stages.items()]
+
+        lines += [
+            f"# HELP {prefix}_stage_errors_total Calls of each pipeline stage that raised.",
+            f"# TYPE {prefix}_stage_errors_total counter",
+        ]
+        lines += [f'{prefix}_stage_errors_total{{stage="{_label(s)}"}} {v["errors"]}' for s, v in stages.items()]
+
+        if snapshot["counters"]:
+            lines += [
+                f"# HELP {prefix}_events_total Pipeline events (duplicates skipped, articles saved, ...).",
+                f"# TYPE {prefix}_events_total counter",
+            ]
+            lines += [f'{prefix}_events_total{{event="{_label(k)}"}} {v}' for k, v in snapshot["counters"].items()]
+        return "\n".join(lines) + "\n"
+
+
+def submit(executor, func: Callable, *args, **kwargs):
+    """
+    Submit a call to an executor in a copy of the caller's context.
+
+    Stages recorded by the call then count towards the caller's refreshes.
+
+    Returns:
+        Future: The executor's future for the call
+    """
+    # One copy per call: a context cannot be entered by two threads at once
+    return executor.submit(contextvars.copy_context().run, func, *args, **kwargs)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _breakdown(refresh: Dict) -> Dict:
+    stages = sorted(refresh["stages"].items(), key=lambda item: item[1].total, reverse=True)
+    return {
+        "name": refresh["name"],
+        "started": refresh["started"],
+        "wall_seconds": round(refresh["wall_seconds"], 6),
+        "stages": {name: stats.as_dict() for name, stats in stages},
+        "counters": dict(refresh["counters"]),
+    }
+
+
+# Process-wide registry used by the scrapers
+registry = MetricsRegistry()
+span = registry.span
+timed = registry.timed
+refresh = registry.refresh
+timed_refresh = registry.refresh_decorator
+increment = registry.increment
@@ -47,13 +47,14 @@ import streamlit as st
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
-def add_notification(message: str, type: str = 'system'):
+def add_notification(message: str, type: str = 'system', play_sound: bool = True):
     """
     Add a notification to the session state.
     
     Args:
         message: Notification message text
         type: Notification type ('system', 'price', 'error', 'info', 'success')
+        play_sound: Whether a price notification plays the alert sound
     """
     # Create the notification object
     notification = {
@@ -76,7 +77,7 @@ def add_notification(message: str, type: str = 'system'):
         st.session_state.notifications = st.session_state.notifications[:max_notifications]
 
     # Play sound for price alert notifications (in a real app)
-    if type == 'price':
+    if type == 'price' and play_sound:
         play_alert_sound()
 
 def clear_notifications():
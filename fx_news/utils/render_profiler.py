@@ -0,0 +1,237 @@
+"""
+Opt-in render profiler for Streamlit reruns.
+Component functions decorated with profile_component() record their wall time, the size of the
+Plotly figures they send to the browser and the cache hits and misses they cause, per rerun of
+the script thread. Nothing is recorded (and nothing is patched) unless a profile is started.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+# Set FX_PROFILE_RENDER=1 to profile every rerun without the sidebar toggle
+PROFILE_RENDER = os.environ.get("FX_PROFILE_RENDER", "0") == "1"
+
+# Number of rerun profiles kept per session
+MAX_PROFILES = 10
+
+_local = threading.local()
+_hook_lock = threading.Lock()
+_plotly_hook_installed = False
+
+
+class RerunProfile:
+    """Component calls recorded during one rerun, as a tree flattened in call order."""
+
+    def __init__(self, page: str = ""):
+        self.page = page
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.calls: List[Dict] = []
+        self._stack: List[Dict] = []
+        self.wall_seconds: Optional[float] = None
+
+    def enter(self, name: str, detail: Optional[str] = None) -> Dict:
+        call = {
+            "name": name,
+            "detail": detail,
+            "depth": len(self._stack),
+            "start": time.perf_counter() - self._start,
+            "seconds": 0.0,
+            "child_seconds": 0.0,
+            "plotly_bytes": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "error": False,
+        }
+        self.calls.append(call)
+        self._stack.append(call)
+        return call
+
+    def exit(self, call: Dict, failed: bool = False) -> None:
+        call["seconds"] = time.perf_counter() - self._start - call["start"]
+        call["error"] = failed
+        # Unwind anything left open by a component that raised (e.g., st.rerun)
+        while self._stack and self._stack.pop() is not call:
+            pass
+        if self._stack:
+            self._stack[-1]["child_seconds"] += call["seconds"]
+
+    def current(self) -> Optional[Dict]:
+        return self._stack[-1] if self._stack else None
+
+    def finish(self) -> None:
+        self.wall_seconds = time.perf_counter() - self._start
+
+    def summary(self) -> List[Dict]:
+        """
+        Per-component totals, slowest first.
+
+        Returns:
+            list: One dict per component with 'component', 'calls', 'total_ms', 'self_ms',
+            'max_ms', 'plotly_kb', 'cache_hits', 'cache_misses' and 'errors'. Totals of
+            recursive components count only the outermost call.
+        """
+        rows: Dict[str, Dict] = {}
+        open_names: List[tuple] = []
+        for call in self.calls:
+            while open_names and open_names[-1][0] >= call["depth"]:
+                open_names.pop()
+            nested = any(name == call["name"] for _, name in open_names)
+            open_names.append((call["depth"], call["name"]))
+
+            row = rows.setdefault(call["name"], {
+                "component": call["name"], "calls": 0, "total_ms": 0.0, "self_ms": 0.0, "max_ms": 0.0,
+                "plotly_kb": 0.0, "cache_hits": 0, "cache_misses": 0, "errors": 0,
+            })
+            row["calls"] += 1
+            if not nested:
+                row["total_ms"] += call["seconds"] * 1000
+            row["self_ms"] += (call["seconds"] - call["child_seconds"]) * 1000
+            row["max_ms"] = max(row["max_ms"], call["seconds"] * 1000)
+            row["plotly_kb"] += call["plotly_bytes"] / 1024
+            row["cache_hits"] += call["cache_hits"]
+            row["cache_misses"] += call["cache_misses"]
+            row["errors"] += call["error"]
+
+        for row in rows.values():
+            for key in ("total_ms", "self_ms", "max_ms", "plotly_kb"):
+                row[key] = round(row[key], 1)
+        return sorted(rows.values(), key=lambda r: r["total_ms"], reverse=True)
+
+
+def start_profile(page: str = "") -> RerunProfile:
+    """
+    Start profiling the current rerun on this script thread.
+
+    Args:
+        page: Name of the page being rendered
+
+    Returns:
+        RerunProfile: The profile that component calls are recorded into
+    """
+    _install_plotly_hook()
+    _local.profile = RerunProfile(page)
+    return _local.profile
+
+
+def stop_profile() -> Optional[RerunProfile]:
+    """Stop profiling on this thread and return the finished profile, if one was running."""
+    profile = getattr(_local, "profile", None)
+    _local.profile = None
+    if profile is not None:
+        profile.finish()
+    return profile
+
+
+def active_profile() -> Optional[RerunProfile]:
+    """The profile of the current rerun, or None when profiling is off."""
+    return getattr(_local, "profile", None)
+
+
+@contextmanager
+def component(name: str, detail: Optional[str] = None):
+    """Profile the enclosed block as a component call (a no-op when profiling is off)."""
+    profile = active_profile()
+    if profile is None:
+        yield
+        return
+    call = profile.enter(name, detail)
+    failed = False
+    try:
+        yield
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        profile.exit(call, failed)
+
+
+def profile_component(name: Optional[str] = None, detail: Optional[Callable] = None) -> Callable:
+    """
+    Decorator profiling every call of a component function.
+
+    Args:
+        name: Component name (default: the function name)
+        detail: Optional function of the call arguments returning a label for that call
+            (e.g., the pair of a currency card)
+    """
+    def decorator(func):
+        component_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if active_profile() is None:
+                return func(*args, **kwargs)
+            label = None
+            if detail is not None:
+                try:
+                    label = detail(*args, **kwargs)
+                except Exception:
+                    label = None
+            with component(component_name, label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def subscription_label(sub, *args, **kwargs) -> str:
+    """Call label for components taking a subscription dict first."""
+    return f"{sub['base']}/{sub['quote']}"
+
+
+def pair_label(base, quote, *args, **kwargs) -> str:
+    """Call label for components taking the base and quote currencies first."""
+    return f"{base}/{quote}"
+
+
+def record_cache(hit: bool) -> None:
+    """Count a cache hit or miss against the component being rendered (if profiling)."""
+    profile = active_profile()
+    call = profile.current() if profile is not None else None
+    if call is not None:
+        call["cache_hits" if hit else "cache_misses"] += 1
+
+
+def _figure_bytes(figure) -> int:
+    try:
+        if hasattr(figure, "to_json"):
+            return len(figure.to_json())
+        return len(json.dumps(figure, default=str))
+    except Exception:
+        return 0
+
+
+def _record_plotly(figure) -> None:
+    profile = active_profile()
+    call = profile.current() if profile is not None else None
+    if call is not None:
+        call["plotly_bytes"] += _figure_bytes(figure)
+
+
+def _install_plotly_hook() -> None:
+    """Wrap st.plotly_chart once so figure payloads are measured while a profile runs."""
+    global _plotly_hook_installed
+    with _hook_lock:
+        if _plotly_hook_installed:
+            return
+        import streamlit as st
+        from streamlit.delta_generator import DeltaGenerator
+
+        def wrap(plot):
+            @functools.wraps(plot)
+            def plotly_chart(*args, **kwargs):
+                if active_profile() is not None:
+                    # Unbound calls get the container as first argument
+                    figure = args[1] if args and isinstance(args[0], DeltaGenerator) else (args[0] if args else None)
+                    _record_plotly(kwargs.get("figure_or_data", figure))
+                return plot(*args, **kwargs)
+            return plotly_chart
+
+        # st.plotly_chart is bound to the main container at import, so both need wrapping
+        st.plotly_chart = wrap(st.plotly_chart)
+        DeltaGenerator.plotly_chart = wrap(DeltaGenerator.plotly_chart)
+        _plotly_hook_installed = True
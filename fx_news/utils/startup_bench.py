@@ -0,0 +1,164 @@
+"""
+Startup benchmark for the Streamlit pages.
+Measures import cost of the heavy libraries and time-to-first-render of each page,
+each in a fresh interpreter so nothing is already cached in sys.modules.
+
+Usage:
+    python -m fx_news.utils.startup_bench [--runs 3] [--json results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+PAGES = [
+    "Home.py",
+    "pages/1_FX_Monitor.py",
+    "pages/2_News_Summarizer.py",
+    "pages/3_Trader_Sentiment.py",
+]
+
+# Libraries that should only load on first use
+HEAVY_MODULES = [
+    "torch",
+    "transformers",
+    "textblob",
+    "prophet",
+    "darts",
+    "boto3",
+    "pydub",
+]
+
+# Application modules pulled in by the pages at start-up
+APP_MODULES = [
+    "fx_news.scrapers.news_scraper",
+    "fx_news.services.news_service",
+    "fx_news.services.rates_service",
+    "fx_news.predict.predictions",
+]
+
+IMPORT_SNIPPET = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy_loaded": heavy}}))
+"""
+
+RENDER_SNIPPET = """
+import time, json
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({page!r}, default_timeout={timeout})
+at.run()
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "exceptions": len(at.exception)}}))
+"""
+
+
+def _run_snippet(code: str, cwd: str, timeout: int) -> Optional[Dict]:
+    """Run a snippet in a fresh interpreter and parse the JSON it prints."""
+    try:
+        result = subprocess.run([sys.executable, "-c", code], cwd=cwd, capture_output=True,
+                                text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout}s"}
+    lines = [line for line in result.stdout.splitlines() if line.startswith("{")]
+    if result.returncode != 0 or not lines:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "no output"
+        return {"error": error}
+    return json.loads(lines[-1])
+
+
+def _summarize(samples: List[Dict]) -> Dict:
+    """Collapse repeated runs into median/min/max timings."""
+    ok = [s for s in samples if "error" not in s]
+    if not ok:
+        return {"error": samples[-1]["error"]}
+    times = [s["seconds"] for s in ok]
+    summary = {k: v for k, v in ok[-1].items() if k != "seconds"}
+    summary.update({
+        "median_s": round(statistics.median(times), 3),
+        "min_s": round(min(times), 3),
+        "max_s": round(max(times), 3),
+    })
+    return summary
+
+
+def audit_imports(cwd: str, runs: int = 3, timeout: int = 300) -> Dict[str, Dict]:
+    """
+    Time a cold import of each heavy library and application module.
+
+    For application modules, also report which heavy libraries they dragged in.
+
+    Args:
+        cwd: Repository root
+        runs: Number of cold imports per module
+        timeout: Per-run timeout in seconds
+
+    Returns:
+        dict: Module name to timing summary
+    """
+    results = {}
+    for module in HEAVY_MODULES + APP_MODULES:
+        code = IMPORT_SNIPPET.format(module=module, heavy=HEAVY_MODULES)
+        results[module] = _summarize([_run_snippet(code, cwd, timeout) for _ in range(runs)])
+    return results
+
+
+def time_first_render(cwd: str, runs: int = 3, timeout: int = 300) -> Dict[str, Dict]:
+    """
+    Time the first full script run of each page with Streamlit's AppTest harness.
+
+    Args:
+        cwd: Repository root
+        runs: Number of cold runs per page
+        timeout: Per-run timeout in seconds
+
+    Returns:
+        dict: Page path to timing summary
+    """
+    results = {}
+    for page in PAGES:
+        code = RENDER_SNIPPET.format(page=page, timeout=timeout)
+        results[page] = _summarize([_run_snippet(code, cwd, timeout + 30) for _ in range(runs)])
+    return results
+
+
+def _print_table(title: str, results: Dict[str, Dict]) -> None:
+    print(f"\n{title}")
+    print("-" * len(title))
+    for name, summary in results.items():
+        if "error" in summary:
+            print(f"{name:<40} ERROR: {summary['error']}")
+            continue
+        line = f"{name:<40} {summary['median_s']:>8.3f}s  (min {summary['min_s']:.3f}s, max {summary['max_s']:.3f}s)"
+        if summary.get("heavy_loaded"):
+            line += f"  loads: {', '.join(summary['heavy_loaded'])}"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark page start-up time")
+    parser.add_argument("--runs", type=int, default=3, help="Cold runs per measurement")
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    parser.add_argument("--skip-render", action="store_true", help="Only run the import audit")
+    args = parser.parse_args()
+
+    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+    report = {"imports": audit_imports(repo_root, args.runs)}
+    _print_table("Cold import times", report["imports"])
+
+    if not args.skip_render:
+        report["first_render"] = time_first_render(repo_root, args.runs)
+        _print_table("Time to first render", report["first_render"])
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.json_path}")
@@ -21,6 +21,7 @@ from fx_news.ui.components.maps import display_indices_world_map, display_indice
 from fx_news.ui.components.news import display_news_sidebar
 from fx_news.ui.layout import create_layout
 from fx_news.ui.components.sidebar import create_sidebar
+from fx_news.ui.components.profiler import begin_render_profile, display_render_profiler
 
 # Start memory tracking
 # tracemalloc.start()
@@ -42,6 +43,8 @@ def get_size(obj, seen=None):
         size += sum(get_size(k, seen) + get_size(v, seen) for k, v in obj.items())
     elif hasattr(obj, '__dict__'):
         size += get_size(obj.__dict__, seen)
+    elif hasattr(obj, '__slots__'):
+        size += sum(get_size(getattr(obj, name, None), seen) for name in obj.__slots__)
     elif hasattr(obj, '__iter__') and not isinstance(obj, (str, bytes, bytearray)):
         try:
             size += sum(get_size(i, seen) for i in obj)
@@ -102,6 +105,9 @@ logger = logging.getLogger("Market Monitor page")
 configure_page()
 load_styles()
 
+# Profile this rerun if the render profiler is switched on
+begin_render_profile("FX Monitor")
+
 # Initialize the session state
 initialize_session_state()
 
@@ -135,6 +141,9 @@ def main():
     if st.session_state.last_refresh is None: 
         with st.spinner("Updating currency rates..."):
             update_rates()
+
+    # Render profiler panel (last, so the whole rerun is measured)
+    display_render_profiler()
      
 
 # # Create sidebar with all controls and navigation
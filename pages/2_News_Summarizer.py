@@ -31,6 +31,11 @@ import re
 import torch
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 from fx_news.scrapers.news.news_reader import get_local_news_articles, get_news_for_currency_pair
+from fx_news.services.summary_service import (
+    get_article_id, get_model_id, make_summary_key, get_cached_summary, store_summary,
+    clear_summary_cache, get_summary_cache_stats, format_article_for_summary, map_reduce_summarize,
+    rolling_summarize, reset_rolling_summaries, SUMMARY_INSTRUCTION
+)
 from transformers import BertTokenizer, BertForSequenceClassification
 import torch
 
@@ -603,8 +608,19 @@ def get_available_sources(base_dir="fx_news/scrapers/news"):
 #---------------------------------------------------------------
 # Function to generate summaries using DistilBART
 #---------------------------------------------------------------
-def generate_summaries(news_df, summary_length, include_sentiment, tokenizer, model, debug=False):
-    """Generate summaries for the news articles using the DistilBART model."""
+def generate_summaries(news_df, summary_length, include_sentiment, tokenizer, model, debug=False, mode="Standard",
+                       time_range=None):
+    """
+    Generate summaries for the news articles using the DistilBART model.
+    
+    In "Map-Reduce" mode every article is summarized in token-sized chunks and the
+    chunk summaries are reduced into the final summary, instead of truncating the
+    combined articles to a single model input.
+    
+    In "Incremental" mode each pair keeps a rolling summary and only articles that
+    arrived since the previous run are summarized and merged into it; changing the
+    time range starts a new rolling summary.
+    """
     if tokenizer is None or model is None:
         st.error("Model not loaded. Please check the model loading section.")
         return []
@@ -613,6 +629,7 @@ def generate_summaries(news_df, summary_length, include_sentiment, tokenizer, mo
     progress_bar = st.progress(0)
     
     summaries = []
+    model_id = get_model_id(model)
     
     # Group news by currency pair
     # First ensure currency_pairs is a string column for groupby to work
@@ -634,47 +651,71 @@ def generate_summaries(news_df, summary_length, include_sentiment, tokenizer, mo
  # Prepare device
     device = "cuda" if torch.cuda.is_available() else "cpu"
     model.to(device)
+    mode_key = mode.lower()
     
     for i, (pair, group) in enumerate(grouped):
         progress_bar.progress((i / len(grouped)) * 0.9)
         
+        # Reuse the cached summary if this pair's article set hasn't changed.
+        # Incremental summaries depend on history, so they rely on the rolling state instead.
+        article_ids = [get_article_id(row) for _, row in group.iterrows()]
+        cache_key = make_summary_key(pair, article_ids, summary_length, include_sentiment, model_id, mode_key)
+        cached_summary = get_cached_summary(cache_key) if mode_key != "incremental" else None
+        if cached_summary is not None:
+            if debug:
+                st.write(f"Using cached summary for {pair} ({len(article_ids)} articles)")
+            cached_summary["cached"] = True
+            summaries.append(cached_summary)
+            continue
+        
+        generation_start = time.time()
         try:
             # Prepare the news context by combining titles and text snippets
-            news_articles_text = []
-            for _, row in group.iterrows():
-                # Get a snippet of the text (first 300 characters)
-                text_snippet = row.get('text', '')[:300] + "..." if len(row.get('text', '')) > 300 else row.get('text', '')
-                article_info = f"Title: {row.get('title', '')}\n"
-                article_info += f"Source: {row.get('source', '')}\n"
-                article_info += f"Date: {row.get('date', '').strftime('%Y-%m-%d %H:%M') if isinstance(row.get('date'), datetime) else row.get('date', '')}\n"
-                article_info += f"Content: {text_snippet}\n\n"
-                news_articles_text.append(article_info)
-            
-            # Combine all article texts with reasonable length limits
-            news_context = "\n\n".join(news_articles_text)
+            news_articles_text = [format_article_for_summary(row) for _, row in group.iterrows()]
             
-            # Truncate if too long for the model (typically 1024 tokens)
-            if len(news_context) > 4000:  # Rough character count estimation
-                news_context = news_context[:4000] + "..."
-            
-            # Add sentiment analysis instruction if needed
-            if include_sentiment:
-                news_context += "\n\nPlease include market sentiment analysis and potential impact on trading in the summary."
-            
-            # Tokenize and generate summary
-            inputs = tokenizer(news_context, max_length=1024, return_tensors="pt").to(device)
-            
-            # Generate summary
-            summary_ids = model.generate(
-                inputs["input_ids"],
-                num_beams=4,
-                min_length=min_length,
-                max_length=max_length,
-                early_stopping=True
-            )
-            
-            # Decode the summary
-            summary_text = tokenizer.decode(summary_ids[0], skip_special_tokens=True)
+            if mode_key == "incremental":
+                # Merge only newly arrived articles into the pair's rolling summary
+                rolling = rolling_summarize(
+                    pair, dict(zip(article_ids, news_articles_text)), tokenizer, model,
+                    min_length, max_length,
+                    settings_key=f"{summary_length}|{include_sentiment}|{model_id}|{time_range}",
+                    include_sentiment=include_sentiment, device=device
+                )
+                summary_text = rolling["summary"]
+                if debug:
+                    st.write(f"{pair}: {rolling['new_count']} new articles merged, {rolling['covered_count']} covered")
+            elif mode_key == "map-reduce":
+                # Summarize chunks of articles, then summarize the chunk summaries
+                summary_text = map_reduce_summarize(
+                    tokenizer, model, news_articles_text, min_length, max_length,
+                    include_sentiment=include_sentiment, device=device
+                )
+            else:
+                # Combine all article texts with reasonable length limits
+                news_context = "\n\n".join(news_articles_text)
+                
+                # Truncate if too long for the model (typically 1024 tokens)
+                if len(news_context) > 4000:  # Rough character count estimation
+                    news_context = news_context[:4000] + "..."
+                
+                # Add sentiment analysis instruction if needed
+                if include_sentiment:
+                    news_context += f"\n\n{SUMMARY_INSTRUCTION}"
+                
+                # Tokenize and generate summary
+                inputs = tokenizer(news_context, max_length=1024, truncation=True, return_tensors="pt").to(device)
+                
+                # Generate summary
+                summary_ids = model.generate(
+                    inputs["input_ids"],
+                    num_beams=4,
+                    min_length=min_length,
+                    max_length=max_length,
+                    early_stopping=True
+                )
+                
+                # Decode the summary
+                summary_text = tokenizer.decode(summary_ids[0], skip_special_tokens=True)
             
             # Format the summary with markdown
             formatted_summary = f"## {pair} Market Summary\n\n{summary_text}"
@@ -691,13 +732,16 @@ def generate_summaries(news_df, summary_length, include_sentiment, tokenizer, mo
                 date_range = "Unknown date range"
             
             # Add to summaries list
-            summaries.append({
+            summary = {
                 "pair": pair,
                 "summary": formatted_summary,
                 "source_count": len(group),
                 "date_range": date_range,
                 "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            })
+            }
+            if mode_key != "incremental":
+                store_summary(cache_key, summary, time.time() - generation_start)
+            summaries.append(summary)
             
         except Exception as e:
             error_msg = f"Error generating summary for {pair}: {str(e)}"
@@ -815,6 +859,26 @@ with st.sidebar:
     # Include market sentiment
     include_sentiment = st.checkbox("Include Market Sentiment Analysis", value=True)
     
+    # Summarization mode
+    summary_mode = st.radio(
+        "Summarization Mode",
+        ["Standard", "Map-Reduce", "Incremental"],
+        help="Map-Reduce summarizes every article in chunks before combining them. "
+             "Slower, but nothing is dropped for pairs with many articles. "
+             "Incremental keeps a rolling summary per pair and only summarizes new articles."
+    )
+    if summary_mode == "Incremental" and st.button("Reset Rolling Summaries"):
+        reset_rolling_summaries()
+        st.success("Rolling summaries reset")
+    
+    # Summary cache status
+    cache_stats = get_summary_cache_stats()
+    st.caption(f"Summary cache: {cache_stats['entries']} entries, {cache_stats['hits']} hits "
+               f"(~{cache_stats['seconds_saved']}s of generation saved)")
+    if st.button("Clear Summary Cache"):
+        clear_summary_cache()
+        st.success("Summary cache cleared")
+    
     # Run button - disabled if model not loaded
     run_btn = st.button("Generate Summaries", type="primary", disabled=not st.session_state.model_loaded)
 
@@ -1019,7 +1083,9 @@ if run_btn:
                 include_sentiment, 
                 st.session_state.tokenizer, 
                 st.session_state.model,
-                debug=debug_mode
+                debug=debug_mode,
+                mode=summary_mode,
+                time_range=time_range
             )
             
             # Store the results
@@ -1109,6 +1175,9 @@ with tab1:
                 """, unsafe_allow_html=True)
                 # Add metadata
                 st.caption(f"Based on {summary['source_count']} articles from {summary['date_range']}")
+                if summary.get('cached'):
+                    st.caption(f"From summary cache (generated {summary['generated_at']}, "
+                               f"{summary.get('generation_seconds', 0):.1f}s)")
                 
                 # Add confidence info
                 st.caption(f"Sentiment Analysis Confidence: {sentiment_confidence:.2f}")